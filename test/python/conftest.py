@@ -1,23 +1,318 @@
+import hashlib
 import json
+import os
+import stat
+import tempfile
+import time
 import pytest
 from pathlib import Path
 from eth_tester import EthereumTester
-from web3 import Web3
-from web3.providers.eth_tester import EthereumTesterProvider
-from solcx import compile_standard, install_solc
+from eth_utils import to_checksum_address
 
-# Install Solidity compiler
-install_solc('0.8.19')
+from support.accounts import DEFAULT_POOL_SIZE, AccountPool
+from support.artifacts import (
+    CONTRACT_PATH,
+    HELPER_CONTRACTS_DIR,
+    ArtifactCache,
+    artifact_key,
+    build_compiler_input,
+    compile_contract,
+    compile_simple_storage,
+    load_hardhat_artifact,
+)
+from support.batch import TransactionBatch
+from support.chain import create_web3, deploy_simple_storage, snapshot_isolation
+from support.driver import FastDriver
+from support.events import LogDecoder
+from support.gas import (
+    DEFAULT_REGRESSION_THRESHOLD,
+    GasBenchmark,
+    format_benchmark,
+    load_baseline,
+)
+# Utility functions that can be imported by test files
+from support.gas import ether_to_wei, format_gas_cost, wei_to_ether
+from support.factory import deploy_many
+from support.genesis import create_preloaded_tester, load_or_capture_genesis_state, preloaded_deployment
+from support.impact import ImpactCache
+from support.indexer import EventIndexer
+from support.multicall import MULTICALL_NAME, MULTICALL_PATH, MulticallReader, deploy_multicall
+from support.solc import SOLC_VERSION, SolcNotFoundError, resolve_solc
+from support.profiling import Profiler, ProfilingPlugin
+from support.pruning import HistoryPruner
+from support.storage import StorageInspector
+from support.subscriptions import LogBus
+
+# Startup timings reported at the end of the run
+_startup_timings = {"conftest_loaded": time.perf_counter()}
+
+# Per-test outcomes and gas usage written out by --report-json
+_run_report = {"tests": {}, "gas": []}
+
+# Every SimpleStorage transaction's gas, grouped by method and call path
+_gas_benchmark = GasBenchmark()
+_gas_results = {"comparison": None}
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-compile-cache",
+        action="store_true",
+        default=False,
+        help="Always run solc instead of reusing cached SimpleStorage artifacts"
+    )
+    parser.addoption(
+        "--no-hardhat-artifacts",
+        action="store_true",
+        default=False,
+        help="Ignore Hardhat's artifacts/ even when they match the current SimpleStorage source"
+    )
+    parser.addoption(
+        "--install-solc",
+        action="store_true",
+        default=False,
+        help="Download solc through solcx when no local binary is found"
+    )
+    parser.addoption(
+        "--chain-isolation",
+        choices=("fresh", "snapshot"),
+        default="fresh",
+        help="fresh (default): new EthereumTester and deployment for every test; "
+             "snapshot: one chain and deployment per session, rolled back after each test"
+    )
+
+    parser.addoption(
+        "--preload-genesis",
+        action="store_true",
+        default=False,
+        help="Start chains from a genesis that already contains the SimpleStorage deployment"
+    )
+
+    parser.addoption(
+        "--report-json",
+        default=None,
+        help="Write test outcomes, gas usage and timings to this JSON file"
+    )
+
+    parser.addoption(
+        "--gas-report",
+        action="store_true",
+        default=False,
+        help="Record gas for every SimpleStorage transaction and print min/median/p95"
+    )
+    parser.addoption(
+        "--gas-baseline",
+        default=None,
+        help="Fail the run when a method's median gas exceeds this baseline file"
+    )
+    parser.addoption(
+        "--gas-save-baseline",
+        default=None,
+        help="Write the collected gas figures to this baseline file"
+    )
+    parser.addoption(
+        "--gas-regression-threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Allowed median gas growth over the baseline, as a fraction"
+    )
+    parser.addoption(
+        "--account-pool-size",
+        type=int,
+        default=DEFAULT_POOL_SIZE,
+        help="Number of deterministic sender accounts in the account_pool fixture"
+    )
+
+    parser.addoption(
+        "--impact-cache",
+        action="store_true",
+        default=False,
+        help="Skip tests whose bytecode, test and fixture code match their last passing run "
+             "(ignored while collecting gas figures)"
+    )
+
+    parser.addoption(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Time fixtures, test phases and library hot spots and print a phase table"
+    )
+    parser.addoption(
+        "--profile-folded",
+        default=None,
+        help="Also write flamegraph.pl folded stacks to this file (implies --profile)"
+    )
+
+def pytest_configure(config):
+    # Skipped tests would leave holes in the gas figures
+    if config.getoption("--impact-cache") and not _gas_benchmark_enabled(config):
+        config.pluginmanager.register(
+            ImpactCache(
+                config,
+                lambda: _built_simple_storage(config),
+                watched_paths=(Path(__file__).parent / "support", HELPER_CONTRACTS_DIR),
+                options=("--chain-isolation", "--preload-genesis", "--no-hardhat-artifacts"),
+                fallback_dir=_fallback_cache_dir(config) if getattr(config, "cache", None) is None else None
+            ),
+            "simple-storage-impact-cache"
+        )
+    
+    if config.getoption("--profile") or config.getoption("--profile-folded"):
+        profiler = Profiler()
+        profiler.instrument()
+        config.pluginmanager.register(
+            ProfilingPlugin(profiler, config.getoption("--profile-folded")),
+            "simple-storage-profiler"
+        )
+
+def _fallback_cache_dir(config):
+    """Stands in for .pytest_cache when the cacheprovider plugin is disabled (-p no:cacheprovider)
+
+    It holds bytecode, genesis state and impact results that later runs trust, so it is
+    private to this user and this checkout.
+    """
+    uid = os.getuid() if hasattr(os, "getuid") else None
+    checkout = hashlib.sha256(str(config.rootpath).encode()).hexdigest()[:12]
+    path = Path(tempfile.gettempdir()) / f"simple-storage-pytest-cache-{uid}-{checkout}"
+    path.mkdir(mode=0o700, exist_ok=True)
+
+    info = path.lstat()
+    if not stat.S_ISDIR(info.st_mode) or (uid is not None and (info.st_uid != uid or info.st_mode & 0o077)):
+        raise pytest.UsageError(f"{path} is not a private directory of this user; remove it or enable cacheprovider")
+    return path
+
+def _cache_dir(config, name):
+    if getattr(config, "cache", None) is not None:
+        return config.cache.mkdir(name)
+
+    path = _fallback_cache_dir(config) / name
+    path.mkdir(mode=0o700, exist_ok=True)
+    return path
+
+def _artifact_cache_dir(config):
+    return os.environ.get("SOLC_ARTIFACT_CACHE") or _cache_dir(config, "solc-artifacts")
+
+def _built_simple_storage(config):
+    """The artifact compiled_contract would use, or None when getting it needs a solc run"""
+    source = CONTRACT_PATH.read_text()
+    if not config.getoption("--no-hardhat-artifacts"):
+        artifact = load_hardhat_artifact(source)
+        if artifact is not None:
+            return artifact
+    
+    cache = ArtifactCache(_artifact_cache_dir(config))
+    return cache.get(artifact_key(build_compiler_input(source), SOLC_VERSION))
+
+def _gas_benchmark_enabled(config):
+    return bool(
+        config.getoption("--gas-report")
+        or config.getoption("--gas-baseline")
+        or config.getoption("--gas-save-baseline")
+    )
+
+def _snapshot_isolation(config):
+    return config.getoption("--chain-isolation") == "snapshot"
+
+def _preload_genesis(config):
+    return config.getoption("--preload-genesis")
+
+def pytest_sessionstart(session):
+    _startup_timings["session_start"] = time.perf_counter()
+
+def pytest_collection(session):
+    _startup_timings["collection_start"] = time.perf_counter()
+
+def pytest_collection_finish(session):
+    _startup_timings["collection_finish"] = time.perf_counter()
+
+def pytest_runtest_logreport(report):
+    entry = _run_report["tests"].setdefault(report.nodeid, {
+        "nodeid": report.nodeid,
+        "outcome": "passed",
+        "duration": 0.0
+    })
+    entry["duration"] += report.duration
+
+    # A failing setup or teardown fails the test; a skip in setup marks it skipped
+    if report.failed:
+        entry["outcome"] = "failed"
+    elif report.skipped and entry["outcome"] == "passed":
+        entry["outcome"] = "skipped"
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if config.getoption("--gas-save-baseline"):
+        _gas_benchmark.save_baseline(config.getoption("--gas-save-baseline"))
+
+    if config.getoption("--gas-baseline"):
+        comparison = _gas_benchmark.compare(
+            load_baseline(config.getoption("--gas-baseline")),
+            config.getoption("--gas-regression-threshold")
+        )
+        _gas_results["comparison"] = comparison
+        if any(entry["regressed"] for entry in comparison) and session.exitstatus == 0:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    path = session.config.getoption("--report-json")
+    if not path:
+        return
+
+    timings = _startup_timings
+    report = {
+        "worker": os.environ.get("SIMPLE_STORAGE_WORKER"),
+        "exitstatus": int(exitstatus),
+        "tests": list(_run_report["tests"].values()),
+        "gas": _run_report["gas"],
+        "gas_benchmark": _gas_benchmark.records,
+        "timings": {
+            "collection": timings.get("collection_finish", 0) - timings.get("collection_start", 0),
+            "session": time.perf_counter() - timings.get("session_start", time.perf_counter()),
+            "solc_resolve": timings.get("solc_resolve")
+        }
+    }
+
+    with open(path, "w") as file:
+        json.dump(report, file, indent=2)
+
+def pytest_terminal_summary(terminalreporter):
+    if _gas_benchmark.samples:
+        terminalreporter.write_sep("-", "gas benchmark")
+        terminalreporter.write_line(format_benchmark(_gas_benchmark.summary(), _gas_results["comparison"]))
+
+    timings = _startup_timings
+    if "collection_finish" not in timings:
+        return
+
+    terminalreporter.write_sep("-", "startup timings")
+    terminalreporter.write_line(
+        f"conftest to session start: {timings['session_start'] - timings['conftest_loaded']:.3f}s"
+    )
+    terminalreporter.write_line(
+        f"collection: {timings['collection_finish'] - timings['collection_start']:.3f}s"
+    )
+    if "artifact_origin" in timings:
+        terminalreporter.write_line(f"SimpleStorage artifact: {timings['artifact_origin']} build")
+    if "solc_resolve" in timings:
+        terminalreporter.write_line(
+            f"solc resolution ({timings['solc_origin']}): {timings['solc_resolve']:.3f}s"
+        )
 
 @pytest.fixture(scope="session")
-def solidity_compiler():
-    """Setup Solidity compiler"""
-    return install_solc('0.8.20')
+def solidity_compiler(request):
+    """Resolve a local solc binary, only installing one when --install-solc is given"""
+    try:
+        solc = resolve_solc(SOLC_VERSION, install=request.config.getoption("--install-solc"))
+    except SolcNotFoundError as exc:
+        pytest.skip(str(exc))
+
+    _startup_timings["solc_resolve"] = solc["resolve_seconds"]
+    _startup_timings["solc_origin"] = solc["origin"]
+
+    return solc
 
 @pytest.fixture(scope="session") 
 def contract_source():
     """Load the SimpleStorage contract source code"""
-    contract_path = Path(__file__).parent.parent / "contracts" / "SimpleStorage.sol"
+    contract_path = Path(__file__).parent.parent.parent / "contracts" / "SimpleStorage.sol"
     
     if not contract_path.exists():
         pytest.skip(f"Contract source not found at {contract_path}")
@@ -26,56 +321,111 @@ def contract_source():
         return file.read()
 
 @pytest.fixture(scope="session")
-def compiled_contract(contract_source, solidity_compiler):
-    """Compile the SimpleStorage contract"""
+def artifact_cache(request):
+    """On-disk compilation cache keyed by source hash, solc version and settings"""
+    return ArtifactCache(_artifact_cache_dir(request.config))
+
+@pytest.fixture(scope="session")
+def compiled_contract(request, contract_source, artifact_cache):
+    """Compile the SimpleStorage contract, reusing a cached artifact when nothing changed"""
     
     # Prepare the input for the compiler
-    compiler_input = {
-        "language": "Solidity",
-        "sources": {
-            "SimpleStorage.sol": {
-                "content": contract_source
-            }
-        },
-        "settings": {
-            "outputSelection": {
-                "*": {
-                    "*": ["abi", "evm.bytecode", "evm.bytecode.object"]
-                }
-            },
-            "optimizer": {
-                "enabled": True,
-                "runs": 200
-            }
-        }
-    }
+    compiler_input = build_compiler_input(contract_source)
+    
+    def compile_contract():
+        # Resolve solc lazily so a cache hit never looks for a compiler
+        solc = request.getfixturevalue("solidity_compiler")
+        return compile_simple_storage(compiler_input, solc["binary"])
     
-    # Compile the contract
-    compiled_sol = compile_standard(compiler_input, solc_version="0.8.19")
+    if request.config.getoption("--no-compile-cache"):
+        return compile_contract()
     
-    # Extract contract data
-    contract_data = compiled_sol["contracts"]["SimpleStorage.sol"]["SimpleStorage"]
+    # `npx hardhat compile` already built this exact source; share its output
+    if not request.config.getoption("--no-hardhat-artifacts"):
+        artifact = load_hardhat_artifact(contract_source)
+        if artifact is not None:
+            _startup_timings["artifact_origin"] = "hardhat"
+            return artifact
     
+    return artifact_cache.get_or_compile(compiler_input, SOLC_VERSION, compile_contract)
+
+@pytest.fixture(scope="session")
+def multicall_artifact(request, artifact_cache):
+    """Compile the Multicall test helper through the same artifact cache"""
+    compiler_input = build_compiler_input(MULTICALL_PATH.read_text(), source_name=MULTICALL_PATH.name)
+    
+    def compile_helper():
+        solc = request.getfixturevalue("solidity_compiler")
+        return compile_contract(compiler_input, solc["binary"], MULTICALL_NAME)
+    
+    if request.config.getoption("--no-compile-cache"):
+        return compile_helper()
+    
+    return artifact_cache.get_or_compile(compiler_input, SOLC_VERSION, compile_helper)
+
+@pytest.fixture(scope="session")
+def genesis_state(request, compiled_contract):
+    """Deployed SimpleStorage code and storage, captured once and stored per bytecode"""
+    return load_or_capture_genesis_state(
+        _cache_dir(request.config, "genesis"),
+        compiled_contract["abi"],
+        compiled_contract["bytecode"]
+    )
+
+def _new_tester(request):
+    if _preload_genesis(request.config):
+        return create_preloaded_tester(request.getfixturevalue("genesis_state"))
+
+    return EthereumTester()
+
+@pytest.fixture(scope="session")
+def session_chain(request):
+    """EthereumTester and Web3 shared by every test in snapshot isolation mode"""
+    web3 = create_web3(_new_tester(request))
+
     return {
-        "abi": contract_data["abi"],
-        "bytecode": contract_data["evm"]["bytecode"]["object"]
+        "eth_tester": web3.provider.ethereum_tester,
+        "web3": web3
     }
 
+@pytest.fixture(scope="session")
+def session_deployment(request, session_chain, compiled_contract):
+    """SimpleStorage deployed once on the shared chain"""
+    web3 = session_chain["web3"]
+
+    if _preload_genesis(request.config):
+        return preloaded_deployment(web3, request.getfixturevalue("genesis_state"), compiled_contract["abi"])
+
+    return deploy_simple_storage(
+        web3,
+        compiled_contract["abi"],
+        compiled_contract["bytecode"],
+        web3.eth.accounts[0]
+    )
+
 @pytest.fixture(scope="function")
-def eth_tester():
-    """Create a fresh EthereumTester instance for each test"""
-    return EthereumTester()
+def eth_tester(request):
+    """Create a fresh EthereumTester per test, or roll the shared one back after each test"""
+    if not _snapshot_isolation(request.config):
+        yield _new_tester(request)
+        return
+
+    tester = request.getfixturevalue("session_chain")["eth_tester"]
+
+    # Deploy the shared contract before the snapshot so it survives every rollback
+    if "deployed_contract" in request.fixturenames:
+        request.getfixturevalue("session_deployment")
+
+    with snapshot_isolation(tester):
+        yield tester
 
 @pytest.fixture(scope="function")
-def web3_instance(eth_tester):
+def web3_instance(request, eth_tester):
     """Create a Web3 instance connected to eth_tester"""
-    provider = EthereumTesterProvider(eth_tester)
-    web3 = Web3(provider)
-    
-    # Verify connection
-    assert web3.is_connected()
-    
-    return web3
+    if _snapshot_isolation(request.config):
+        return request.getfixturevalue("session_chain")["web3"]
+
+    return create_web3(eth_tester)
 
 @pytest.fixture(scope="function")
 def accounts(web3_instance):
@@ -101,52 +451,138 @@ def contract_factory(web3_instance, compiled_contract):
     )
 
 @pytest.fixture(scope="function")
-def deployed_contract(web3_instance, contract_factory, accounts):
-    """Deploy a fresh SimpleStorage contract for each test"""
-    
-    initial_value = 42
-    
-    # Deploy the contract
-    tx_hash = contract_factory.constructor(initial_value).transact({
-        'from': accounts["owner"]
-    })
-    
-    # Wait for transaction receipt
-    tx_receipt = web3_instance.eth.wait_for_transaction_receipt(tx_hash)
+def deployed_contract(request, web3_instance, contract_factory, accounts):
+    """Deploy a fresh SimpleStorage contract for each test, or reuse the snapshotted one"""
+    if _snapshot_isolation(request.config):
+        deployment = request.getfixturevalue("session_deployment")
+    elif _preload_genesis(request.config):
+        # The contract already sits in genesis; tx_receipt is the one from the reference deployment
+        deployment = preloaded_deployment(web3_instance, request.getfixturevalue("genesis_state"), contract_factory.abi)
+    else:
+        deployment = deploy_simple_storage(
+            web3_instance,
+            contract_factory.abi,
+            contract_factory.bytecode,
+            accounts["owner"]
+        )
+
+    if _gas_benchmark_enabled(request.config):
+        _gas_benchmark.record_deployment(deployment["tx_receipt"])
+        _gas_benchmark.attach(web3_instance, contract_factory.abi)
+
+    return deployment
+
+@pytest.fixture(scope="function")
+def log_bus(eth_tester, compiled_contract):
+    """Decoded SimpleStorage events pushed to subscribers as blocks are mined"""
+    bus = LogBus(eth_tester, compiled_contract["abi"]).install()
     
-    # Create contract instance
-    contract = web3_instance.eth.contract(
-        address=tx_receipt.contractAddress,
-        abi=contract_factory.abi
-    )
+    yield bus
     
-    return {
-        "contract": contract,
-        "address": tx_receipt.contractAddress,
-        "tx_hash": tx_hash,
-        "tx_receipt": tx_receipt,
-        "initial_value": initial_value
-    }
+    # The tester may be shared across tests, so stop intercepting its mining
+    bus.uninstall()
 
 @pytest.fixture(scope="function")
-def contract_with_events(deployed_contract, web3_instance):
-    """Contract instance with event filter setup"""
+def contract_with_events(deployed_contract, web3_instance, log_bus):
+    """Contract instance with event subscriptions setup"""
     contract = deployed_contract["contract"]
     
-    # Create event filters
-    value_changed_filter = contract.events.ValueChanged.create_filter(fromBlock="latest")
-    ownership_transferred_filter = contract.events.OwnershipTransferred.create_filter(fromBlock="latest")
+    # Subscribe to events from blocks mined from now on
+    value_changed_events = log_bus.subscribe_queue("ValueChanged", address=deployed_contract["address"])
+    ownership_transferred_events = log_bus.subscribe_queue("OwnershipTransferred", address=deployed_contract["address"])
     
     return {
         "contract": contract,
         "address": deployed_contract["address"],
-        "value_changed_filter": value_changed_filter,
-        "ownership_transferred_filter": ownership_transferred_filter,
+        "value_changed_events": value_changed_events,
+        "ownership_transferred_events": ownership_transferred_events,
+        "log_bus": log_bus,
         "web3": web3_instance
     }
 
 @pytest.fixture(scope="function")
-def gas_tracker():
+def multicall(web3_instance, multicall_artifact, accounts):
+    """Batched view-call reader backed by a freshly deployed Multicall helper"""
+    helper = deploy_multicall(web3_instance, multicall_artifact["abi"], multicall_artifact["bytecode"], accounts["owner"])
+    return MulticallReader(helper)
+
+@pytest.fixture(scope="session")
+def account_pool(request):
+    """Deterministic sender accounts, with derived keys cached between runs"""
+    return AccountPool(
+        request.config.getoption("--account-pool-size"),
+        cache_dir=_cache_dir(request.config, "account-pool")
+    )
+
+@pytest.fixture(scope="function")
+def funded_account_pool(account_pool, eth_tester, accounts):
+    """account_pool registered with the test chain and funded in batched blocks"""
+    # The shared chain outlives the test, so its signing keys are put back afterwards
+    with account_pool.registered(eth_tester):
+        account_pool.fund(eth_tester, accounts["owner"])
+        yield account_pool
+
+@pytest.fixture(scope="function")
+def pruning_chain(compiled_contract):
+    """Own chain with SimpleStorage deployed and history pruned to the last 16 blocks
+
+    Not built on eth_tester: snapshot isolation cannot roll back past pruned blocks.
+    """
+    web3 = create_web3()
+    deployment = deploy_simple_storage(
+        web3,
+        compiled_contract["abi"],
+        compiled_contract["bytecode"],
+        web3.eth.accounts[0]
+    )
+    pruner = HistoryPruner(web3.provider.ethereum_tester, keep_blocks=16).install()
+    
+    yield {
+        "web3": web3,
+        "deployment": deployment,
+        "pruner": pruner
+    }
+    
+    pruner.uninstall()
+
+@pytest.fixture(scope="function")
+def simple_storage_factory(web3_instance, compiled_contract, accounts):
+    """Deploy many SimpleStorage instances in batched blocks and get a compact registry back"""
+    def deploy(count, owners=None, **kwargs):
+        return deploy_many(
+            web3_instance, compiled_contract["abi"], compiled_contract["bytecode"],
+            count, owners or [accounts["owner"]], **kwargs
+        )
+    
+    deploy.abi = compiled_contract["abi"]
+    
+    return deploy
+
+@pytest.fixture(scope="function")
+def fast_driver(eth_tester, deployed_contract, compiled_contract):
+    """Direct EthereumTester driver for the deployed contract, bypassing web3"""
+    return FastDriver(eth_tester, deployed_contract["address"], compiled_contract["abi"])
+
+@pytest.fixture(scope="function")
+def storage_inspector(web3_instance):
+    """Decoded SimpleStorage slots read without running contract code"""
+    return StorageInspector(web3_instance)
+
+@pytest.fixture(scope="function")
+def transaction_batch(web3_instance):
+    """Factory for batches of contract calls that are mined together"""
+    def make_batch(**kwargs):
+        return TransactionBatch(web3_instance, **kwargs)
+
+    return make_batch
+
+@pytest.fixture(scope="function")
+def event_indexer(deployed_contract, web3_instance, compiled_contract):
+    """Incremental ValueChanged/OwnershipTransferred index for the deployed contract"""
+    return EventIndexer(web3_instance, deployed_contract["address"], compiled_contract["abi"])
+
+@pytest.fixture(scope="function")
+def gas_tracker(request):
     """Utility to track gas usage across tests"""
     gas_data = {
         "operations": [],
@@ -161,6 +597,11 @@ def gas_tracker():
             "tx_hash": tx_receipt.transactionHash.hex()
         })
         gas_data["total_gas"] += gas_used
+        _run_report["gas"].append({
+            "test": request.node.nodeid,
+            "operation": operation_name,
+            "gas_used": gas_used
+        })
         
         print(f"\n⛽ Gas Tracker - {operation_name}: {gas_used:,} gas")
         
@@ -187,41 +628,49 @@ def gas_tracker():
     
     return gas_tracker
 
+@pytest.fixture(scope="session")
+def log_decoder(compiled_contract):
+    """Decoder for SimpleStorage events, indexed by topic0 once per session"""
+    return LogDecoder(compiled_contract["abi"])
+
 @pytest.fixture(scope="function")
-def event_checker(web3_instance):
+def event_checker(log_decoder):
     """Utility to check and validate events"""
     
     def check_value_changed_event(tx_receipt, expected_old_value, expected_new_value, expected_updater):
         """Check ValueChanged event in transaction receipt"""
         
-        # Get logs from receipt
-        logs = tx_receipt.logs
-        
-        # Find ValueChanged events
-        value_changed_events = [log for log in logs if len(log.topics) > 0]
+        # Decode the ValueChanged logs from the receipt
+        value_changed_events = log_decoder.decode_receipt(tx_receipt, "ValueChanged")
         
         assert len(value_changed_events) > 0, "No ValueChanged event found"
         
-        # For detailed event checking, we'd need to decode the logs
-        # This is a simplified version
-        print(f"✅ ValueChanged event detected in tx: {tx_receipt.transactionHash.hex()}")
+        expected = (expected_old_value, expected_new_value, to_checksum_address(expected_updater))
+        decoded = [(event.oldValue, event.newValue, event.updatedBy) for event in value_changed_events]
+        assert expected in decoded, f"Expected ValueChanged{expected}, got {decoded}"
+        
+        print(f"✅ ValueChanged({expected_old_value} → {expected_new_value}) event verified in tx: {tx_receipt.transactionHash.hex()}")
         
         return True
     
     def check_ownership_transferred_event(tx_receipt, expected_old_owner, expected_new_owner):
         """Check OwnershipTransferred event in transaction receipt"""
         
-        logs = tx_receipt.logs
-        ownership_events = [log for log in logs if len(log.topics) > 0]
+        ownership_events = log_decoder.decode_receipt(tx_receipt, "OwnershipTransferred")
         
         assert len(ownership_events) > 0, "No OwnershipTransferred event found"
         
-        print(f"✅ OwnershipTransferred event detected in tx: {tx_receipt.transactionHash.hex()}")
+        expected = (to_checksum_address(expected_old_owner), to_checksum_address(expected_new_owner))
+        decoded = [(event.previousOwner, event.newOwner) for event in ownership_events]
+        assert expected in decoded, f"Expected OwnershipTransferred{expected}, got {decoded}"
+        
+        print(f"✅ OwnershipTransferred event verified in tx: {tx_receipt.transactionHash.hex()}")
         
         return True
     
     event_checker.value_changed = check_value_changed_event
     event_checker.ownership_transferred = check_ownership_transferred_event
+    event_checker.decoder = log_decoder
     
     return event_checker
 
@@ -239,31 +688,9 @@ def test_session_setup():
 def test_function_setup(request):
     """Setup that runs before each test function"""
     test_name = request.node.name
+    _gas_benchmark.current_test = request.node.nodeid
     print(f"\n🏃 Running test: {test_name}")
     
     yield
     
     print(f"✅ Completed test: {test_name}")
-
-# Utility functions that can be imported by test files
-def wei_to_ether(wei_amount):
-    """Convert Wei to Ether"""
-    return wei_amount / (10 ** 18)
-
-def ether_to_wei(ether_amount):
-    """Convert Ether to Wei"""
-    return int(ether_amount * (10 ** 18))
-
-def format_gas_cost(gas_used, gas_price_gwei=20):
-    """Format gas cost in a readable way"""
-    gas_price_wei = gas_price_gwei * (10 ** 9)  # Convert Gwei to Wei
-    total_cost_wei = gas_used * gas_price_wei
-    total_cost_ether = wei_to_ether(total_cost_wei)
-    
-    return {
-        "gas_used": gas_used,
-        "gas_price_gwei": gas_price_gwei,
-        "total_cost_wei": total_cost_wei,
-        "total_cost_ether": total_cost_ether,
-        "formatted": f"{gas_used:,} gas @ {gas_price_gwei} Gwei = {total_cost_ether:.6f} ETH"
-    }
\ No newline at end of file
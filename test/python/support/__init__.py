@@ -0,0 +1 @@
+"""Helpers shared by the eth-tester suite, its fixtures and the benchmark scripts"""
@@ -0,0 +1,192 @@
+"""Deterministic, pre-funded sender accounts beyond eth-tester's default ten
+
+The private key of pool account i is keccak(seed || i). Deriving an address
+takes an elliptic-curve multiplication, a few milliseconds each in pure
+Python. The pool therefore caches every derived (key, address) pair in a JSON
+file per seed and only derives entries the cache is missing.
+
+There are two ways to fund the pool. create_tester() gives every account a
+balance in the genesis allocation of a new chain. fund() sends batched
+transfers on an existing chain. Accounts are handed out round-robin with
+next(), or held exclusively with `with pool.lease(n) as accounts:`, which is
+thread-safe for concurrent workers.
+"""
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+from eth_keys import keys
+from eth_tester import EthereumTester, PyEVMBackend
+from eth_utils import keccak, to_canonical_address, to_checksum_address, to_wei
+
+from support.batch import DEFAULT_MAX_PER_BLOCK, add_to_pending_block
+
+POOL_FORMAT_VERSION = 1
+
+DEFAULT_SEED = "simple-storage-account-pool"
+DEFAULT_POOL_SIZE = 20
+DEFAULT_BALANCE = to_wei(100, "ether")
+TRANSFER_GAS = 21_000
+
+PoolAccount = namedtuple("PoolAccount", ["address", "private_key"])
+
+
+def derive_account(seed, index):
+    """Account number `index` of `seed`; test keys only, never for real funds"""
+    private_key = keccak(seed.encode("utf-8") + index.to_bytes(32, "big"))
+    return PoolAccount(keys.PrivateKey(private_key).public_key.to_checksum_address(), "0x" + private_key.hex())
+
+
+def _cache_path(directory, seed):
+    return Path(directory) / f"account-pool-{hashlib.sha256(seed.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def load_or_derive_accounts(seed, size, cache_dir=None):
+    """First `size` accounts of `seed`, deriving and caching only the ones not on disk yet"""
+    path = _cache_path(cache_dir, seed) if cache_dir else None
+    cached = []
+
+    if path is not None:
+        try:
+            with open(path, "r") as file:
+                state = json.load(file)
+            if state.get("format") == POOL_FORMAT_VERSION and state.get("seed") == seed:
+                cached = [PoolAccount(*entry) for entry in state["accounts"]]
+        except (OSError, ValueError):
+            cached = []
+
+    if len(cached) >= size:
+        return cached[:size]
+
+    accounts = cached + [derive_account(seed, index) for index in range(len(cached), size)]
+
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump({"format": POOL_FORMAT_VERSION, "seed": seed, "accounts": accounts}, file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    return accounts
+
+
+class AccountPool:
+    """A fixed set of deterministic accounts with round-robin and leased access"""
+
+    def __init__(self, size, seed=DEFAULT_SEED, cache_dir=None):
+        self.accounts = load_or_derive_accounts(seed, size, cache_dir)
+        self.addresses = [account.address for account in self.accounts]
+        self._round_robin = itertools.cycle(self.addresses)
+        self._free = list(self.addresses)
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def genesis_state(self, balance=DEFAULT_BALANCE):
+        """eth-tester's default accounts plus every pool account, each holding `balance`"""
+        genesis = PyEVMBackend.generate_genesis_state()
+        for address in self.addresses:
+            genesis[to_canonical_address(address)] = {"balance": balance, "nonce": 0, "code": b"", "storage": {}}
+        return genesis
+
+    def create_tester(self, balance=DEFAULT_BALANCE):
+        """New EthereumTester with the pool funded at genesis and able to sign for it"""
+        genesis = PyEVMBackend.generate_genesis_state()
+        num_accounts = len(genesis)
+
+        backend = PyEVMBackend(genesis_state=self.genesis_state(balance))
+        # The backend makes up one key per genesis entry; keep the defaults and add the real pool keys
+        backend.account_keys = backend.account_keys[:num_accounts]
+
+        tester = EthereumTester(backend)
+        self.register(tester)
+        return tester
+
+    def register(self, tester):
+        """Let `tester` sign for pool accounts it does not know yet"""
+        known = {to_checksum_address(account) for account in tester.get_accounts()}
+        new_keys = tuple(
+            keys.PrivateKey(bytes.fromhex(account.private_key[2:]))
+            for account in self.accounts if account.address not in known
+        )
+
+        # One tuple concatenation instead of one per account through tester.add_account
+        tester.backend.account_keys = tester.backend.account_keys + new_keys
+        return len(new_keys)
+
+    @contextmanager
+    def registered(self, tester):
+        """register() for the duration of the block; a snapshot revert does not undo the signing keys"""
+        account_keys = tester.backend.account_keys
+        self.register(tester)
+        try:
+            yield self
+        finally:
+            tester.backend.account_keys = account_keys
+
+    def fund(self, tester, funder, balance=DEFAULT_BALANCE, max_per_block=DEFAULT_MAX_PER_BLOCK):
+        """Top every pool account up to `balance` from `funder` in batched blocks; return blocks mined"""
+        nonce = tester.get_nonce(funder)
+        queued_in_block = 0
+        blocks = 0
+
+        for address in self.addresses:
+            shortfall = balance - tester.get_balance(address)
+            if shortfall <= 0:
+                continue
+
+            add_to_pending_block(tester, {
+                "from": funder,
+                "to": address,
+                "gas": TRANSFER_GAS,
+                "value": shortfall,
+                "nonce": nonce
+            })
+            nonce += 1
+            queued_in_block += 1
+
+            if queued_in_block >= max_per_block:
+                tester.mine_blocks(1)
+                blocks += 1
+                queued_in_block = 0
+
+        if queued_in_block:
+            tester.mine_blocks(1)
+            blocks += 1
+
+        return blocks
+
+    def next(self):
+        """Next address in round-robin order"""
+        with self._condition:
+            return next(self._round_robin)
+
+    @contextmanager
+    def lease(self, count=1, timeout=None):
+        """Hold `count` addresses no other lease can get until the block exits"""
+        if count > len(self.accounts):
+            raise ValueError(f"Cannot lease {count} accounts from a pool of {len(self.accounts)}")
+
+        with self._condition:
+            if not self._condition.wait_for(lambda: len(self._free) >= count, timeout):
+                raise TimeoutError(f"No {count} free accounts within {timeout}s")
+            leased, self._free = self._free[:count], self._free[count:]
+
+        try:
+            yield leased
+        finally:
+            with self._condition:
+                self._free.extend(leased)
+                self._condition.notify_all()
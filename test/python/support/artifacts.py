@@ -0,0 +1,273 @@
+"""Content-addressed on-disk cache for compiled contract artifacts
+
+When Hardhat's artifacts/ output was built from the current SimpleStorage.sol
+by the pinned solc version with the same output-affecting settings (optimizer,
+evmVersion, metadata, viaIR...), it is used instead of running solc again.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from support.solc import SOLC_VERSION
+
+CONTRACT_NAME = "SimpleStorage"
+SOURCE_NAME = "SimpleStorage.sol"
+CONTRACT_PATH = Path(__file__).resolve().parents[3] / "contracts" / SOURCE_NAME
+
+# Output of `npx hardhat compile`, see paths.artifacts in hardhat.config.js
+HARDHAT_ARTIFACTS_DIR = Path(__file__).resolve().parents[3] / "artifacts"
+HARDHAT_SOURCE_NAME = f"contracts/{SOURCE_NAME}"
+
+# Test-only helper contracts, kept out of the Hardhat sources
+HELPER_CONTRACTS_DIR = Path(__file__).resolve().parents[1] / "contracts"
+
+# Same directory the pytest fixtures use when run from test/python
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".pytest_cache" / "d" / "solc-artifacts"
+
+# Settings shared by every compile of SimpleStorage
+DEFAULT_SETTINGS = {
+    "outputSelection": {
+        "*": {
+            "*": ["abi", "evm.bytecode", "evm.bytecode.object"]
+        }
+    },
+    "optimizer": {
+        "enabled": True,
+        "runs": 200
+    }
+}
+
+# solc's evmVersion when the settings name none; Hardhat always writes one into its build input
+DEFAULT_EVM_VERSIONS = {"0.8.20": "shanghai"}
+
+# Number of artifacts kept on disk before the least recently used are evicted
+DEFAULT_MAX_ENTRIES = 16
+
+
+def build_compiler_input(source, settings=None, source_name=SOURCE_NAME):
+    """Build the solc standard-json input for one contract source (SimpleStorage by default)"""
+    return {
+        "language": "Solidity",
+        "sources": {
+            source_name: {
+                "content": source
+            }
+        },
+        "settings": settings if settings is not None else DEFAULT_SETTINGS
+    }
+
+
+def source_hash(source):
+    """sha256 hex digest of a contract source"""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def artifact_key(compiler_input, solc_version):
+    """Cache key covering every source hash, the solc version and the full settings block"""
+    sources = {
+        name: source_hash(entry["content"])
+        for name, entry in compiler_input["sources"].items()
+    }
+    material = json.dumps({
+        "language": compiler_input.get("language", "Solidity"),
+        "sources": sources,
+        "settings": compiler_input.get("settings", {}),
+        "solc_version": str(solc_version)
+    }, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def extract_artifact(compiled_sol, source_name=SOURCE_NAME, contract_name=CONTRACT_NAME):
+    """Pull the ABI and bytecode of one contract out of solc standard-json output"""
+    contract_data = compiled_sol["contracts"][source_name][contract_name]
+
+    return {
+        "abi": contract_data["abi"],
+        "bytecode": contract_data["evm"]["bytecode"]["object"]
+    }
+
+
+def compile_contract(compiler_input, solc_binary, contract_name):
+    """Run solc on a standard-json input and return the artifact of `contract_name`"""
+    from solcx import compile_standard
+
+    compiled_sol = compile_standard(compiler_input, solc_binary=solc_binary)
+    return extract_artifact(compiled_sol, f"{contract_name}.sol", contract_name)
+
+
+def compile_simple_storage(compiler_input, solc_binary):
+    """Run solc on a standard-json input and return the SimpleStorage artifact"""
+    return compile_contract(compiler_input, solc_binary, CONTRACT_NAME)
+
+
+def output_settings(settings, solc_version=SOLC_VERSION):
+    """Settings that change the bytecode: everything but outputSelection, with solc's default evmVersion filled in"""
+    settings = {key: value for key, value in settings.items() if key != "outputSelection"}
+    if "evmVersion" not in settings and solc_version in DEFAULT_EVM_VERSIONS:
+        settings["evmVersion"] = DEFAULT_EVM_VERSIONS[solc_version]
+    return settings
+
+
+def load_hardhat_artifact(source, artifacts_dir=HARDHAT_ARTIFACTS_DIR, source_name=HARDHAT_SOURCE_NAME,
+                          contract_name=CONTRACT_NAME, settings=None, solc_version=SOLC_VERSION):
+    """ABI and bytecode from Hardhat's artifacts, or None when missing or built from other source, solc or settings
+
+    Freshness comes from the build-info file the artifact points at, which
+    holds the exact standard-json input Hardhat gave solc.
+    """
+    contract_dir = Path(artifacts_dir) / source_name
+    try:
+        with open(contract_dir / f"{contract_name}.json", "r") as file:
+            artifact = json.load(file)
+        with open(contract_dir / f"{contract_name}.dbg.json", "r") as file:
+            build_info_path = contract_dir / json.load(file)["buildInfo"]
+        with open(build_info_path, "r") as file:
+            build_info = json.load(file)
+        build_input = build_info["input"]
+        # e.g. "0.8.20+commit.a1b79de6"; older build-info files only carry solcVersion
+        built_version = (build_info.get("solcLongVersion") or build_info["solcVersion"]).split("+", 1)[0]
+        built_source = build_input["sources"][source_name]["content"]
+        built_settings = output_settings(build_input["settings"], built_version)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if source_hash(built_source) != source_hash(source):
+        return None
+    if built_version != solc_version:
+        return None
+    # e.g. Hardhat builds 0.8.20 for paris while standalone solc defaults to shanghai
+    if built_settings != output_settings(settings if settings is not None else DEFAULT_SETTINGS, solc_version):
+        return None
+
+    bytecode = artifact["bytecode"]
+    return {
+        "abi": artifact["abi"],
+        # Match solc's standard-json output, which has no 0x prefix
+        "bytecode": bytecode[2:] if bytecode.startswith("0x") else bytecode
+    }
+
+
+class ArtifactCache:
+    """Directory of `<key>.json` artifacts with least-recently-used eviction"""
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached artifact for `key`, or None on a miss"""
+        path = self.path_for(key)
+        try:
+            with open(path, "r") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if entry.get("key") != key:
+            self.misses += 1
+            return None
+
+        # Refresh the mtime so eviction keeps recently used entries
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return entry["artifact"]
+
+    def put(self, key, artifact, metadata=None):
+        """Store an artifact atomically, then evict old entries"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "key": key,
+            "metadata": metadata or {},
+            "artifact": artifact
+        }
+
+        # Write to a temp file and rename so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(entry, file)
+            os.replace(tmp_path, self.path_for(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self.evict()
+        return artifact
+
+    def entries(self):
+        """Cached entry paths, most recently used first"""
+        if not self.directory.exists():
+            return []
+
+        paths = []
+        for path in self.directory.glob("*.json"):
+            try:
+                paths.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+
+        return [path for _, path in sorted(paths, reverse=True)]
+
+    def evict(self):
+        """Drop the least recently used entries beyond `max_entries`"""
+        removed = 0
+        for path in self.entries()[self.max_entries:]:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def get_or_compile(self, compiler_input, solc_version, compile_fn):
+        """Return the cached artifact, calling `compile_fn()` only on a miss"""
+        key = artifact_key(compiler_input, solc_version)
+        artifact = self.get(key)
+        if artifact is not None:
+            return artifact
+
+        artifact = compile_fn()
+        return self.put(key, artifact, metadata={
+            "solc_version": str(solc_version),
+            "sources": {
+                name: source_hash(entry["content"])
+                for name, entry in compiler_input["sources"].items()
+            }
+        })
+
+
+def load_artifact(contract_path, cache_dir=None, install_solc=False):
+    """Compiled contract for scripts outside pytest; solc only runs on a cache miss"""
+    from support.solc import SOLC_VERSION, resolve_solc
+
+    contract_path = Path(contract_path)
+    cache_dir = cache_dir or os.environ.get("SOLC_ARTIFACT_CACHE") or DEFAULT_CACHE_DIR
+    compiler_input = build_compiler_input(contract_path.read_text(), source_name=contract_path.name)
+
+    def compile_fn():
+        solc = resolve_solc(SOLC_VERSION, install=install_solc)
+        return compile_contract(compiler_input, solc["binary"], contract_path.stem)
+
+    return ArtifactCache(cache_dir).get_or_compile(compiler_input, SOLC_VERSION, compile_fn)
+
+
+def load_simple_storage_artifact(cache_dir=None, install_solc=False):
+    """Compiled SimpleStorage for scripts outside pytest, from Hardhat's build when it is current"""
+    artifact = load_hardhat_artifact(CONTRACT_PATH.read_text())
+    if artifact is not None:
+        return artifact
+
+    return load_artifact(CONTRACT_PATH, cache_dir, install_solc)
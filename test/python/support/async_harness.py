@@ -0,0 +1,240 @@
+"""Concurrent SimpleStorage clients on AsyncWeb3
+
+Usage (from test/python):
+
+    python -m support.async_harness --reads 2000 --writes 200 --concurrency 64
+    python -m support.async_harness --simulated-latency-ms 5
+    python -m support.async_harness --rpc-url http://127.0.0.1:8545
+
+The same job list runs twice: once awaiting each request in turn, the way the
+synchronous suite works, and once through a bounded worker pool. Compare the
+two timings to see what overlapping requests gains. eth-tester executes
+requests inline, so against it the gain only appears with
+--simulated-latency-ms, which models network round trips.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from web3 import AsyncWeb3
+from web3.providers.eth_tester import AsyncEthereumTesterProvider
+
+from support.artifacts import load_simple_storage_artifact
+from support.chain import INITIAL_VALUE
+from support.loadgen import latency_stats
+
+DEFAULT_CONCURRENCY = 32
+
+# Jobs the producer may queue ahead of the workers before it has to wait
+DEFAULT_QUEUE_SIZE = 256
+
+READ_FUNCTIONS = ("getValue", "getStorageInfo")
+
+
+class LatencyEthereumTesterProvider(AsyncEthereumTesterProvider):
+    """Async eth-tester provider that waits `latency` seconds per request, like a network hop
+
+    `max_in_flight` is the most requests that were inside make_request at once;
+    it does not depend on timing, so tests can check overlap with it.
+    """
+
+    def __init__(self, ethereum_tester=None, latency=0.0):
+        super().__init__()
+        if ethereum_tester is not None:
+            self.ethereum_tester = ethereum_tester
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def make_request(self, method, params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return await super().make_request(method, params)
+        finally:
+            self.in_flight -= 1
+
+
+async def connect(rpc_url=None, latency=0.0, ethereum_tester=None):
+    """AsyncWeb3 for a local JSON-RPC node, or an in-process eth-tester stand-in"""
+    if rpc_url is not None:
+        web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc_url))
+    else:
+        web3 = AsyncWeb3(LatencyEthereumTesterProvider(ethereum_tester, latency))
+
+    if not await web3.is_connected():
+        raise ConnectionError(f"No JSON-RPC node answering at {rpc_url}")
+    return web3
+
+
+async def deploy(web3, abi, bytecode, owner, initial_value=INITIAL_VALUE):
+    factory = web3.eth.contract(abi=abi, bytecode=bytecode)
+    tx_hash = await factory.constructor(initial_value).transact({'from': owner})
+    tx_receipt = await web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=0.01)
+    return web3.eth.contract(address=tx_receipt.contractAddress, abi=abi)
+
+
+def build_jobs(senders, reads, writes, seed=0):
+    """Shuffled list of ("read", function) and ("write", sender) jobs"""
+    rng = random.Random(seed)
+    jobs = [("read", READ_FUNCTIONS[index % len(READ_FUNCTIONS)]) for index in range(reads)]
+    jobs += [("write", senders[index % len(senders)]) for index in range(writes)]
+    rng.shuffle(jobs)
+    return jobs
+
+
+async def run_job(web3, contract, job, latencies, errors):
+    kind, target = job
+    started = time.perf_counter()
+
+    try:
+        if kind == "read":
+            await contract.functions[target]().call()
+        else:
+            tx_hash = await contract.functions.increment().transact({'from': target})
+            await web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=0.01)
+    except Exception:
+        errors[kind] = errors.get(kind, 0) + 1
+        return
+
+    latencies[kind].append(time.perf_counter() - started)
+
+
+def _stats(elapsed, latencies, errors, concurrency, max_in_flight):
+    total = sum(len(samples) for samples in latencies.values())
+    return {
+        "elapsed_seconds": elapsed,
+        "concurrency": concurrency,
+        "max_in_flight": max_in_flight,
+        "requests": total,
+        "requests_per_second": total / elapsed if elapsed else 0.0,
+        "errors": errors,
+        "latency": {kind: latency_stats(samples) for kind, samples in latencies.items() if samples}
+    }
+
+
+async def run_sequential(web3, contract, jobs):
+    """Await every job in turn, the pattern the synchronous suite uses"""
+    latencies = {"read": [], "write": []}
+    errors = {}
+
+    started = time.perf_counter()
+    for job in jobs:
+        await run_job(web3, contract, job, latencies, errors)
+
+    return _stats(time.perf_counter() - started, latencies, errors, 1, 1)
+
+
+async def run_concurrent(web3, contract, jobs, concurrency=DEFAULT_CONCURRENCY, queue_size=DEFAULT_QUEUE_SIZE):
+    """Feed jobs through a bounded queue to `concurrency` workers
+
+    The producer blocks once `queue_size` jobs are waiting, so a slow backend
+    holds back submission instead of growing an unbounded backlog.
+    """
+    latencies = {"read": [], "write": []}
+    errors = {}
+    queue = asyncio.Queue(maxsize=queue_size)
+    in_flight = {"now": 0, "max": 0}
+
+    async def worker():
+        while True:
+            job = await queue.get()
+            try:
+                if job is None:
+                    return
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                await run_job(web3, contract, job, latencies, errors)
+                in_flight["now"] -= 1
+            finally:
+                queue.task_done()
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+
+    for job in jobs:
+        await queue.put(job)
+    for _ in workers:
+        await queue.put(None)
+
+    await asyncio.gather(*workers)
+    return _stats(time.perf_counter() - started, latencies, errors, concurrency, in_flight["max"])
+
+
+async def compare(web3, contract, jobs, concurrency=DEFAULT_CONCURRENCY, queue_size=DEFAULT_QUEUE_SIZE):
+    """Sequential vs concurrent run of the same jobs, with the speedup between them"""
+    sequential = await run_sequential(web3, contract, jobs)
+    concurrent = await run_concurrent(web3, contract, jobs, concurrency, queue_size)
+
+    return {
+        "sequential": sequential,
+        "concurrent": concurrent,
+        "speedup": sequential["elapsed_seconds"] / concurrent["elapsed_seconds"] if concurrent["elapsed_seconds"] else 0.0
+    }
+
+
+def format_comparison(result):
+    lines = ["\n⚡ Async client harness"]
+    for mode in ("sequential", "concurrent"):
+        stats = result[mode]
+        latency = ", ".join(
+            f"{kind} p50 {values['p50_ms']:.1f}ms / p99 {values['p99_ms']:.1f}ms"
+            for kind, values in stats["latency"].items()
+        )
+        lines.append(
+            f"   {mode} (concurrency {stats['concurrency']}, peak in flight {stats['max_in_flight']}): "
+            f"{stats['requests']} requests in {stats['elapsed_seconds']:.2f}s "
+            f"= {stats['requests_per_second']:.1f} req/s; {latency}"
+        )
+        if stats["errors"]:
+            lines.append(f"   ⚠️  errors: {stats['errors']}")
+
+    lines.append(f"   speedup from overlapping requests: {result['speedup']:.2f}x")
+    return "\n".join(lines)
+
+
+async def _main(args):
+    web3 = await connect(args.rpc_url, args.simulated_latency_ms / 1000)
+    accounts = await web3.eth.accounts
+    if args.senders > len(accounts):
+        raise SystemExit(f"--senders {args.senders} exceeds the {len(accounts)} accounts available")
+
+    artifact = load_simple_storage_artifact(install_solc=args.install_solc)
+    contract = await deploy(web3, artifact["abi"], artifact["bytecode"], accounts[0])
+
+    jobs = build_jobs(accounts[:args.senders], args.reads, args.writes, args.seed)
+    return await compare(web3, contract, jobs, args.concurrency, args.queue_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rpc-url", default=None)
+    parser.add_argument("--reads", type=int, default=1000)
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--senders", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument("--simulated-latency-ms", type=float, default=0.0,
+                        help="Per-request delay added to the eth-tester stand-in")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None)
+    parser.add_argument("--install-solc", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(_main(args))
+    print(format_comparison(result))
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(result, file, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Chain construction, deployment and snapshot isolation helpers"""
+from contextlib import contextmanager
+
+from eth_tester import EthereumTester
+from web3 import Web3
+from web3.providers.eth_tester import EthereumTesterProvider
+
+from support.receipts import InstantReceipts
+
+INITIAL_VALUE = 42
+
+# SimpleStorage storage layout (declaration order in contracts/SimpleStorage.sol)
+STORAGE_SLOTS = {
+    "value": 0,
+    "owner": 1,
+    "lastUpdated": 2
+}
+
+
+def create_web3(tester=None, instant_receipts=True):
+    """Create a Web3 instance connected to an EthereumTester (a new one by default)
+
+    With instant_receipts, web3.eth's receipt methods read the mined block
+    directly instead of polling (see support.receipts).
+    """
+    if tester is None:
+        tester = EthereumTester()
+
+    web3 = Web3(EthereumTesterProvider(tester))
+    if instant_receipts:
+        InstantReceipts(web3).install()
+
+    # Verify connection
+    assert web3.is_connected()
+
+    return web3
+
+
+def deploy_simple_storage(web3, abi, bytecode, owner, initial_value=INITIAL_VALUE):
+    """Deploy SimpleStorage and return the same record the deployed_contract fixture exposes"""
+    factory = web3.eth.contract(abi=abi, bytecode=bytecode)
+
+    tx_hash = factory.constructor(initial_value).transact({'from': owner})
+    tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+
+    contract = web3.eth.contract(address=tx_receipt.contractAddress, abi=abi)
+
+    return {
+        "contract": contract,
+        "address": tx_receipt.contractAddress,
+        "tx_hash": tx_hash,
+        "tx_receipt": tx_receipt,
+        "initial_value": initial_value,
+        "preloaded": False
+    }
+
+
+@contextmanager
+def snapshot_isolation(tester):
+    """Roll `tester` back to its current state when the block exits"""
+    snapshot_id = tester.take_snapshot()
+    auto_mine = tester.auto_mine_transactions
+
+    try:
+        yield snapshot_id
+    finally:
+        # Tests may switch to manual mining; hand the next test the original mode.
+        # Re-enabling mines any pending transactions, so do it before rolling back
+        if auto_mine and not tester.auto_mine_transactions:
+            tester.enable_auto_mine_transactions()
+        elif not auto_mine and tester.auto_mine_transactions:
+            tester.disable_auto_mine_transactions()
+
+        tester.revert_to_snapshot(snapshot_id)
@@ -0,0 +1,217 @@
+"""Project SimpleStorage operation costs across a whole gas-price distribution
+
+Usage (from test/python):
+
+    python -m pytest --gas-report --report-json report.json
+    python -m support.costs --report report.json --prices gas_prices.csv --output costs.csv
+
+format_gas_cost prices one gasUsed at one price. This module prices every
+recorded gasUsed of a method against every row of a gas-price CSV at once.
+Each row of the CSV is one observation of a time series, or one point of a
+distribution when a count column says how often that price occurs. Costs stay
+exact integer wei: an int64 NumPy outer product when the largest
+gas x price fits, and Python integers in an object array otherwise. The
+percentiles are weighted nearest-rank over all (sample, price) pairs, with no
+Python loop per pair.
+
+NumPy is optional for the rest of the suite and only imported here.
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+from support.gas import format_gas_cost, percentile, wei_to_ether
+
+DEFAULT_PRICE_COLUMN = "gas_price_gwei"
+DEFAULT_PERCENTILES = (0.5, 0.95, 0.99)
+
+WEI_PER_UNIT = {"wei": 1, "gwei": 10 ** 9, "ether": 10 ** 18}
+
+_INT64_MAX = 2 ** 63 - 1
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError("Cost projection needs NumPy: pip install numpy") from exc
+    return numpy
+
+
+def load_gas_prices(path, column=DEFAULT_PRICE_COLUMN, unit="gwei", count_column=None):
+    """(prices in wei, counts) as int64 arrays from a CSV; decimal prices are converted exactly"""
+    np = _numpy()
+    scale = WEI_PER_UNIT[unit]
+    prices, counts = [], []
+
+    with open(path, "r", newline="") as file:
+        for line, row in enumerate(csv.DictReader(file), start=2):
+            try:
+                price = Decimal(row[column]) * scale
+                count = int(row[count_column]) if count_column else 1
+            except (KeyError, ArithmeticError, ValueError) as exc:
+                raise ValueError(f"{path}:{line}: cannot read a {unit} price from column '{column}'") from exc
+            if price != price.to_integral_value() or price < 0 or count < 0:
+                raise ValueError(f"{path}:{line}: {row[column]} {unit} is not a whole, non-negative wei amount")
+            prices.append(int(price))
+            counts.append(count)
+
+    if not prices:
+        raise ValueError(f"No gas prices in {path}")
+    if not sum(counts):
+        raise ValueError(f"{path}: the '{count_column}' column sums to zero, so no price carries any weight")
+
+    return np.array(prices, dtype=np.int64), np.array(counts, dtype=np.int64)
+
+
+def load_gas_samples(path, by_method=False):
+    """gasUsed lists per benchmark key from a --report-json file, or per method with by_method"""
+    with open(path, "r") as file:
+        records = json.load(file).get("gas_benchmark") or []
+
+    samples = {}
+    for record in records:
+        key = record["key"].split("[", 1)[0] if by_method else record["key"]
+        samples.setdefault(key, []).append(record["gas_used"])
+    return samples
+
+
+def cost_matrix(gas_used, prices):
+    """Exact wei cost of every (gasUsed, price) pair, shape (len(gas_used), len(prices))"""
+    np = _numpy()
+    gas = np.asarray(gas_used, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.int64)
+
+    # int64 is exact up to 2**63 - 1; beyond that fall back to Python integers
+    if int(gas.max(initial=0)) * int(prices.max(initial=0)) > _INT64_MAX:
+        return np.multiply.outer(gas.astype(object), prices.astype(object))
+    return np.multiply.outer(gas, prices)
+
+
+def weighted_percentiles(values, weights, fractions):
+    """Nearest-rank percentiles of `values`, each counted `weights` times; exact elements of `values`"""
+    np = _numpy()
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    cumulative = np.cumsum(weights[order], dtype=np.int64)
+    total = int(cumulative[-1])
+
+    # Smallest rank r with cumulative weight >= ceil(fraction * total), as in support.gas.percentile
+    ranks = [max(1, math.ceil(Decimal(str(fraction)) * total)) for fraction in fractions]
+    positions = np.searchsorted(cumulative, ranks, side="left")
+    return [int(ordered[position]) for position in positions]
+
+
+def project_costs(samples, prices, counts=None, fractions=DEFAULT_PERCENTILES):
+    """Per-key cost statistics in wei over all (sample, price) pairs; returns (rows, matrices)"""
+    np = _numpy()
+    prices = np.asarray(prices, dtype=np.int64)
+    counts = np.ones(len(prices), dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+    price_weight = int(counts.sum())
+    if price_weight <= 0:
+        raise ValueError("Price counts sum to zero; at least one price needs a positive count")
+    weighted_price_sum = int((prices.astype(object) * counts.astype(object)).sum())
+
+    rows, matrices = [], {}
+    for key, gas_used in sorted(samples.items()):
+        gas = np.asarray(gas_used, dtype=np.int64)
+        matrix = cost_matrix(gas, prices)
+        matrices[key] = matrix
+
+        # Every gas sample is equally likely; each price column carries its count
+        weights = np.broadcast_to(counts, matrix.shape).ravel()
+        quantiles = weighted_percentiles(matrix.ravel(), weights, fractions)
+
+        row = {
+            "key": key,
+            "samples": len(gas),
+            "prices": len(prices),
+            "pairs": matrix.size,
+            "min_wei": int(matrix.min()),
+            "max_wei": int(matrix.max()),
+            # Exact mean, rounded down to a whole wei
+            "mean_wei": int(gas.astype(object).sum()) * weighted_price_sum // (len(gas) * price_weight)
+        }
+        for fraction, value in zip(fractions, quantiles):
+            row[f"p{round(fraction * 100)}_wei"] = value
+        rows.append(row)
+
+    return rows, matrices
+
+
+def budget(rows, volumes, fraction=0.95):
+    """Wei needed for `volumes` ({key: operations}), pricing each key at its percentile column"""
+    column = f"p{round(fraction * 100)}_wei"
+    by_key = {row["key"]: row for row in rows}
+    return sum(by_key[key][column] * int(operations) for key, operations in volumes.items())
+
+
+def export_projection(rows, path):
+    """Write rows as CSV or JSON, picked by the file suffix; wei stays integer"""
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path, "w") as file:
+            json.dump(rows, file, indent=2)
+        return
+
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def save_matrices(matrices, path):
+    """Full cost matrices in one .npz archive, one array per key"""
+    np = _numpy()
+    np.savez_compressed(path, **{key: matrix.astype(str) if matrix.dtype == object else matrix
+                                  for key, matrix in matrices.items()})
+
+
+def format_projection(rows, samples, prices, counts):
+    """Table of percentile costs in ETH, with the typical case priced through format_gas_cost"""
+    median_price_gwei = weighted_percentiles(prices, counts, [0.5])[0] / 10 ** 9
+    lines = [f"\n💸 Cost projection over {len(prices):,} gas prices (p50 / p95 / p99 ETH)"]
+    for row in rows:
+        typical = format_gas_cost(percentile(samples[row["key"]], 0.5), median_price_gwei)
+        lines.append(
+            f"   {row['key']}: {wei_to_ether(row['p50_wei']):.6f} / {wei_to_ether(row['p95_wei']):.6f} / "
+            f"{wei_to_ether(row['p99_wei']):.6f} over {row['pairs']:,} pairs (typical: {typical['formatted']})"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--report", required=True, help="JSON written by pytest --gas-report --report-json")
+    parser.add_argument("--prices", required=True, help="CSV of gas prices")
+    parser.add_argument("--column", default=DEFAULT_PRICE_COLUMN)
+    parser.add_argument("--unit", choices=sorted(WEI_PER_UNIT), default="gwei")
+    parser.add_argument("--count-column", default=None, help="Column with how often each price occurs")
+    parser.add_argument("--by-method", action="store_true", help="Merge call paths of the same method")
+    parser.add_argument("--output", default=None, help="Write the projection as .csv or .json")
+    parser.add_argument("--matrices", default=None, help="Also save every cost matrix to this .npz file")
+    args = parser.parse_args(argv)
+
+    samples = load_gas_samples(args.report, args.by_method)
+    if not samples:
+        print(f"❌ No gas samples in {args.report}; run pytest with --gas-report --report-json")
+        return 1
+
+    prices, counts = load_gas_prices(args.prices, args.column, args.unit, args.count_column)
+    rows, matrices = project_costs(samples, prices, counts)
+
+    print(format_projection(rows, samples, prices, counts))
+    if args.output:
+        export_projection(rows, args.output)
+    if args.matrices:
+        save_matrices(matrices, args.matrices)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Direct SimpleStorage driver for an in-process EthereumTester
+
+Usage (from test/python):
+
+    python -m support.driver --operations 300
+
+FastDriver computes function selectors and ABI types once and hands
+hex-encoded calldata straight to EthereumTester. This skips web3's contract
+lookup, middleware onion, request formatters and provider. It returns a small
+FastReceipt instead of an AttributeDict receipt. Running the module times the
+same operations through web3 and through the driver.
+"""
+import argparse
+import sys
+import time
+from collections import namedtuple
+
+from eth_abi import encode as abi_encode
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+
+from support.artifacts import load_simple_storage_artifact
+from support.batch import DEFAULT_BATCH_GAS
+from support.chain import create_web3, deploy_simple_storage
+from support.events import _canonical_type
+from support.loadgen import latency_stats
+from support.multicall import decode_output
+
+FastReceipt = namedtuple("FastReceipt", ["transactionHash", "blockNumber", "gasUsed", "status", "logs"])
+
+
+class FastDriver:
+    """Send SimpleStorage transactions and calls straight to an EthereumTester"""
+
+    def __init__(self, tester, address, abi, gas=DEFAULT_BATCH_GAS):
+        self.tester = tester
+        self.address = to_checksum_address(address)
+        self.gas = gas
+        self.functions = {}
+        # eth-tester requires a sender even for eth_call
+        self.default_sender = tester.get_accounts()[0]
+
+        for entry in abi:
+            if entry.get("type") != "function":
+                continue
+            self.functions[entry["name"]] = {
+                "abi": entry,
+                "selector": function_abi_to_4byte_selector(entry),
+                "types": [_canonical_type(abi_input) for abi_input in entry["inputs"]]
+            }
+
+    def encode(self, name, *args):
+        """Hex calldata for `name(*args)`"""
+        function = self.functions[name]
+        return "0x" + (function["selector"] + abi_encode(function["types"], args)).hex()
+
+    def transact(self, name, *args, sender, gas=None):
+        """Send and auto-mine one transaction; a revert shows up as status 0, not an exception"""
+        tx_hash = self.tester.send_transaction({
+            "from": sender,
+            "to": self.address,
+            "gas": gas or self.gas,
+            "data": self.encode(name, *args)
+        })
+        receipt = self.tester.get_transaction_receipt(tx_hash)
+
+        return FastReceipt(
+            transactionHash=tx_hash,
+            blockNumber=receipt["block_number"],
+            gasUsed=receipt["gas_used"],
+            status=receipt["status"],
+            logs=receipt["logs"]
+        )
+
+    def call(self, name, *args, sender=None):
+        """eth_call against the latest block, decoded like web3 would"""
+        return_data = self.tester.call({
+            "from": sender or self.default_sender,
+            "to": self.address,
+            "data": self.encode(name, *args)
+        }, "latest")
+        return decode_output(self.functions[name]["abi"], bytes.fromhex(return_data[2:]))
+
+
+def benchmark(web3, contract, driver, sender, operations):
+    """Per-operation latency of web3 vs FastDriver for a write and a read"""
+    samples = {"web3": {"increment": [], "getValue": []}, "driver": {"increment": [], "getValue": []}}
+
+    for _ in range(operations):
+        started = time.perf_counter()
+        tx_hash = contract.functions.increment().transact({'from': sender})
+        web3.eth.get_transaction_receipt(tx_hash)
+        samples["web3"]["increment"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        contract.functions.getValue().call()
+        samples["web3"]["getValue"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        driver.transact("increment", sender=sender)
+        samples["driver"]["increment"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        driver.call("getValue")
+        samples["driver"]["getValue"].append(time.perf_counter() - started)
+
+    return {
+        path: {operation: latency_stats(values) for operation, values in operations_samples.items()}
+        for path, operations_samples in samples.items()
+    }
+
+
+def format_benchmark(result):
+    lines = ["\n🏎️  web3 vs FastDriver (p50 / p95 per operation)"]
+    for operation in ("increment", "getValue"):
+        web3_stats = result["web3"][operation]
+        driver_stats = result["driver"][operation]
+        speedup = web3_stats["p50_ms"] / driver_stats["p50_ms"] if driver_stats["p50_ms"] else 0.0
+        lines.append(
+            f"   {operation}: web3 {web3_stats['p50_ms']:.2f} / {web3_stats['p95_ms']:.2f}ms, "
+            f"driver {driver_stats['p50_ms']:.2f} / {driver_stats['p95_ms']:.2f}ms ({speedup:.1f}x)"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--install-solc", action="store_true")
+    args = parser.parse_args(argv)
+
+    artifact = load_simple_storage_artifact(install_solc=args.install_solc)
+    web3 = create_web3()
+    owner, sender = web3.eth.accounts[:2]
+    deployment = deploy_simple_storage(web3, artifact["abi"], artifact["bytecode"], owner)
+    driver = FastDriver(web3.provider.ethereum_tester, deployment["address"], artifact["abi"])
+
+    print(format_benchmark(benchmark(web3, deployment["contract"], driver, sender, args.operations)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""ABI log decoding through a topic0 index built once per contract ABI"""
+from collections import namedtuple
+
+from eth_abi import decode as abi_decode
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+from hexbytes import HexBytes
+
+# Log metadata carried on every decoded record, next to the event arguments
+LOG_FIELDS = ("address", "blockNumber", "transactionHash", "logIndex")
+
+
+def _canonical_type(abi_input):
+    """ABI type string as used in signatures and by eth_abi (tuples expanded)"""
+    abi_type = abi_input["type"]
+    if abi_type.startswith("tuple"):
+        inner = ",".join(_canonical_type(component) for component in abi_input["components"])
+        return f"({inner}){abi_type[len('tuple'):]}"
+    return abi_type
+
+
+def _topic_decoder(abi_type):
+    """Fast decoder for one indexed argument stored in a 32-byte topic"""
+    # Dynamic indexed values (string, bytes, arrays, tuples) are only stored as their hash
+    if abi_type in ("string", "bytes") or abi_type.endswith("]") or abi_type.startswith("("):
+        return lambda topic: topic
+
+    if abi_type == "address":
+        return lambda topic: to_checksum_address(topic[12:])
+    if abi_type == "bool":
+        return lambda topic: topic[-1] == 1
+    if abi_type.startswith("uint"):
+        return lambda topic: int.from_bytes(topic, "big")
+    if abi_type.startswith("int"):
+        return lambda topic: int.from_bytes(topic, "big", signed=True)
+    if abi_type.startswith("bytes"):
+        size = int(abi_type[len("bytes"):])
+        return lambda topic: topic[:size]
+
+    return lambda topic: topic
+
+
+def build_event_index(abi):
+    """Map topic0 bytes to a decoding plan for every non-anonymous event in `abi`"""
+    index = {}
+
+    for entry in abi:
+        if entry.get("type") != "event" or entry.get("anonymous"):
+            continue
+
+        inputs = entry["inputs"]
+        names = [abi_input["name"] for abi_input in inputs]
+        indexed = [abi_input for abi_input in inputs if abi_input["indexed"]]
+        data_inputs = [abi_input for abi_input in inputs if not abi_input["indexed"]]
+
+        index[event_abi_to_log_topic(entry)] = {
+            "name": entry["name"],
+            "abi": entry,
+            "record": namedtuple(entry["name"], names + list(LOG_FIELDS)),
+            "names": names,
+            "indexed": [(abi_input["name"], _topic_decoder(_canonical_type(abi_input))) for abi_input in indexed],
+            "data_names": [abi_input["name"] for abi_input in data_inputs],
+            "data_types": [_canonical_type(abi_input) for abi_input in data_inputs]
+        }
+
+    return index
+
+
+def _log_field(log, camel, snake):
+    value = log.get(camel)
+    return log.get(snake) if value is None else value
+
+
+class LogDecoder:
+    """Decode raw logs (web3 or eth-tester shaped) into one namedtuple type per event"""
+
+    def __init__(self, abi, address=None):
+        self.index = build_event_index(abi)
+        self.address = to_checksum_address(address) if address else None
+        self.topics_by_name = {plan["name"]: topic for topic, plan in self.index.items()}
+
+    def topic(self, event_name):
+        """topic0 of an event, for building log filters"""
+        return self.topics_by_name[event_name]
+
+    def decode_log(self, log):
+        """Decode one log, or return None if it is not one of this ABI's events"""
+        topics = log["topics"]
+        if not topics:
+            return None
+
+        plan = self.index.get(bytes(HexBytes(topics[0])))
+        if plan is None or len(topics) != len(plan["indexed"]) + 1:
+            return None
+
+        address = to_checksum_address(log["address"])
+        if self.address is not None and address != self.address:
+            return None
+
+        values = {}
+        for (name, decode), topic in zip(plan["indexed"], topics[1:]):
+            values[name] = decode(bytes(HexBytes(topic)))
+
+        if plan["data_types"]:
+            decoded = abi_decode(plan["data_types"], bytes(HexBytes(log["data"])))
+            values.update(zip(plan["data_names"], decoded))
+
+        transaction_hash = _log_field(log, "transactionHash", "transaction_hash")
+
+        return plan["record"](
+            *(values[name] for name in plan["names"]),
+            address=address,
+            blockNumber=_log_field(log, "blockNumber", "block_number"),
+            transactionHash=HexBytes(transaction_hash) if transaction_hash is not None else None,
+            logIndex=_log_field(log, "logIndex", "log_index")
+        )
+
+    def decode_logs(self, logs, event_name=None):
+        """Decode a batch of logs, skipping foreign ones and optionally keeping one event type"""
+        topic0 = self.topics_by_name[event_name] if event_name else None
+        records = []
+
+        for log in logs:
+            topics = log["topics"]
+            if topic0 is not None and (not topics or bytes(HexBytes(topics[0])) != topic0):
+                continue
+
+            record = self.decode_log(log)
+            if record is not None:
+                records.append(record)
+
+        return records
+
+    def decode_receipt(self, receipt, event_name=None):
+        return self.decode_logs(receipt["logs"], event_name)
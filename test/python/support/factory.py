@@ -0,0 +1,196 @@
+"""Deploy thousands of SimpleStorage instances in batched creation blocks
+
+Usage (from test/python):
+
+    python -m support.factory --counts 100,500,1000 --owners 3
+
+deploy_many puts creation transactions straight into the eth-tester pending
+block, the same way TransactionBatch handles calls, and mines them
+DEFAULT_MAX_PER_BLOCK at a time. Addresses are derived from each owner's
+nonce rather than polled. The result is a DeploymentRegistry: addresses in
+one bytearray, plus an owner index per instance in an `array`.
+"""
+import argparse
+import random
+import resource
+import sys
+import time
+from array import array
+
+import rlp
+from eth_abi import encode as abi_encode
+from eth_utils import keccak, to_canonical_address, to_checksum_address
+from hexbytes import HexBytes
+
+from support.artifacts import load_simple_storage_artifact
+from support.batch import DEFAULT_MAX_PER_BLOCK, add_to_pending_block, clear_pending_block
+from support.chain import INITIAL_VALUE, create_web3
+from support.driver import FastDriver
+from support.receipts import InstantReceipts
+
+# Enough for the SimpleStorage constructor; 25 creations stay well under the block gas limit
+DEFAULT_DEPLOY_GAS = 600_000
+
+
+def contract_address(sender, nonce):
+    """CREATE address for a contract deployed by `sender` at `nonce`"""
+    return keccak(rlp.encode([to_canonical_address(sender), nonce]))[12:]
+
+
+class DeploymentRegistry:
+    """Compact, array-backed list of (address, owner) for many deployments"""
+
+    ADDRESS_SIZE = 20
+
+    def __init__(self, owners):
+        self.owners = [to_checksum_address(owner) for owner in owners]
+        self._owner_index = {owner: index for index, owner in enumerate(self.owners)}
+        self._addresses = bytearray()
+        self._owner_ids = array("H")
+
+    def append(self, address, owner):
+        self._addresses += address if isinstance(address, bytes) else to_canonical_address(address)
+        self._owner_ids.append(self._owner_index[to_checksum_address(owner)])
+
+    def __len__(self):
+        return len(self._owner_ids)
+
+    def address(self, index):
+        start = index * self.ADDRESS_SIZE
+        return to_checksum_address(bytes(self._addresses[start:start + self.ADDRESS_SIZE]))
+
+    def owner(self, index):
+        return self.owners[self._owner_ids[index]]
+
+    def __getitem__(self, index):
+        return self.address(index), self.owner(index)
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    def addresses(self):
+        return [self.address(index) for index in range(len(self))]
+
+    def owned_by(self, owner):
+        """Indexes of the instances `owner` deployed"""
+        owner_id = self._owner_index[to_checksum_address(owner)]
+        return [index for index, value in enumerate(self._owner_ids) if value == owner_id]
+
+    def nbytes(self):
+        """Bytes held by the address and owner arrays"""
+        return len(self._addresses) + self._owner_ids.itemsize * len(self._owner_ids)
+
+
+def deploy_many(web3, abi, bytecode, count, owners, initial_value=INITIAL_VALUE,
+                gas=DEFAULT_DEPLOY_GAS, max_per_block=DEFAULT_MAX_PER_BLOCK):
+    """Deploy `count` SimpleStorage instances, owners taking turns; return a DeploymentRegistry
+
+    Raises RuntimeError if any creation transaction fails.
+    """
+    tester = web3.provider.ethereum_tester
+    registry = DeploymentRegistry(owners)
+    data = "0x" + (bytes(HexBytes(bytecode)) + abi_encode(["uint256"], [initial_value])).hex()
+    nonces = {owner: tester.get_nonce(owner) for owner in registry.owners}
+
+    # Never queue more creations than the block gas limit can hold
+    per_block_limit = web3.eth.get_block("latest").gasLimit // gas
+    max_per_block = min(max_per_block, per_block_limit) if max_per_block else per_block_limit
+
+    tx_hashes = []
+    queued_in_block = 0
+
+    try:
+        for index in range(count):
+            owner = registry.owners[index % len(registry.owners)]
+            tx_hashes.append(add_to_pending_block(tester, {
+                "from": owner,
+                "gas": gas,
+                "value": 0,
+                "data": data,
+                "nonce": nonces[owner]
+            }))
+            registry.append(contract_address(owner, nonces[owner]), owner)
+            nonces[owner] += 1
+            queued_in_block += 1
+
+            if queued_in_block >= max_per_block:
+                tester.mine_blocks(1)
+                queued_in_block = 0
+    except BaseException:
+        # Leave no half-queued creations behind for the next transaction to mine
+        if queued_in_block:
+            clear_pending_block(tester)
+        raise
+
+    if queued_in_block:
+        tester.mine_blocks(1)
+
+    # One receipts read per mined block; get_transaction_receipt scans back from the head per hash
+    receipts = InstantReceipts(web3).receipts(tx_hashes)
+    failed = [index for index, receipt in enumerate(receipts) if receipt is None or receipt.status != 1]
+    if failed:
+        raise RuntimeError(f"{len(failed)} of {count} SimpleStorage deployments failed (first at index {failed[0]})")
+
+    return registry
+
+
+def max_rss_mb():
+    """Peak resident memory of this process in MB (Linux reports KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark(artifact, counts, owners=3, operations=50, seed=0):
+    """Deployment time, per-instance increment cost and peak memory for each K in `counts`"""
+    results = []
+    for count in counts:
+        web3 = create_web3()
+        senders = web3.eth.accounts[:owners]
+
+        started = time.perf_counter()
+        registry = deploy_many(web3, artifact["abi"], artifact["bytecode"], count, senders)
+        deploy_seconds = time.perf_counter() - started
+
+        rng = random.Random(seed)
+        tester = web3.provider.ethereum_tester
+        started = time.perf_counter()
+        for _ in range(operations):
+            address, owner = registry[rng.randrange(count)]
+            FastDriver(tester, address, artifact["abi"]).transact("increment", sender=owner)
+        operation_ms = (time.perf_counter() - started) / operations * 1000
+
+        results.append({
+            "instances": count,
+            "deploy_seconds": deploy_seconds,
+            "deploys_per_second": count / deploy_seconds,
+            "increment_ms": operation_ms,
+            "registry_bytes": registry.nbytes(),
+            "max_rss_mb": max_rss_mb()
+        })
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", default="100,500,1000", help="Comma-separated instance counts")
+    parser.add_argument("--owners", type=int, default=3)
+    parser.add_argument("--operations", type=int, default=50, help="Increments timed per count")
+    parser.add_argument("--install-solc", action="store_true")
+    args = parser.parse_args(argv)
+
+    artifact = load_simple_storage_artifact(install_solc=args.install_solc)
+    counts = [int(count) for count in args.counts.split(",")]
+
+    print("\n🏭 Mass deployment")
+    for result in benchmark(artifact, counts, args.owners, args.operations):
+        print(
+            f"   K={result['instances']:,}: deployed in {result['deploy_seconds']:.1f}s "
+            f"({result['deploys_per_second']:.0f}/s), increment {result['increment_ms']:.1f}ms, "
+            f"registry {result['registry_bytes']:,} B, peak RSS {result['max_rss_mb']:.0f} MB"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
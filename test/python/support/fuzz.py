@@ -0,0 +1,263 @@
+"""Stateful fuzzing of SimpleStorage against a Python reference model
+
+Usage (from test/python):
+
+    python -m support.fuzz --sequences 200 --length 8 --seed 1
+
+The fuzzer builds random call sequences over every state-changing function
+and sender, with arguments biased toward the 1_000_000 bound. It runs them
+through FastDriver and, after each step, compares the revert status and the
+decoded storage slots with ReferenceModel. Each sequence shares a prefix with
+`branches - 1` siblings. The prefix runs once under an eth-tester snapshot,
+and every suffix rewinds to that snapshot instead of redeploying. A failing
+sequence is shrunk by dropping calls and simplifying arguments until nothing
+smaller still fails.
+"""
+import argparse
+import copy
+import random
+import sys
+import time
+from collections import namedtuple
+
+from support.artifacts import load_simple_storage_artifact
+from support.chain import create_web3, deploy_simple_storage
+from support.driver import FastDriver
+from support.storage import StorageInspector
+
+MAX_VALUE = 1_000_000
+ZERO_ADDRESS = "0x" + "00" * 20
+
+# Arguments that sit on or next to the contract's edges
+BOUNDARY_VALUES = (0, 1, MAX_VALUE - 2, MAX_VALUE - 1, MAX_VALUE, 2 ** 256 - 1)
+
+Call = namedtuple("Call", ["name", "args", "sender"])
+FuzzFailure = namedtuple("FuzzFailure", ["sequence", "step", "message"])
+
+
+class ReferenceModel:
+    """What SimpleStorage should do, in plain Python"""
+
+    max_value = MAX_VALUE
+
+    def __init__(self, owner, value):
+        self.owner = owner
+        self.value = value
+
+    def apply(self, call):
+        """Update the model for `call`; return (should_succeed, changes_value)"""
+        name, args, sender = call
+        is_owner = sender == self.owner
+
+        if name == "setValue":
+            if not is_owner or args[0] >= self.max_value:
+                return False, False
+            self.value = args[0]
+        elif name == "increment":
+            if self.value + 1 >= self.max_value:
+                return False, False
+            self.value += 1
+        elif name == "decrement":
+            if self.value == 0:
+                return False, False
+            self.value -= 1
+        elif name == "addValue":
+            if self.value + args[0] >= self.max_value:
+                return False, False
+            self.value += args[0]
+        elif name == "reset":
+            if not is_owner:
+                return False, False
+            self.value = 0
+        elif name == "transferOwnership":
+            if not is_owner or args[0] in (ZERO_ADDRESS, self.owner):
+                return False, False
+            self.owner = args[0]
+            return True, False
+        else:
+            raise ValueError(f"Unknown SimpleStorage function '{name}'")
+
+        return True, True
+
+
+def random_call(rng, senders):
+    """One random call, with arguments biased toward boundaries"""
+    name = rng.choice(("setValue", "increment", "decrement", "addValue", "reset", "transferOwnership"))
+    sender = rng.choice(senders)
+
+    if name == "transferOwnership":
+        return Call(name, (rng.choice(senders + [ZERO_ADDRESS]),), sender)
+    if name in ("setValue", "addValue"):
+        amount = rng.choice(BOUNDARY_VALUES) if rng.random() < 0.3 else rng.randint(0, 2_000)
+        return Call(name, (amount,), sender)
+    return Call(name, (), sender)
+
+
+def format_sequence(sequence, names=None):
+    """One line per call, e.g. `setValue(5) from owner`"""
+    names = names or {}
+    lines = []
+    for name, args, sender in sequence:
+        shown = ", ".join(names.get(arg, str(arg)) if isinstance(arg, str) else f"{arg:_}" for arg in args)
+        lines.append(f"{name}({shown}) from {names.get(sender, sender)}")
+    return "\n".join(lines)
+
+
+class Fuzzer:
+    """Run random SimpleStorage call sequences under snapshots and check them against a model"""
+
+    def __init__(self, driver, inspector, senders, owner, initial_value, seed=0, model_class=ReferenceModel):
+        self.driver = driver
+        self.tester = driver.tester
+        self.inspector = inspector
+        self.senders = list(senders)
+        self.rng = random.Random(seed)
+        self.base_model = model_class(owner, initial_value)
+        self.sequences_run = 0
+        self.calls_run = 0
+
+    def _check(self, model, call, step, last_updated):
+        """Run one call and compare it with the model; return (failure message or None, lastUpdated)"""
+        should_succeed, changes_value = model.apply(call)
+        receipt = self.driver.transact(call.name, *call.args, sender=call.sender)
+        self.calls_run += 1
+
+        if bool(receipt.status) != should_succeed:
+            expected = "succeed" if should_succeed else "revert"
+            return f"step {step}: expected {call.name} to {expected}", last_updated
+
+        state = self.inspector.snapshot(self.driver.address)
+        if state.value != model.value:
+            return f"step {step}: value is {state.value}, model says {model.value}", last_updated
+        if state.owner != model.owner:
+            return f"step {step}: owner is {state.owner}, model says {model.owner}", last_updated
+        if state.lastUpdated < last_updated or (state.lastUpdated != last_updated and not (receipt.status and changes_value)):
+            return f"step {step}: lastUpdated moved from {last_updated} to {state.lastUpdated}", last_updated
+
+        return None, state.lastUpdated
+
+    def _run_steps(self, model, calls, offset, last_updated):
+        for index, call in enumerate(calls):
+            message, last_updated = self._check(model, call, offset + index, last_updated)
+            if message is not None:
+                return message, last_updated
+        return None, last_updated
+
+    def replay(self, sequence):
+        """Run `sequence` from the base state and rewind; return the failure message or None"""
+        snapshot = self.tester.take_snapshot()
+        try:
+            last_updated = self.inspector.snapshot(self.driver.address).lastUpdated
+            message, _ = self._run_steps(copy.copy(self.base_model), sequence, 0, last_updated)
+            return message
+        finally:
+            self.tester.revert_to_snapshot(snapshot)
+
+    def run(self, sequences=100, length=8, branches=4):
+        """Fuzz `sequences` sequences of `length` calls; return shrunk failures"""
+        failures = []
+        prefix_length = length // 2
+
+        while self.sequences_run < sequences:
+            prefix = [random_call(self.rng, self.senders) for _ in range(prefix_length)]
+            failing = []
+            base = self.tester.take_snapshot()
+            try:
+                model = copy.copy(self.base_model)
+                last_updated = self.inspector.snapshot(self.driver.address).lastUpdated
+                message, last_updated = self._run_steps(model, prefix, 0, last_updated)
+                if message is not None:
+                    self.sequences_run += 1
+                    failing.append(prefix)
+                else:
+                    # Siblings share the prefix; each suffix rewinds to this snapshot
+                    branch_point = self.tester.take_snapshot()
+                    for _ in range(min(branches, sequences - self.sequences_run)):
+                        suffix = [random_call(self.rng, self.senders) for _ in range(length - prefix_length)]
+                        message, _ = self._run_steps(copy.copy(model), suffix, prefix_length, last_updated)
+                        self.tester.revert_to_snapshot(branch_point)
+                        self.sequences_run += 1
+                        if message is not None:
+                            failing.append(prefix + suffix)
+            finally:
+                self.tester.revert_to_snapshot(base)
+
+            # Shrinking replays from the base state, so it waits for the rewind
+            failures.extend(self._failure(sequence) for sequence in failing)
+
+        return failures
+
+    def _failure(self, sequence):
+        minimal = self.shrink(sequence)
+        return FuzzFailure(minimal, len(minimal) - 1, self.replay(minimal))
+
+    def shrink(self, sequence):
+        """Smallest sequence found that still fails, by removing calls then simplifying arguments"""
+        current = list(sequence)
+
+        # Drop calls one at a time, latest first, while the sequence still fails
+        changed = True
+        while changed:
+            changed = False
+            for index in reversed(range(len(current))):
+                candidate = current[:index] + current[index + 1:]
+                if candidate and self.replay(candidate) is not None:
+                    current = candidate
+                    changed = True
+
+        # Then pull each integer argument down toward 0 while it still fails
+        for index in range(len(current)):
+            for position in range(len(current[index].args)):
+                changed = True
+                while changed:
+                    changed = False
+                    call = current[index]
+                    arg = call.args[position]
+                    if not isinstance(arg, int):
+                        break
+
+                    for simpler in sorted({0, 1, MAX_VALUE - 1, MAX_VALUE, arg // 2}):
+                        if simpler >= arg:
+                            break
+                        args = call.args[:position] + (simpler,) + call.args[position + 1:]
+                        candidate = current[:index] + [call._replace(args=args)] + current[index + 1:]
+                        if self.replay(candidate) is not None:
+                            current = candidate
+                            changed = True
+                            break
+
+        return current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sequences", type=int, default=100)
+    parser.add_argument("--length", type=int, default=8)
+    parser.add_argument("--branches", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--install-solc", action="store_true")
+    args = parser.parse_args(argv)
+
+    artifact = load_simple_storage_artifact(install_solc=args.install_solc)
+    web3 = create_web3()
+    accounts = web3.eth.accounts[:3]
+    deployment = deploy_simple_storage(web3, artifact["abi"], artifact["bytecode"], accounts[0])
+    driver = FastDriver(web3.provider.ethereum_tester, deployment["address"], artifact["abi"])
+    fuzzer = Fuzzer(driver, StorageInspector(web3), accounts, accounts[0], deployment["initial_value"], seed=args.seed)
+
+    started = time.perf_counter()
+    failures = fuzzer.run(args.sequences, args.length, args.branches)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n🎲 {fuzzer.sequences_run} sequences / {fuzzer.calls_run} calls in {elapsed:.1f}s "
+          f"({fuzzer.sequences_run / elapsed * 60:,.0f} sequences/min)")
+
+    names = {accounts[0]: "owner", accounts[1]: "user1", accounts[2]: "user2", ZERO_ADDRESS: "address(0)"}
+    for failure in failures:
+        print(f"❌ {failure.message}\n{format_sequence(failure.sequence, names)}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""Gas pricing helpers and the session-wide SimpleStorage gas benchmark"""
+import json
+import math
+import statistics
+
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+from hexbytes import HexBytes
+
+from support.events import LogDecoder
+
+# 2: the zero-to-nonzero call path is labelled `set` (was `from_zero`)
+BASELINE_FORMAT_VERSION = 2
+
+# Allowed growth of a method's median gas over its baseline before the run fails
+DEFAULT_REGRESSION_THRESHOLD = 0.02
+
+MIDDLEWARE_NAME = "gas_benchmark"
+
+
+def wei_to_ether(wei_amount):
+    """Convert Wei to Ether"""
+    return wei_amount / (10 ** 18)
+
+
+def ether_to_wei(ether_amount):
+    """Convert Ether to Wei"""
+    return int(ether_amount * (10 ** 18))
+
+
+def format_gas_cost(gas_used, gas_price_gwei=20):
+    """Format gas cost in a readable way"""
+    gas_price_wei = gas_price_gwei * (10 ** 9)  # Convert Gwei to Wei
+    total_cost_wei = gas_used * gas_price_wei
+    total_cost_ether = wei_to_ether(total_cost_wei)
+
+    return {
+        "gas_used": gas_used,
+        "gas_price_gwei": gas_price_gwei,
+        "total_cost_wei": total_cost_wei,
+        "total_cost_ether": total_cost_ether,
+        "formatted": f"{gas_used:,} gas @ {gas_price_gwei} Gwei = {total_cost_ether:.6f} ETH"
+    }
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def value_slot_path(old_value, new_value):
+    """SSTORE cost class of a write to the `value` slot: set (zero to non-zero), update, or clear
+
+    This is the EIP-2200 value transition, not EIP-2929 warm/cold access,
+    which would need per-transaction access tracking.
+    """
+    if new_value == 0:
+        return "clear"
+    if old_value == 0:
+        return "set"
+    return "update"
+
+
+class GasBenchmark:
+    """Collect gasUsed for every SimpleStorage call, grouped by method and call path
+
+    A call path combines the sender role (`owner` / `non_owner`) with how the
+    `value` slot changed, e.g. `setValue[owner,update]`.
+    """
+
+    def __init__(self):
+        self.samples = {}
+        self.records = []
+        self.current_test = None
+        self._recorded_deployments = set()
+
+    def record(self, method, path, gas_used, test=None):
+        key = f"{method}[{path}]"
+        self.samples.setdefault(key, []).append(gas_used)
+        self.records.append({
+            "key": key,
+            "gas_used": gas_used,
+            "test": test or self.current_test
+        })
+        return key
+
+    def extend(self, records):
+        """Add records collected elsewhere, e.g. the gas_benchmark lists of several --report-json files"""
+        for record in records:
+            self.samples.setdefault(record["key"], []).append(record["gas_used"])
+            self.records.append(dict(record))
+
+    def record_deployment(self, tx_receipt):
+        """Record constructor gas once per distinct deployment"""
+        tx_hash = bytes(tx_receipt.transactionHash)
+        if tx_hash in self._recorded_deployments:
+            return None
+
+        self._recorded_deployments.add(tx_hash)
+        return self.record("constructor", "owner", tx_receipt.gasUsed)
+
+    def attach(self, web3, abi):
+        """Install a middleware on `web3` that records every SimpleStorage transaction"""
+        if web3.middleware_onion.get(MIDDLEWARE_NAME) is None:
+            web3.middleware_onion.add(self._middleware_factory(abi), name=MIDDLEWARE_NAME)
+
+    def _middleware_factory(self, abi):
+        decoder = LogDecoder(abi)
+        methods = {
+            function_abi_to_4byte_selector(entry): entry["name"]
+            for entry in abi
+            if entry.get("type") == "function" and entry.get("stateMutability") not in ("view", "pure")
+        }
+        owner_selector = "0x" + next(
+            function_abi_to_4byte_selector(entry) for entry in abi
+            if entry.get("type") == "function" and entry["name"] == "owner"
+        ).hex()
+        benchmark = self
+
+        def gas_benchmark_middleware(make_request, w3):
+            def middleware(method, params):
+                if method != "eth_sendTransaction":
+                    return make_request(method, params)
+
+                transaction = params[0]
+                data = bytes(HexBytes(transaction.get("data", b"")))
+                name = methods.get(data[:4])
+                if name is None or not transaction.get("to"):
+                    return make_request(method, params)
+
+                # The owner before the call decides the sender role
+                try:
+                    owner = to_checksum_address(w3.eth.call({"to": transaction["to"], "data": owner_selector})[12:])
+                except Exception:
+                    return make_request(method, params)
+                role = "owner" if owner == to_checksum_address(transaction["from"]) else "non_owner"
+
+                response = make_request(method, params)
+                if "result" not in response:
+                    return response
+
+                try:
+                    receipt = w3.eth.get_transaction_receipt(response["result"])
+                except Exception:
+                    # Not mined yet (manual mining); nothing to measure
+                    return response
+
+                events = decoder.decode_receipt(receipt, "ValueChanged")
+                paths = [role] + [value_slot_path(event.oldValue, event.newValue) for event in events]
+                benchmark.record(name, ",".join(paths), receipt.gasUsed)
+
+                return response
+
+            return middleware
+
+        return gas_benchmark_middleware
+
+    def summary(self):
+        """min / median / p95 / max per method and call path"""
+        return {
+            key: {
+                "calls": len(values),
+                "min": min(values),
+                "median": statistics.median(values),
+                "p95": percentile(values, 0.95),
+                "max": max(values)
+            }
+            for key, values in sorted(self.samples.items())
+        }
+
+    def save_baseline(self, path):
+        with open(path, "w") as file:
+            json.dump({"format": BASELINE_FORMAT_VERSION, "methods": self.summary()}, file, indent=2, sort_keys=True)
+
+    def compare(self, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+        """Per-key deltas against a loaded baseline, with regressions flagged"""
+        comparison = []
+        for key, stats in self.summary().items():
+            reference = baseline["methods"].get(key)
+            if reference is None:
+                continue
+
+            delta = stats["median"] - reference["median"]
+            comparison.append({
+                "key": key,
+                "median": stats["median"],
+                "baseline_median": reference["median"],
+                "delta": delta,
+                "regressed": stats["median"] > reference["median"] * (1 + threshold)
+            })
+
+        return comparison
+
+
+def load_baseline(path):
+    with open(path, "r") as file:
+        baseline = json.load(file)
+
+    if baseline.get("format") != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported gas baseline format in {path}")
+
+    return baseline
+
+
+def format_benchmark(summary, comparison=None):
+    """Readable summary table, with baseline deltas priced through format_gas_cost"""
+    lines = ["⛽ Gas benchmark (min / median / p95 / max):"]
+    for key, stats in summary.items():
+        lines.append(
+            f"     - {key}: {stats['calls']} calls, {stats['min']:,} / {stats['median']:,.0f} / "
+            f"{stats['p95']:,} / {stats['max']:,}"
+        )
+
+    for entry in comparison or []:
+        if entry["delta"] == 0:
+            continue
+
+        cost = format_gas_cost(abs(int(entry["delta"])))
+        sign = "+" if entry["delta"] > 0 else "-"
+        marker = "❌ regression" if entry["regressed"] else "ℹ️  changed"
+        lines.append(
+            f"   {marker} {entry['key']}: median {entry['baseline_median']:,.0f} → {entry['median']:,.0f} "
+            f"({sign}{cost['formatted']})"
+        )
+
+    return "\n".join(lines)
@@ -0,0 +1,154 @@
+"""Genesis state with SimpleStorage already deployed, captured from one reference deployment"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from eth_tester import EthereumTester, PyEVMBackend
+from eth_utils import to_canonical_address, to_checksum_address
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.datastructures import AttributeDict
+
+from support.chain import INITIAL_VALUE, STORAGE_SLOTS, create_web3, deploy_simple_storage
+
+# Bump when the on-disk layout changes
+GENESIS_FORMAT_VERSION = 1
+
+# Receipt fields that hold raw bytes rather than numbers or addresses
+_RECEIPT_BYTES_FIELDS = {"transactionHash", "blockHash", "logsBloom", "data", "root"}
+
+
+def bytecode_hash(bytecode):
+    """sha256 of the deployment bytecode, used to key stored genesis states"""
+    return hashlib.sha256(HexBytes(bytecode)).hexdigest()
+
+
+def _receipt_to_record(receipt):
+    return json.loads(Web3.to_json(receipt))
+
+
+def _receipt_from_record(record):
+    def restore(key, value):
+        if isinstance(value, dict):
+            return AttributeDict({k: restore(k, v) for k, v in value.items()})
+        if isinstance(value, list):
+            return [restore(key, item) for item in value]
+        if key == "topics" or (key in _RECEIPT_BYTES_FIELDS and isinstance(value, str)):
+            return HexBytes(value)
+        return value
+
+    return restore(None, record)
+
+
+def capture_genesis_state(abi, bytecode, initial_value=INITIAL_VALUE):
+    """Deploy SimpleStorage once and record the resulting code, storage and owner nonce"""
+    web3 = create_web3()
+    tester = web3.provider.ethereum_tester
+    owner = web3.eth.accounts[0]
+
+    deployment = deploy_simple_storage(web3, abi, bytecode, owner, initial_value)
+    address = deployment["address"]
+
+    return {
+        "format": GENESIS_FORMAT_VERSION,
+        "bytecode_sha256": bytecode_hash(bytecode),
+        "address": address,
+        "owner": owner,
+        "owner_nonce": tester.get_nonce(owner),
+        "code": tester.get_code(address),
+        "storage": {
+            str(slot): tester.get_storage_at(address, hex(slot))
+            for slot in STORAGE_SLOTS.values()
+        },
+        "initial_value": initial_value,
+        "tx_hash": deployment["tx_hash"].hex(),
+        "tx_receipt": _receipt_to_record(deployment["tx_receipt"])
+    }
+
+
+def save_genesis_state(state, path):
+    """Write a captured state atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(state, file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_genesis_state(path, bytecode):
+    """Load a stored state, or None if it is missing or was captured from other bytecode"""
+    try:
+        with open(path, "r") as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if state.get("format") != GENESIS_FORMAT_VERSION:
+        return None
+    if state.get("bytecode_sha256") != bytecode_hash(bytecode):
+        return None
+
+    return state
+
+
+def load_or_capture_genesis_state(directory, abi, bytecode):
+    """Reuse the stored state for this bytecode, capturing and saving it on a miss"""
+    path = Path(directory) / f"simple_storage-{bytecode_hash(bytecode)[:16]}.json"
+
+    state = load_genesis_state(path, bytecode)
+    if state is None:
+        state = capture_genesis_state(abi, bytecode)
+        save_genesis_state(state, path)
+
+    return state
+
+
+def create_preloaded_tester(state):
+    """EthereumTester whose genesis block already contains the captured deployment"""
+    genesis = PyEVMBackend.generate_genesis_state()
+    num_accounts = len(genesis)
+
+    owner = to_canonical_address(state["owner"])
+    genesis[owner] = dict(genesis[owner], nonce=state["owner_nonce"])
+
+    # Contract accounts start at nonce 1 (EIP-161)
+    genesis[to_canonical_address(state["address"])] = {
+        "balance": 0,
+        "nonce": 1,
+        "code": bytes(HexBytes(state["code"])),
+        "storage": {
+            int(slot): int(value, 16)
+            for slot, value in state["storage"].items()
+        }
+    }
+
+    backend = PyEVMBackend(genesis_state=genesis)
+
+    # The backend derives one key per genesis entry; drop the one matching the contract slot
+    backend.account_keys = backend.account_keys[:num_accounts]
+
+    return EthereumTester(backend)
+
+
+def preloaded_deployment(web3, state, abi):
+    """deployed_contract-style record for a contract that exists from block 0"""
+    address = to_checksum_address(state["address"])
+
+    return {
+        "contract": web3.eth.contract(address=address, abi=abi),
+        "address": address,
+        "tx_hash": HexBytes(state["tx_hash"]),
+        "tx_receipt": _receipt_from_record(state["tx_receipt"]),
+        "initial_value": state["initial_value"],
+        # Genesis state has no deployment transaction, so no constructor ValueChanged log either
+        "preloaded": True
+    }
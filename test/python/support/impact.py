@@ -0,0 +1,195 @@
+"""Skip tests whose contract bytecode, test code and fixture code are unchanged since they last passed
+
+Run the suite with `--impact-cache`. Each test gets a fingerprint built from:
+
+- the compiled SimpleStorage ABI and bytecode, plus the helper contract sources
+- the test module's source
+- the source files that define every fixture the test requests
+- every conftest.py between the rootdir and the test, for their hooks and options
+- the support package, the installed chain libraries and the chain options
+
+A test whose fingerprint matches its last passing run is skipped and reported
+as reused. Any change reruns exactly the tests it can affect. A changed
+validValue bound, for example, yields new bytecode and reruns every test that
+uses the contract. Only passes are cached; a failure always runs again.
+"""
+import hashlib
+import inspect
+import json
+from importlib import metadata
+from pathlib import Path
+
+import pytest
+
+IMPACT_CACHE_KEY = "simple-storage/impact"
+IMPACT_FORMAT_VERSION = 1
+
+# Library upgrades change results without touching the repo
+TRACKED_PACKAGES = ("eth-tester", "py-evm", "web3", "eth-abi", "pytest")
+
+
+def bytecode_hash(artifact):
+    """sha256 over a compiled artifact's ABI and bytecode"""
+    material = json.dumps({"abi": artifact["abi"], "bytecode": artifact["bytecode"]}, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def combine(*parts):
+    """One sha256 hex digest over an ordered list of hashable strings"""
+    return hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+class ImpactCache:
+    """pytest plugin that reuses passing results whose fingerprint did not change
+
+    `resolve_artifact()` returns the SimpleStorage artifact without compiling,
+    or None when it has not been built yet. Nothing is skipped in that case,
+    and the run's passes are recorded against the artifact it produced.
+    Results live in pytest's cache, or in `fallback_dir` when the
+    cacheprovider plugin is disabled.
+    """
+
+    def __init__(self, config, resolve_artifact, watched_paths=(), options=(), fallback_dir=None):
+        self.config = config
+        self.resolve_artifact = resolve_artifact
+        self.watched_paths = [Path(path) for path in watched_paths]
+        self.options = options
+        self.fallback_dir = Path(fallback_dir) if fallback_dir else None
+        self.previous = {}
+        self.parts = {}
+        self.passed = set()
+        self.failed = set()
+        self.reused = []
+        self._file_hashes = {}
+
+    def file_hash(self, path):
+        path = Path(path)
+        if path not in self._file_hashes:
+            try:
+                self._file_hashes[path] = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                self._file_hashes[path] = None
+        return self._file_hashes[path]
+
+    def environment(self):
+        """Fingerprint of everything every test shares, or None when the contract is not built"""
+        artifact = self.resolve_artifact()
+        if artifact is None:
+            return None
+
+        watched = sorted(
+            (str(path), self.file_hash(path))
+            for root in self.watched_paths
+            for path in ([root] if root.is_file() else sorted(root.rglob("*")))
+            if path.is_file() and path.suffix in (".py", ".sol")
+        )
+        return combine(
+            IMPACT_FORMAT_VERSION,
+            bytecode_hash(artifact),
+            json.dumps(watched),
+            json.dumps([(name, _package_version(name)) for name in TRACKED_PACKAGES]),
+            json.dumps([(option, self.config.getoption(option)) for option in self.options])
+        )
+
+    def conftest_paths(self, item):
+        """conftest.py files from the rootdir down to the test's directory"""
+        root = Path(self.config.rootpath)
+        paths = []
+        for directory in Path(item.path).parents:
+            if (directory / "conftest.py").is_file():
+                paths.append(str(directory / "conftest.py"))
+            if directory == root or root not in directory.parents:
+                break
+        return paths
+
+    def item_parts(self, item):
+        """Hashes of the test module, every file defining a fixture it requests and its conftest.py files"""
+        fixture_files = set()
+        fixture_info = getattr(item, "_fixtureinfo", None)
+        for fixturedefs in (fixture_info.name2fixturedefs.values() if fixture_info else ()):
+            for fixturedef in fixturedefs:
+                try:
+                    fixture_files.add(inspect.getsourcefile(fixturedef.func))
+                except TypeError:
+                    continue
+        # Hooks such as pytest_configure or pytest_addoption defaults apply without a fixture request
+        fixture_files.update(self.conftest_paths(item))
+
+        return combine(
+            self.file_hash(item.path),
+            json.dumps(sorted((path, self.file_hash(path)) for path in fixture_files if path))
+        )
+
+    def _fallback_path(self):
+        return self.fallback_dir / (IMPACT_CACHE_KEY.replace("/", "-") + ".json") if self.fallback_dir else None
+
+    def load(self, config):
+        if getattr(config, "cache", None) is not None:
+            return config.cache.get(IMPACT_CACHE_KEY, None)
+
+        path = self._fallback_path()
+        try:
+            with open(path, "r") as file:
+                return json.load(file)
+        except (TypeError, OSError, ValueError):
+            return None
+
+    def save(self, config, value):
+        if getattr(config, "cache", None) is not None:
+            config.cache.set(IMPACT_CACHE_KEY, value)
+            return
+
+        path = self._fallback_path()
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as file:
+                json.dump(value, file)
+
+    def pytest_configure(self, config):
+        stored = self.load(config) or {}
+        if stored.get("format") == IMPACT_FORMAT_VERSION:
+            self.previous = stored.get("passed", {})
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        environment = self.environment()
+        for item in items:
+            self.parts[item.nodeid] = self.item_parts(item)
+            if environment is None:
+                continue
+
+            if self.previous.get(item.nodeid) == combine(environment, self.parts[item.nodeid]):
+                item.add_marker(pytest.mark.skip(reason="impact cache: unchanged since its last pass"))
+                self.reused.append(item.nodeid)
+
+    def pytest_runtest_logreport(self, report):
+        if report.failed:
+            self.failed.add(report.nodeid)
+        elif report.when == "call" and report.passed:
+            self.passed.add(report.nodeid)
+
+    def pytest_sessionfinish(self, session):
+        # The contract may only have been compiled during this run
+        environment = self.environment()
+        results = {nodeid: fingerprint for nodeid, fingerprint in self.previous.items() if nodeid not in self.failed}
+
+        if environment is not None:
+            for nodeid in self.passed - self.failed:
+                results[nodeid] = combine(environment, self.parts[nodeid])
+
+        self.save(session.config, {"format": IMPACT_FORMAT_VERSION, "passed": results})
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.reused:
+            terminalreporter.write_sep("-", "impact cache")
+            terminalreporter.write_line(
+                f"♻️  {len(self.reused)} tests reused a passing result "
+                f"(same bytecode, test and fixture code); {len(self.passed)} ran and passed"
+            )
@@ -0,0 +1,266 @@
+"""Incremental index of SimpleStorage ValueChanged / OwnershipTransferred history
+
+The indexer reads logs in block chunks with eth_getLogs and decodes them
+through LogDecoder. It keeps in-memory indexes by updater, by new value and by
+owner epoch. Decoded events are appended to an event log next to the
+checkpoint (`index.json` -> `index.events.jsonl`). The checkpoint itself only
+holds the cursor: the next block to scan, that block's parent hash and how many
+bytes of the log are committed. A sync therefore writes only the events it
+added, and a restarted indexer picks up where it stopped. If the chain no
+longer has the checkpointed block (for example after a snapshot revert), the
+indexer starts over from the first block and rewrites the log.
+"""
+import bisect
+import json
+import os
+import tempfile
+from collections import namedtuple
+from pathlib import Path
+
+from hexbytes import HexBytes
+
+from support.events import LogDecoder
+
+CHECKPOINT_FORMAT_VERSION = 2
+
+DEFAULT_CHUNK_SIZE = 1_000
+
+ValueChange = namedtuple("ValueChange", ["blockNumber", "logIndex", "transactionHash", "oldValue", "newValue", "updatedBy"])
+OwnershipChange = namedtuple("OwnershipChange", ["blockNumber", "logIndex", "transactionHash", "previousOwner", "newOwner"])
+
+
+class EventIndexer:
+    """Index one SimpleStorage contract's events, resuming from a checkpoint file"""
+
+    def __init__(self, web3, address, abi, checkpoint_path=None, start_block=0, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.web3 = web3
+        self.decoder = LogDecoder(abi, address=address)
+        self.address = self.decoder.address
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.events_path = self.checkpoint_path.with_suffix(".events.jsonl") if checkpoint_path else None
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.topics = [
+            "0x" + self.decoder.topic("ValueChanged").hex(),
+            "0x" + self.decoder.topic("OwnershipTransferred").hex()
+        ]
+        self.reset()
+
+        if self.checkpoint_path is not None and self.checkpoint_path.exists():
+            self.load_checkpoint()
+
+    def reset(self):
+        """Forget everything and rescan from `start_block` on the next sync"""
+        self.next_block = self.start_block
+        self.last_block_hash = None
+        self.changes = []
+        self.transfers = []
+        self._change_blocks = []
+        self._by_updater = {}
+        self._by_value = []
+        self._by_value_sorted = True
+        # Each epoch starts at a position in self.changes; owner None until the first transfer names it
+        self._epochs = [{"owner": None, "start_block": self.start_block, "start": 0}]
+        # Event log rows not written yet, and the committed log length they go after
+        self._unsaved = []
+        self._events_bytes = 0
+
+    # Ingestion
+
+    def _add_change(self, change):
+        position = len(self.changes)
+        self.changes.append(change)
+        self._change_blocks.append(change.blockNumber)
+
+        positions, blocks = self._by_updater.setdefault(change.updatedBy, ([], []))
+        positions.append(position)
+        blocks.append(change.blockNumber)
+
+        if self._by_value and change.newValue < self._by_value[-1][0]:
+            self._by_value_sorted = False
+        self._by_value.append((change.newValue, position))
+
+    def _add_transfer(self, transfer):
+        self.transfers.append(transfer)
+        if self._epochs[-1]["owner"] is None:
+            self._epochs[-1]["owner"] = transfer.previousOwner
+
+        self._epochs.append({"owner": transfer.newOwner, "start_block": transfer.blockNumber, "start": len(self.changes)})
+
+    def _ingest(self, records):
+        # Without a checkpoint nothing is ever saved, so rows would only pile up
+        unsaved = self._unsaved if self.checkpoint_path is not None else None
+        for record in records:
+            if type(record).__name__ == "ValueChanged":
+                change = ValueChange(
+                    record.blockNumber, record.logIndex, record.transactionHash,
+                    record.oldValue, record.newValue, record.updatedBy
+                )
+                self._add_change(change)
+                if unsaved is not None:
+                    unsaved.append(["change", *change[:2], change.transactionHash.hex(), *change[3:]])
+            else:
+                transfer = OwnershipChange(
+                    record.blockNumber, record.logIndex, record.transactionHash,
+                    record.previousOwner, record.newOwner
+                )
+                self._add_transfer(transfer)
+                if unsaved is not None:
+                    unsaved.append(["transfer", *transfer[:2], transfer.transactionHash.hex(), *transfer[3:]])
+
+    def sync(self, to_block=None):
+        """Index every block up to `to_block` (default latest); return how many events were added"""
+        if self.last_block_hash is not None:
+            block = self._block_or_none(self.next_block - 1)
+            if block is None or bytes(block.hash) != self.last_block_hash:
+                self.reset()
+
+        head = self.web3.eth.block_number if to_block is None else to_block
+        added = 0
+
+        while self.next_block <= head:
+            chunk_end = min(self.next_block + self.chunk_size - 1, head)
+            logs = self.web3.eth.get_logs({
+                "address": self.address,
+                "fromBlock": self.next_block,
+                "toBlock": chunk_end,
+                "topics": [self.topics]
+            })
+
+            records = self.decoder.decode_logs(logs)
+            records.sort(key=lambda record: (record.blockNumber, record.logIndex))
+            self._ingest(records)
+            added += len(records)
+
+            self.next_block = chunk_end + 1
+            self.last_block_hash = bytes(self.web3.eth.get_block(chunk_end).hash)
+
+        if self.checkpoint_path is not None:
+            self.save_checkpoint()
+
+        return added
+
+    def _block_or_none(self, number):
+        if number < 0:
+            return None
+        try:
+            return self.web3.eth.get_block(number)
+        except Exception:
+            return None
+
+    # Queries
+
+    def changes_by(self, updater, since_block=0, until_block=None):
+        """ValueChanged events sent by `updater` in [since_block, until_block]"""
+        positions, blocks = self._by_updater.get(updater, ([], []))
+        start = bisect.bisect_left(blocks, since_block)
+        end = len(blocks) if until_block is None else bisect.bisect_right(blocks, until_block)
+        return [self.changes[position] for position in positions[start:end]]
+
+    def changes_since(self, block_number):
+        start = bisect.bisect_left(self._change_blocks, block_number)
+        return self.changes[start:]
+
+    def changes_with_value(self, low, high):
+        """ValueChanged events whose newValue lies in [low, high], in chain order"""
+        if not self._by_value_sorted:
+            self._by_value.sort()
+            self._by_value_sorted = True
+
+        start = bisect.bisect_left(self._by_value, (low, -1))
+        end = bisect.bisect_right(self._by_value, (high, len(self.changes)))
+        return [self.changes[position] for position in sorted(position for _, position in self._by_value[start:end])]
+
+    def owner_epochs(self):
+        """One entry per ownership period: owner, first block and number of value changes"""
+        epochs = []
+        for index, epoch in enumerate(self._epochs):
+            end = self._epochs[index + 1]["start"] if index + 1 < len(self._epochs) else len(self.changes)
+            epochs.append({
+                "owner": epoch["owner"],
+                "start_block": epoch["start_block"],
+                "changes": end - epoch["start"]
+            })
+        return epochs
+
+    def changes_in_epoch(self, index):
+        """ValueChanged events made while the `index`-th owner held the contract"""
+        start = self._epochs[index]["start"]
+        end = self._epochs[index + 1]["start"] if index + 1 < len(self._epochs) else len(self.changes)
+        return self.changes[start:end]
+
+    def owner_at(self, block_number):
+        """Owner at the end of `block_number`, as far as the indexed transfers tell"""
+        starts = [epoch["start_block"] for epoch in self._epochs]
+        return self._epochs[max(0, bisect.bisect_right(starts, block_number) - 1)]["owner"]
+
+    # Checkpoints
+
+    def save_checkpoint(self):
+        """Append the events added since the last save, then commit the cursor"""
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Anything past the committed length is left over from a save that never committed
+        with open(self.events_path, "a+b") as file:
+            file.truncate(self._events_bytes)
+            file.seek(self._events_bytes)
+            file.writelines((json.dumps(row) + "\n").encode("utf-8") for row in self._unsaved)
+            file.flush()
+            os.fsync(file.fileno())
+            events_bytes = file.tell()
+
+        state = {
+            "format": CHECKPOINT_FORMAT_VERSION,
+            "address": self.address,
+            "start_block": self.start_block,
+            "next_block": self.next_block,
+            "last_block_hash": self.last_block_hash.hex() if self.last_block_hash else None,
+            "events_bytes": events_bytes
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.checkpoint_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(state, file)
+            os.replace(tmp_path, self.checkpoint_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        self._unsaved = []
+        self._events_bytes = events_bytes
+
+    def load_checkpoint(self):
+        """Rebuild the indexes from the event log; a checkpoint for another contract is ignored"""
+        with open(self.checkpoint_path, "r") as file:
+            state = json.load(file)
+
+        if state.get("format") != CHECKPOINT_FORMAT_VERSION or state.get("address") != self.address:
+            return False
+
+        try:
+            with open(self.events_path, "rb") as file:
+                committed = file.read(state["events_bytes"])
+        except OSError:
+            committed = b""
+        if len(committed) != state["events_bytes"]:
+            # The log lost committed events; rescan instead of trusting the cursor
+            return False
+
+        self.start_block = state["start_block"]
+        self.reset()
+
+        # The log is in chain order, so epochs line up with the changes they contain
+        for line in committed.splitlines():
+            kind, *row = json.loads(line)
+            row = [row[0], row[1], HexBytes(row[2]), *row[3:]]
+            if kind == "change":
+                self._add_change(ValueChange(*row))
+            else:
+                self._add_transfer(OwnershipChange(*row))
+
+        self.next_block = state["next_block"]
+        self.last_block_hash = bytes.fromhex(state["last_block_hash"]) if state["last_block_hash"] else None
+        self._events_bytes = state["events_bytes"]
+        return True
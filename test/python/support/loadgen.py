@@ -0,0 +1,256 @@
+"""Throughput and latency load generator for SimpleStorage
+
+Usage (from test/python):
+
+    python -m support.loadgen --operations 500 --senders 5
+    python -m support.loadgen --rpc-url http://127.0.0.1:8545 --senders 8 --duration 30
+
+Without --rpc-url the load runs against an in-process eth-tester chain. With it,
+the target is a local JSON-RPC node such as the one started by
+`npm run node:local`, whose accounts are unlocked. Each sender submits a weighted
+mix of writes and view calls; setValue is owner-only, so it is always sent from
+the owner whichever sender drew it. The report gives tx/s and submit-to-receipt
+latency percentiles per operation.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+
+from web3 import Web3
+
+from support.artifacts import load_simple_storage_artifact
+from support.chain import create_web3, deploy_simple_storage
+from support.gas import percentile
+
+DEFAULT_MIX = "increment=4,decrement=1,addValue=2,setValue=1,view=4"
+
+OPERATIONS = ("increment", "decrement", "addValue", "setValue", "view")
+
+# Keeps the stored value well inside SimpleStorage's validValue bound
+SET_VALUE_MAX = 1_000
+ADD_VALUE_MAX = 10
+
+
+def parse_mix(mix):
+    """Parse `op=weight,...` into a dict of positive weights"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        weights[name] = float(weight or 1)
+
+    if not any(weight > 0 for weight in weights.values()):
+        raise ValueError("Operation mix needs at least one positive weight")
+
+    return weights
+
+
+def latency_stats(samples):
+    if not samples:
+        return {"count": 0}
+
+    return {
+        "count": len(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "max_ms": max(samples) * 1000
+    }
+
+
+class LoadGenerator:
+    """Drive one SimpleStorage contract from several senders with a weighted operation mix"""
+
+    def __init__(self, web3, contract, senders, owner, mix, seed=0, poll_latency=0.01):
+        self.web3 = web3
+        self.contract = contract
+        self.senders = senders
+        self.owner = owner
+        self.mix = mix
+        self.seed = seed
+        self.poll_latency = poll_latency
+        self.latencies = {name: [] for name in OPERATIONS}
+        self.errors = {name: 0 for name in OPERATIONS}
+        self.lock = threading.Lock()
+
+    def _build(self, operation, rng):
+        functions = self.contract.functions
+        if operation == "increment":
+            return functions.increment()
+        if operation == "decrement":
+            return functions.decrement()
+        if operation == "addValue":
+            return functions.addValue(rng.randint(1, ADD_VALUE_MAX))
+        return functions.setValue(rng.randint(0, SET_VALUE_MAX))
+
+    def run_one(self, sender, rng):
+        names = list(self.mix)
+        operation = rng.choices(names, weights=[self.mix[name] for name in names])[0]
+
+        # setValue is owner-only; sent by anyone else it would only measure reverts
+        if operation == "setValue":
+            sender = self.owner
+
+        started = time.perf_counter()
+        try:
+            if operation == "view":
+                self.contract.functions.getStorageInfo().call()
+            else:
+                tx_hash = self._build(operation, rng).transact({'from': sender})
+                self.web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=self.poll_latency)
+        except Exception:
+            with self.lock:
+                self.errors[operation] += 1
+            return operation
+
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.latencies[operation].append(elapsed)
+        return operation
+
+    def run(self, operations=None, duration=None, concurrent=False):
+        """Run until `operations` are done or `duration` seconds pass; return the report"""
+        deadline = time.perf_counter() + duration if duration else None
+        counter = {"remaining": operations}
+        counter_lock = threading.Lock()
+
+        def take_ticket():
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            if counter["remaining"] is None:
+                return True
+            with counter_lock:
+                if counter["remaining"] <= 0:
+                    return False
+                counter["remaining"] -= 1
+                return True
+
+        started = time.perf_counter()
+
+        if concurrent:
+            # One thread per sender; a JSON-RPC node can overlap their requests
+            def sender_loop(index, sender):
+                rng = random.Random(self.seed + index)
+                while take_ticket():
+                    self.run_one(sender, rng)
+
+            threads = [
+                threading.Thread(target=sender_loop, args=(index, sender), daemon=True)
+                for index, sender in enumerate(self.senders)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        else:
+            # eth-tester is not thread-safe, so senders take turns
+            rngs = [random.Random(self.seed + index) for index in range(len(self.senders))]
+            index = 0
+            while take_ticket():
+                self.run_one(self.senders[index], rngs[index])
+                index = (index + 1) % len(self.senders)
+
+        elapsed = time.perf_counter() - started
+        return self.report(elapsed)
+
+    def report(self, elapsed):
+        writes = sum(len(self.latencies[name]) for name in OPERATIONS if name != "view")
+        all_writes = [
+            sample for name in OPERATIONS if name != "view" for sample in self.latencies[name]
+        ]
+
+        return {
+            "elapsed_seconds": elapsed,
+            "senders": len(self.senders),
+            "transactions": writes,
+            "tx_per_second": writes / elapsed if elapsed else 0.0,
+            "calls": len(self.latencies["view"]),
+            "calls_per_second": len(self.latencies["view"]) / elapsed if elapsed else 0.0,
+            "errors": {name: count for name, count in self.errors.items() if count},
+            "write_latency": latency_stats(all_writes),
+            "operations": {
+                name: latency_stats(samples)
+                for name, samples in self.latencies.items() if samples
+            }
+        }
+
+
+def format_report(report, target):
+    lines = [f"\n📈 SimpleStorage load ({target}, {report['senders']} senders, {report['elapsed_seconds']:.2f}s)"]
+    lines.append(f"   {report['transactions']} tx → {report['tx_per_second']:.1f} tx/s")
+    lines.append(f"   {report['calls']} view calls → {report['calls_per_second']:.1f} calls/s")
+
+    for name, stats in report["operations"].items():
+        lines.append(
+            f"     - {name}: {stats['count']} ops, p50 {stats['p50_ms']:.1f}ms / "
+            f"p95 {stats['p95_ms']:.1f}ms / p99 {stats['p99_ms']:.1f}ms"
+        )
+
+    if report["errors"]:
+        lines.append(f"   ⚠️  errors: {report['errors']}")
+
+    return "\n".join(lines)
+
+
+def connect(rpc_url=None):
+    """Web3 for a local JSON-RPC node, or a fresh in-process eth-tester chain"""
+    if rpc_url is None:
+        return create_web3()
+
+    web3 = Web3(Web3.HTTPProvider(rpc_url))
+    if not web3.is_connected():
+        raise ConnectionError(f"No JSON-RPC node answering at {rpc_url}")
+    return web3
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rpc-url", default=None, help="Local JSON-RPC node; defaults to in-process eth-tester")
+    parser.add_argument("--address", default=None, help="Existing SimpleStorage address on the node")
+    parser.add_argument("--senders", type=int, default=3)
+    parser.add_argument("--operations", type=int, default=None, help="Total operations to run")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds to run for")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted operation mix (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="Also write the report to this JSON file")
+    parser.add_argument("--install-solc", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.senders < 1:
+        parser.error("--senders must be at least 1")
+    if args.operations is None and args.duration is None:
+        args.operations = 200
+
+    web3 = connect(args.rpc_url)
+    accounts = web3.eth.accounts
+    if args.senders > len(accounts):
+        parser.error(f"--senders {args.senders} exceeds the {len(accounts)} funded accounts available")
+
+    artifact = load_simple_storage_artifact(install_solc=args.install_solc)
+    if args.address:
+        contract = web3.eth.contract(address=Web3.to_checksum_address(args.address), abi=artifact["abi"])
+    else:
+        contract = deploy_simple_storage(web3, artifact["abi"], artifact["bytecode"], accounts[0])["contract"]
+
+    generator = LoadGenerator(
+        web3, contract, accounts[:args.senders], contract.functions.owner().call(),
+        parse_mix(args.mix), seed=args.seed
+    )
+    report = generator.run(args.operations, args.duration, concurrent=args.rpc_url is not None)
+    report["target"] = args.rpc_url or "eth-tester"
+
+    print(format_report(report, report["target"]))
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
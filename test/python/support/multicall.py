@@ -0,0 +1,112 @@
+"""Batched view calls through the Multicall helper contract
+
+MulticallReader packs many bound view calls into a single `aggregate` eth_call.
+The calls can target any number of SimpleStorage instances. Return data is
+decoded with each function's ABI outputs, and results can be cached until the
+next block is mined.
+"""
+from eth_abi import decode as abi_decode
+from eth_utils import to_checksum_address
+
+from support.artifacts import HELPER_CONTRACTS_DIR
+from support.events import _canonical_type
+
+MULTICALL_NAME = "Multicall"
+MULTICALL_PATH = HELPER_CONTRACTS_DIR / f"{MULTICALL_NAME}.sol"
+
+# View functions read_state collects from every SimpleStorage instance
+STATE_FUNCTIONS = ("getValue", "owner", "lastUpdated", "getStorageInfo")
+
+
+class MulticallError(RuntimeError):
+    """A call inside an aggregate reverted"""
+
+
+def deploy_multicall(web3, abi, bytecode, deployer):
+    factory = web3.eth.contract(abi=abi, bytecode=bytecode)
+    tx_hash = factory.constructor().transact({'from': deployer})
+    tx_receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
+    return web3.eth.contract(address=tx_receipt.contractAddress, abi=abi)
+
+
+def _normalize(abi_type, value):
+    if abi_type == "address":
+        return to_checksum_address(value)
+    if abi_type == "address[]":
+        return [to_checksum_address(item) for item in value]
+    return value
+
+
+def decode_output(function_abi, return_data):
+    """Decode return data like web3 does: a single output is unwrapped, several become a tuple"""
+    types = [_canonical_type(output) for output in function_abi["outputs"]]
+    values = [_normalize(abi_type, value) for abi_type, value in zip(types, abi_decode(types, return_data))]
+    return values[0] if len(values) == 1 else tuple(values)
+
+
+class MulticallReader:
+    """Run bound view calls (e.g. `contract.functions.getValue()`) in one eth_call"""
+
+    def __init__(self, multicall_contract, cache=True):
+        self.multicall = multicall_contract
+        self.web3 = multicall_contract.w3
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.round_trips = 0
+        self._cache_block = None
+        self._results = {}
+
+    def _cached_results(self):
+        """Result cache for the current block; a newly mined block empties it"""
+        # Keyed by hash: after a snapshot revert the next block reuses the number with other state
+        block_hash = self.web3.eth.get_block("latest")["hash"]
+        if block_hash != self._cache_block:
+            self._cache_block = block_hash
+            self._results = {}
+        return self._results
+
+    def read(self, calls, allow_failure=False):
+        """Decoded results in call order; reverted calls raise, or give None with allow_failure"""
+        encoded = [(to_checksum_address(call.address), call._encode_transaction_data()) for call in calls]
+        results = self._cached_results() if self.cache else {}
+
+        pending = list(dict.fromkeys(key for key in encoded if key not in results))
+        self.hits += len(encoded) - len(pending)
+        self.misses += len(pending)
+
+        if pending:
+            _, responses = self.multicall.functions.aggregate(pending).call()
+            self.round_trips += 1
+            for key, (success, return_data) in zip(pending, responses):
+                results[key] = (success, bytes(return_data))
+
+        decoded = []
+        for call, key in zip(calls, encoded):
+            success, return_data = results[key]
+            if not success:
+                if not allow_failure:
+                    raise MulticallError(f"{call.fn_name} on {key[0]} reverted")
+                decoded.append(None)
+                continue
+
+            decoded.append(decode_output(call.abi, return_data))
+
+        return decoded
+
+    def read_state(self, contracts):
+        """getValue, owner, lastUpdated and getStorageInfo of every contract, in one round trip"""
+        calls = [
+            contract.functions[name]()
+            for contract in contracts
+            for name in STATE_FUNCTIONS
+        ]
+        results = self.read(calls)
+
+        states = []
+        for index, contract in enumerate(contracts):
+            values = dict(zip(STATE_FUNCTIONS, results[index * len(STATE_FUNCTIONS):(index + 1) * len(STATE_FUNCTIONS)]))
+            values["address"] = contract.address
+            states.append(values)
+
+        return states
@@ -0,0 +1,272 @@
+"""Run the eth-tester suite sharded by test class across worker processes
+
+Usage (from test/python):
+
+    python -m support.parallel --workers 4 [extra pytest args]
+
+SimpleStorage is compiled once into a shared artifact cache before the workers
+start. Each worker is a separate pytest process with its own EthereumTester, and
+their JSON reports are merged into one summary. Extra pytest arguments select
+tests during collection; options other than paths and -k/-m reach every worker
+and must use the `--option=value` form. --gas-baseline and --gas-save-baseline
+are applied once, here, to the gas records of all workers combined.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from support.artifacts import load_artifact, load_simple_storage_artifact
+from support.gas import DEFAULT_REGRESSION_THRESHOLD, GasBenchmark, format_benchmark, load_baseline
+from support.multicall import MULTICALL_PATH
+from support.solc import SolcNotFoundError
+
+SUITE_DIR = Path(__file__).resolve().parents[1]
+
+
+def collect_node_ids(pytest_args=()):
+    """Node ids of every test pytest would run with `pytest_args`; raises when collection fails or is empty"""
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+        cwd=SUITE_DIR, capture_output=True, text=True
+    )
+    node_ids = [line.strip() for line in result.stdout.splitlines() if "::" in line]
+
+    # An import error in one module would otherwise shard an empty or partial suite and pass
+    if result.returncode != 0 or not node_ids:
+        print(result.stdout + result.stderr)
+        raise RuntimeError(f"pytest collection exited with {result.returncode} and {len(node_ids)} tests")
+
+    return node_ids
+
+
+# Each worker only sees its shard's gas; the parent saves and compares the combined records
+PARENT_ONLY_OPTIONS = ("--gas-baseline", "--gas-save-baseline", "--gas-regression-threshold")
+
+
+def worker_args(pytest_args):
+    """Options forwarded to workers; paths and -k/-m selection are already applied by collection"""
+    forwarded = []
+    skip_next = False
+    for arg in pytest_args:
+        if skip_next:
+            skip_next = False
+        elif arg in ("-k", "-m") or arg in PARENT_ONLY_OPTIONS:
+            skip_next = True
+        elif arg.startswith(tuple(f"{option}=" for option in PARENT_ONLY_OPTIONS)):
+            continue
+        elif arg.startswith("-") and not arg.startswith(("-k", "-m")):
+            forwarded.append(arg)
+    return forwarded
+
+
+def shard_unit(node_id):
+    """Tests of one class (or one module, for module-level tests) always share a worker"""
+    parts = node_id.split("::")
+    return "::".join(parts[:2]) if len(parts) > 2 else parts[0]
+
+
+def shard_node_ids(node_ids, workers):
+    """Split node ids into at most `workers` shards, largest units first"""
+    units = {}
+    for node_id in node_ids:
+        units.setdefault(shard_unit(node_id), []).append(node_id)
+
+    shards = [[] for _ in range(max(1, workers))]
+    for unit in sorted(units, key=lambda name: len(units[name]), reverse=True):
+        min(shards, key=len).extend(units[unit])
+
+    return [shard for shard in shards if shard]
+
+
+def warm_artifact_cache(cache_dir, install=False):
+    """Compile SimpleStorage and the Multicall helper once so every worker starts on a cache hit"""
+    try:
+        load_simple_storage_artifact(cache_dir, install_solc=install)
+        load_artifact(MULTICALL_PATH, cache_dir, install_solc=install)
+    except SolcNotFoundError as exc:
+        # Workers will skip contract tests the same way a serial run does
+        print(f"⚠️  {exc}")
+        return False
+
+    return True
+
+
+def merge_reports(reports):
+    """Combine per-worker reports into one outcome, gas and timing summary"""
+    tests = []
+    gas = []
+    gas_benchmark = []
+    for report in reports:
+        tests.extend(report["tests"])
+        gas.extend(report["gas"])
+        gas_benchmark.extend(report.get("gas_benchmark") or [])
+
+    outcomes = {}
+    for test in tests:
+        outcomes[test["outcome"]] = outcomes.get(test["outcome"], 0) + 1
+
+    gas_by_operation = {}
+    for entry in gas:
+        gas_by_operation.setdefault(entry["operation"], []).append(entry["gas_used"])
+
+    return {
+        "outcomes": outcomes,
+        "tests": sorted(tests, key=lambda test: test["nodeid"]),
+        "gas": {
+            operation: {
+                "calls": len(values),
+                "min": min(values),
+                "median": statistics.median(values),
+                "max": max(values)
+            }
+            for operation, values in sorted(gas_by_operation.items())
+        },
+        "gas_benchmark": gas_benchmark,
+        "workers": [
+            {
+                "worker": report["worker"],
+                "exitstatus": report["exitstatus"],
+                "tests": len(report["tests"]),
+                "test_seconds": sum(test["duration"] for test in report["tests"]),
+                "session_seconds": report["timings"]["session"]
+            }
+            for report in reports
+        ]
+    }
+
+
+def format_merged_report(merged, wall_seconds):
+    lines = ["\n🧪 Parallel run summary"]
+    lines.append("   " + ", ".join(f"{count} {outcome}" for outcome, count in sorted(merged["outcomes"].items())))
+
+    for worker in merged["workers"]:
+        lines.append(
+            f"   worker {worker['worker']}: {worker['tests']} tests, "
+            f"{worker['test_seconds']:.2f}s in tests, {worker['session_seconds']:.2f}s session"
+        )
+
+    serial_seconds = sum(worker["test_seconds"] for worker in merged["workers"])
+    lines.append(f"   wall time: {wall_seconds:.2f}s (sum of test time: {serial_seconds:.2f}s)")
+
+    if merged["gas"]:
+        lines.append("⛽ Gas by operation:")
+        for operation, stats in merged["gas"].items():
+            lines.append(
+                f"     - {operation}: {stats['calls']} calls, "
+                f"min {stats['min']:,} / median {stats['median']:,.0f} / max {stats['max']:,}"
+            )
+
+    if merged.get("gas_summary"):
+        lines.append(format_benchmark(merged["gas_summary"], merged.get("gas_comparison")))
+
+    failed = [test["nodeid"] for test in merged["tests"] if test["outcome"] == "failed"]
+    for node_id in failed:
+        lines.append(f"   FAILED {node_id}")
+
+    for worker in merged["workers"]:
+        if worker["exitstatus"] != 0:
+            lines.append(f"   worker {worker['worker']} exited with {worker['exitstatus']}")
+
+    return "\n".join(lines)
+
+
+def apply_gas_baseline(merged, save_path=None, baseline_path=None, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """Save and/or compare the combined gas records of every worker, like a serial run's sessionfinish"""
+    benchmark = GasBenchmark()
+    benchmark.extend(merged["gas_benchmark"])
+
+    merged["gas_summary"] = benchmark.summary()
+    if save_path:
+        benchmark.save_baseline(save_path)
+    if baseline_path:
+        merged["gas_comparison"] = benchmark.compare(load_baseline(baseline_path), threshold)
+
+    return merged
+
+
+def run_failed(merged):
+    """True when a test failed, a worker exited non-zero or the gas baseline regressed"""
+    return bool(
+        merged["outcomes"].get("failed")
+        or any(worker["exitstatus"] != 0 for worker in merged["workers"])
+        or any(entry["regressed"] for entry in merged.get("gas_comparison") or [])
+    )
+
+
+def run_parallel(workers, pytest_args=(), cache_dir=None, report_path=None, install_solc=False,
+                 gas_save_baseline=None, gas_baseline=None, gas_threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """Shard the suite across `workers` pytest processes and return the merged report"""
+    started = time.perf_counter()
+    forwarded = worker_args(pytest_args)
+    if gas_save_baseline or gas_baseline:
+        forwarded.append("--gas-report")
+
+    with tempfile.TemporaryDirectory(prefix="simple-storage-parallel-") as tmp_dir:
+        cache_dir = cache_dir or os.environ.get("SOLC_ARTIFACT_CACHE") or str(Path(tmp_dir) / "artifacts")
+        warm_artifact_cache(cache_dir, install=install_solc)
+
+        shards = shard_node_ids(collect_node_ids(pytest_args), workers)
+
+        processes = []
+        for index, shard in enumerate(shards):
+            worker_report = Path(tmp_dir) / f"worker-{index}.json"
+            env = dict(os.environ, SOLC_ARTIFACT_CACHE=str(cache_dir), SIMPLE_STORAGE_WORKER=str(index))
+            processes.append((worker_report, subprocess.Popen(
+                [sys.executable, "-m", "pytest", "-q", f"--report-json={worker_report}",
+                 *forwarded, *shard],
+                cwd=SUITE_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+            )))
+
+        reports = []
+        for worker_report, process in processes:
+            output, _ = process.communicate()
+            if not worker_report.exists():
+                # The worker died before pytest_sessionfinish; surface its output
+                print(output)
+                raise RuntimeError(f"worker exited with {process.returncode} without a report")
+
+            with open(worker_report) as file:
+                reports.append(json.load(file))
+
+    merged = merge_reports(reports)
+    if merged["gas_benchmark"] or gas_save_baseline or gas_baseline:
+        apply_gas_baseline(merged, gas_save_baseline, gas_baseline, gas_threshold)
+    merged["wall_seconds"] = time.perf_counter() - started
+
+    if report_path:
+        with open(report_path, "w") as file:
+            json.dump(merged, file, indent=2)
+
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--report", default=None, help="Write the merged report to this JSON file")
+    parser.add_argument("--cache-dir", default=None, help="Shared artifact cache directory")
+    parser.add_argument("--install-solc", action="store_true")
+    parser.add_argument("--gas-save-baseline", default=None, help="Write the combined gas figures to this file")
+    parser.add_argument("--gas-baseline", default=None, help="Fail when the combined median gas exceeds this file")
+    parser.add_argument("--gas-regression-threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args, pytest_args = parser.parse_known_args(argv)
+
+    merged = run_parallel(
+        args.workers, pytest_args,
+        cache_dir=args.cache_dir, report_path=args.report, install_solc=args.install_solc,
+        gas_save_baseline=args.gas_save_baseline, gas_baseline=args.gas_baseline,
+        gas_threshold=args.gas_regression_threshold
+    )
+    print(format_merged_report(merged, merged["wall_seconds"]))
+
+    return 1 if run_failed(merged) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""Phase-level profiling for the eth-tester suite
+
+Run the suite with `--profile` to print a phase table at the end, or add
+`--profile-folded profile.folded` to also write folded stacks:
+
+    python -m pytest --profile --profile-folded profile.folded
+    flamegraph.pl profile.folded > profile.svg
+
+Each test is a root frame with setup (one child frame per fixture), call and
+teardown under it. Inside these, the profiler wraps the library entry points
+where suite time goes: the solc compile, EthereumTester() construction, Web3
+provider setup, deployment, receipt waits, web3 requests, ABI encoding and
+decoding, block mining and EVM transaction execution. A span's self time
+leaves out its child spans. The self time of "web3 request" is therefore
+Python-side middleware and formatting, and "EVM execution" is time inside
+py-evm.
+"""
+import functools
+import importlib
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import pytest
+
+# (module, attribute path, label) for every library call the profiler times
+DEFAULT_TARGETS = (
+    ("solcx", "compile_standard", "solc compile"),
+    ("eth_tester", "EthereumTester.__init__", "EthereumTester()"),
+    ("web3.providers.eth_tester", "EthereumTesterProvider.__init__", "web3 provider setup"),
+    ("web3.contract.contract", "ContractConstructor.transact", "deploy"),
+    ("web3.eth", "Eth.wait_for_transaction_receipt", "receipt wait"),
+    ("web3.eth", "Eth.get_transaction_receipt", "receipt wait"),
+    ("support.receipts", "InstantReceipts.wait", "receipt wait"),
+    ("support.receipts", "InstantReceipts.receipt", "receipt wait"),
+    ("web3.manager", "RequestManager.request_blocking", "web3 request"),
+    ("eth_abi.codec", "ABIEncoder.encode", "ABI encode"),
+    ("eth_abi.codec", "ABIDecoder.decode", "ABI decode"),
+    ("eth_tester.backends.pyevm.main", "PyEVMBackend.mine_blocks", "mine blocks"),
+    ("eth.vm.state", "BaseTransactionExecutor.__call__", "EVM execution"),
+)
+
+
+def _folded_label(label):
+    # Folded stacks separate frames with ';' and the count with a space
+    return label.replace(";", ",").replace(" ", "_")
+
+
+class Profiler:
+    """Nested wall-clock spans, kept as per-label totals and per-stack self time"""
+
+    def __init__(self):
+        self.stack = []
+        self.folded = defaultdict(float)
+        self.totals = {}
+        self._patches = []
+
+    @contextmanager
+    def span(self, label):
+        # [label, start, time spent in child spans]
+        frame = [label, time.perf_counter(), 0.0]
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            self.stack.pop()
+            self_time = elapsed - frame[2]
+            self.folded[tuple(outer[0] for outer in self.stack) + (label,)] += self_time
+
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+            stats = self.totals.setdefault(label, {"calls": 0, "total": 0.0, "self": 0.0})
+            stats["calls"] += 1
+            stats["self"] += self_time
+            # A label nested in itself, e.g. one receipt call inside another, is only counted once
+            if all(outer[0] != label for outer in self.stack):
+                stats["total"] += elapsed
+
+    def wrap(self, owner, attribute, label):
+        """Replace owner.attribute with a version that runs inside span(label)"""
+        original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+        # Descriptors like eth_utils' combomethod keep the function in .method
+        function = getattr(original, "method", original)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self.span(label):
+                return function(*args, **kwargs)
+
+        setattr(owner, attribute, wrapper if function is original else type(original)(wrapper))
+        self._patches.append((owner, attribute, original))
+
+    def instrument(self, targets=DEFAULT_TARGETS):
+        """Wrap every importable target; return how many were wrapped"""
+        wrapped = 0
+        for module_name, path, label in targets:
+            try:
+                owner = importlib.import_module(module_name)
+                *owners, attribute = path.split(".")
+                for name in owners:
+                    owner = getattr(owner, name)
+                self.wrap(owner, attribute, label)
+            except (ImportError, AttributeError, KeyError):
+                continue
+            wrapped += 1
+        return wrapped
+
+    def uninstrument(self):
+        """Put back everything wrap() replaced, newest first"""
+        while self._patches:
+            owner, attribute, original = self._patches.pop()
+            setattr(owner, attribute, original)
+
+    def phases(self):
+        """(label, stats) sorted by self time, largest first"""
+        return sorted(self.totals.items(), key=lambda item: item[1]["self"], reverse=True)
+
+    def roots(self):
+        """Inclusive time per root frame (per test), largest first"""
+        totals = defaultdict(float)
+        for path, seconds in self.folded.items():
+            totals[path[0]] += seconds
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def folded_lines(self):
+        """flamegraph.pl input: `frame;frame;frame microseconds`, one line per stack"""
+        return [
+            f"{';'.join(_folded_label(label) for label in path)} {round(seconds * 1_000_000)}"
+            for path, seconds in sorted(self.folded.items())
+            if round(seconds * 1_000_000) > 0
+        ]
+
+    def write_folded(self, path):
+        with open(path, "w") as file:
+            file.write("\n".join(self.folded_lines()) + "\n")
+
+
+def format_profile(profiler, top=15):
+    """Phase table sorted by self time, then the slowest tests"""
+    roots = profiler.roots()
+    root_labels = {label for label, _ in roots}
+    phases = [(label, stats) for label, stats in profiler.phases() if label not in root_labels]
+    measured = sum(stats["self"] for _, stats in phases) or 1.0
+
+    lines = [f"   {'phase':<36} {'calls':>7} {'total':>9} {'self':>9} {'self %':>7}"]
+    for label, stats in phases[:top]:
+        lines.append(
+            f"   {label[:36]:<36} {stats['calls']:>7,} {stats['total']:>8.3f}s "
+            f"{stats['self']:>8.3f}s {stats['self'] / measured * 100:>6.1f}%"
+        )
+
+    lines.append("\n   slowest tests")
+    for nodeid, seconds in roots[:min(top, 10)]:
+        lines.append(f"   {seconds:>8.3f}s {nodeid}")
+
+    return "\n".join(lines)
+
+
+class ProfilingPlugin:
+    """pytest plugin that puts each test phase and fixture setup in a Profiler span"""
+
+    def __init__(self, profiler, folded_path=None):
+        self.profiler = profiler
+        self.folded_path = folded_path
+
+    def _test_span(self, item, phase):
+        return _nested(self.profiler.span(item.nodeid), self.profiler.span(phase))
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_setup(self, item):
+        with self._test_span(item, "setup"):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item):
+        with self._test_span(item, "call"):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_teardown(self, item):
+        with self._test_span(item, "teardown"):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        with self.profiler.span(f"fixture:{fixturedef.argname}"):
+            return (yield)
+
+    def pytest_sessionfinish(self, session):
+        self.profiler.uninstrument()
+        if self.folded_path:
+            self.profiler.write_folded(self.folded_path)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        terminalreporter.write_sep("-", "profile")
+        terminalreporter.write_line(format_profile(self.profiler))
+        if self.folded_path:
+            terminalreporter.write_line(f"\n🔥 folded stacks written to {self.folded_path}")
+
+
+@contextmanager
+def _nested(outer, inner):
+    with outer:
+        with inner:
+            yield
@@ -0,0 +1,352 @@
+"""Memory-bounded EthereumTester chains that forget old blocks
+
+Usage (from test/python):
+
+    python -m support.pruning --transactions 20000 --keep-blocks 256 --budget-mb 500
+
+An EthereumTester keeps every header, transaction, receipt and historical
+state trie node in one in-memory key-value store. A soak run therefore grows
+without bound. HistoryPruner records which keys each mined block adds. Once a
+block falls more than `keep_blocks` behind the head, those keys are deleted
+unless something still references them: the current state, a retained block,
+or a retained block's state. This is a mark and sweep from the retained
+headers. Pruned blocks can first be spilled to a JSON-lines file.
+
+Pruned blocks are gone. Block lookups, receipts, log queries and snapshot
+reverts must stay inside the retained window, and BLOCKHASH returns zero
+beyond it.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+
+import rlp
+from eth.db.schema import SchemaV1
+from eth.exceptions import HeaderNotFound
+from eth_utils import big_endian_to_int, keccak
+
+from support.artifacts import load_simple_storage_artifact
+from support.chain import create_web3, deploy_simple_storage
+from support.driver import FastDriver
+from support.factory import max_rss_mb
+
+DEFAULT_KEEP_BLOCKS = 256
+
+BLANK_ROOT = keccak(rlp.encode(b""))
+
+# Lookups whose value is rlp([block_number, index]) of the block that holds the item
+_BLOCK_LOOKUP_PREFIXES = (b"transaction-hash-to-block:", b"withdrawal-hash-to-block:")
+
+
+class _JournalingStore(dict):
+    """MemoryDB key-value store that lists every key it did not hold before"""
+
+    __slots__ = ("journal",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.journal = []
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self.journal.append(key)
+        dict.__setitem__(self, key, value)
+
+
+def _walk_trie(store, root, reachable, on_leaf=None):
+    """Add every stored node of the hexary trie at `root` to `reachable`"""
+    stack = [root]
+    while stack:
+        ref = stack.pop()
+        if isinstance(ref, list):
+            # Nodes under 32 bytes are embedded in their parent
+            node = ref
+        elif ref in reachable or ref == BLANK_ROOT or ref not in store:
+            continue
+        else:
+            reachable.add(ref)
+            node = rlp.decode(store[ref])
+
+        if len(node) == 17:
+            stack.extend(child for child in node[:16] if child)
+            if node[16] and on_leaf:
+                on_leaf(node[16])
+        elif len(node) == 2:
+            # High nibble 2 or 3 of the compact path marks a leaf, 0 or 1 an extension
+            if node[0][0] >> 4 >= 2:
+                if on_leaf:
+                    on_leaf(node[1])
+            else:
+                stack.append(node[1])
+
+
+def current_rss_mb():
+    """Resident memory of this process right now in MB, or the peak where /proc is missing"""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            resident_pages = int(file.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return max_rss_mb()
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def read_spill(path):
+    """Yield the pruned-block records written by HistoryPruner, oldest first"""
+    with open(path, "r") as file:
+        for line in file:
+            yield json.loads(line)
+
+
+class HistoryPruner:
+    """Keep an EthereumTester's last `keep_blocks` blocks plus current state in memory"""
+
+    def __init__(self, tester, keep_blocks=DEFAULT_KEEP_BLOCKS, spill_path=None, prune_every=None):
+        if keep_blocks < 1:
+            raise ValueError("keep_blocks must be at least 1")
+
+        self.tester = tester
+        self.keep_blocks = keep_blocks
+        self.spill_path = spill_path
+        # Marking walks the whole retained window, so sweep several blocks at a time
+        self.prune_every = prune_every or max(1, keep_blocks // 4)
+        self.db = tester.backend.chain.chaindb.db.wrapped_db
+        self.blocks = deque()
+        self.blocks_pruned = 0
+        self.keys_deleted = 0
+        self._pruned_through = -1
+        self._spilled_through = None
+        self._original_mine_blocks = None
+        self._shadowed = None
+
+    @property
+    def chaindb(self):
+        # Reverting to genesis gives the backend a new chain object over the same database
+        return self.tester.backend.chain.chaindb
+
+    def install(self):
+        """Start journaling keys and pruning after each mined block; calling it twice is harmless"""
+        if self._original_mine_blocks is not None:
+            return self
+
+        self.db.kv_store = _JournalingStore(self.db.kv_store)
+        self._spilled_through = self.chaindb.get_canonical_head().block_number
+
+        original = self.tester.mine_blocks
+        self._shadowed = self.tester.__dict__.get("mine_blocks")
+
+        def mine_blocks(*args, **kwargs):
+            block_hashes = original(*args, **kwargs)
+            self._record_block()
+            return block_hashes
+
+        self._original_mine_blocks = original
+        self.tester.mine_blocks = mine_blocks
+        return self
+
+    def uninstall(self):
+        """Stop pruning; what was already pruned stays gone"""
+        if self._original_mine_blocks is None:
+            return
+
+        if self._shadowed is not None:
+            self.tester.mine_blocks = self._shadowed
+        else:
+            self.tester.__dict__.pop("mine_blocks", None)
+        self._original_mine_blocks = None
+        self.db.kv_store = dict(self.db.kv_store)
+        self.blocks.clear()
+
+    def _record_block(self):
+        store = self.db.kv_store
+        head = self.chaindb.get_canonical_head().block_number
+
+        # Keys written for pending transactions since the last mine belong to this block too
+        self.blocks.append((head, store.journal))
+        store.journal = []
+
+        if self.blocks[0][0] <= head - self.keep_blocks - self.prune_every + 1:
+            self.prune()
+
+    def _mark(self, head):
+        """Keys the retained blocks and their state still need"""
+        store = self.db.kv_store
+        reachable = set()
+
+        def visit_account(encoded):
+            _, _, storage_root, code_hash = rlp.decode(encoded)
+            _walk_trie(store, storage_root, reachable)
+            reachable.add(code_hash)
+
+        header = head
+        for _ in range(self.keep_blocks):
+            reachable.update((
+                header.hash,
+                header.uncles_hash,
+                SchemaV1.make_block_hash_to_score_lookup_key(header.hash),
+                SchemaV1.make_block_number_to_hash_lookup_key(header.block_number)
+            ))
+            for root in (header.transaction_root, header.receipt_root, getattr(header, "withdrawals_root", None)):
+                if root:
+                    _walk_trie(store, root, reachable)
+            _walk_trie(store, header.state_root, reachable, on_leaf=visit_account)
+
+            if header.block_number == 0:
+                break
+            try:
+                header = self.chaindb.get_block_header_by_hash(header.parent_hash)
+            except HeaderNotFound:
+                break
+
+        return reachable
+
+    def prune(self):
+        """Drop every recorded block more than keep_blocks behind the head; return keys deleted"""
+        head = self.chaindb.get_canonical_head()
+        cutoff = head.block_number - self.keep_blocks
+        if not self.blocks or self.blocks[0][0] > cutoff:
+            return 0
+
+        if self.spill_path:
+            self._spill(range(self._spilled_through + 1, cutoff + 1))
+        self._spilled_through = max(self._spilled_through, cutoff)
+
+        reachable = self._mark(head)
+        store = self.db.kv_store
+        deleted = 0
+        # Prunable keys still in use; the journal only lists a key once, so they move to the head block
+        survivors = []
+
+        while self.blocks and self.blocks[0][0] <= cutoff:
+            number, keys = self.blocks.popleft()
+            # Survivors re-journaled under a block already counted are not another block
+            if number > self._pruned_through:
+                self.blocks_pruned += 1
+                self._pruned_through = number
+            for key in keys:
+                value = store.get(key)
+                if value is None:
+                    continue
+                if len(key) == 32:
+                    # Only content-addressed entries: trie nodes, headers, code
+                    if keccak(value) != key:
+                        continue
+                elif key.startswith(_BLOCK_LOOKUP_PREFIXES):
+                    # A replayed transaction can point this lookup at a retained block
+                    if big_endian_to_int(rlp.decode(value)[0]) > cutoff:
+                        survivors.append(key)
+                        continue
+                elif not key.startswith((b"block-hash-to-score:", b"block-number-to-hash:")):
+                    continue
+                if key in reachable:
+                    survivors.append(key)
+                    continue
+                del store[key]
+                deleted += 1
+
+        if survivors:
+            if self.blocks and self.blocks[-1][0] == head.block_number:
+                self.blocks[-1][1].extend(survivors)
+            else:
+                self.blocks.append((head.block_number, survivors))
+
+        self.keys_deleted += deleted
+        return deleted
+
+    def _spill(self, numbers):
+        """Append one compact JSON line per canonical block: header fields and receipts"""
+        with open(self.spill_path, "a") as file:
+            for number in numbers:
+                block = self.tester.get_block_by_number(number)
+                transactions = []
+                for tx_hash in block["transactions"]:
+                    receipt = self.tester.get_transaction_receipt(tx_hash)
+                    transactions.append([
+                        tx_hash,
+                        receipt["status"],
+                        receipt["gas_used"],
+                        [[log["address"], list(log["topics"]), log["data"]] for log in receipt["logs"]]
+                    ])
+
+                file.write(json.dumps({
+                    "number": number,
+                    "hash": block["hash"],
+                    "timestamp": block["timestamp"],
+                    "gas_used": block["gas_used"],
+                    "transactions": transactions
+                }, separators=(",", ":")) + "\n")
+
+    def memory_report(self):
+        """Block counts, in-memory database size and process RSS"""
+        store = self.db.kv_store
+        head = self.chaindb.get_canonical_head().block_number
+        return {
+            "head": head,
+            # self.blocks is the retained window; blocks mined before install() are never pruned
+            "retained_blocks": head + 1 - self.blocks_pruned,
+            "pruned_blocks": self.blocks_pruned,
+            "db_keys": len(store),
+            "db_mb": sum(len(key) + len(value) for key, value in store.items()) / 2 ** 20,
+            "rss_mb": current_rss_mb()
+        }
+
+
+def soak(artifact, transactions, keep_blocks=None, report_every=5000, spill_path=None):
+    """Alternate increment/decrement `transactions` times; return a memory report every `report_every`"""
+    web3 = create_web3()
+    owner, sender = web3.eth.accounts[:2]
+    deployment = deploy_simple_storage(web3, artifact["abi"], artifact["bytecode"], owner)
+    tester = web3.provider.ethereum_tester
+    driver = FastDriver(tester, deployment["address"], artifact["abi"])
+
+    pruner = HistoryPruner(tester, keep_blocks or DEFAULT_KEEP_BLOCKS, spill_path)
+    if keep_blocks:
+        pruner.install()
+
+    reports = []
+    started = time.perf_counter()
+    for index in range(1, transactions + 1):
+        driver.transact("increment" if index % 2 else "decrement", sender=sender)
+        if index % report_every == 0 or index == transactions:
+            report = pruner.memory_report()
+            report.update(transactions=index, seconds=time.perf_counter() - started)
+            reports.append(report)
+
+    pruner.uninstall()
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=20_000)
+    parser.add_argument("--keep-blocks", type=int, default=DEFAULT_KEEP_BLOCKS,
+                        help="Blocks of history to keep; 0 disables pruning")
+    parser.add_argument("--report-every", type=int, default=5_000)
+    parser.add_argument("--spill", default=None, help="Append pruned blocks to this JSON-lines file")
+    parser.add_argument("--budget-mb", type=float, default=None, help="Fail when RSS ends above this")
+    parser.add_argument("--install-solc", action="store_true")
+    args = parser.parse_args(argv)
+
+    artifact = load_simple_storage_artifact(install_solc=args.install_solc)
+    mode = f"keeping {args.keep_blocks} blocks" if args.keep_blocks else "unpruned"
+
+    print(f"\n🧹 Soak: {args.transactions:,} transactions, {mode}")
+    reports = soak(artifact, args.transactions, args.keep_blocks, args.report_every, args.spill)
+    for report in reports:
+        print(
+            f"   {report['transactions']:>9,} txs in {report['seconds']:.0f}s: "
+            f"{report['db_keys']:,} keys / {report['db_mb']:.1f} MB in the chain db, "
+            f"RSS {report['rss_mb']:.0f} MB, {report['pruned_blocks']:,} blocks pruned"
+        )
+
+    if args.budget_mb is not None and reports[-1]["rss_mb"] > args.budget_mb:
+        print(f"❌ RSS {reports[-1]['rss_mb']:.0f} MB is over the {args.budget_mb:.0f} MB budget")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""Receipts straight from the EthereumTester chain, without lookup scans or polling
+
+Usage (from test/python):
+
+    python -m support.receipts --transactions 200 --history 500
+
+web3's wait_for_transaction_receipt polls eth_getTransactionReceipt until it
+succeeds. Behind EthereumTesterProvider each of those calls runs eth-tester's
+lookup, which scans the chain block by block from the head, and then the
+provider and web3 result formatters. InstantReceipts finds the transaction
+through py-evm's transaction index and serializes the receipt with the same
+eth-tester, provider and web3 formatters. The result is identical to web3's
+AttributeDict receipt. `receipts()` reads each block's receipts only once for
+many hashes. When mining is manual, `wait()` blocks on a condition that the
+tester's mine_blocks signals; it does not sleep and poll.
+
+create_web3() installs it on web3.eth by default. Installed receipt calls no
+longer pass through web3's middleware onion, so a middleware that must see
+eth_getTransactionReceipt needs `create_web3(instant_receipts=False)`.
+"""
+import argparse
+import sys
+import threading
+import time
+
+from eth.exceptions import BlockNotFound, TransactionNotFound as EVMTransactionNotFound
+from eth_tester.backends.pyevm.serializers import serialize_transaction_receipt
+from hexbytes import HexBytes
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted, TransactionNotFound
+from web3.providers.eth_tester import EthereumTesterProvider
+from web3.providers.eth_tester.middleware import receipt_result_formatter, receipt_result_remapper
+
+DEFAULT_TIMEOUT = 120
+
+
+def _tester_receipt(tester, block, block_receipts, index):
+    """Receipt of the block's `index`th transaction, shaped like tester.get_transaction_receipt"""
+    raw = serialize_transaction_receipt(
+        block, block_receipts, block.transactions[index], index, False, tester.backend.chain.get_vm()
+    )
+    return tester.normalizer.normalize_outbound_receipt(raw)
+
+
+def block_receipts(tester, block_hash):
+    """tester.get_transaction_receipt for every transaction of a mined block, reading its receipts once"""
+    chain = tester.backend.chain
+    block = chain.get_block_by_hash(bytes(HexBytes(block_hash)))
+    receipts = block.get_receipts(chain.chaindb)
+    return [_tester_receipt(tester, block, receipts, index) for index in range(len(block.transactions))]
+
+
+class InstantReceipts:
+    """Backend-aware receipt lookups for a Web3 connected to an in-process EthereumTester"""
+
+    def __init__(self, web3):
+        if not isinstance(web3.provider, EthereumTesterProvider):
+            raise TypeError("InstantReceipts needs a Web3 on an EthereumTesterProvider")
+
+        self.web3 = web3
+        self.tester = web3.provider.ethereum_tester
+        self._mined = threading.Condition()
+        self._waiters = 0
+        self._original_mine_blocks = None
+        self._shadowed = {}
+
+    @property
+    def chain(self):
+        # Reverting to genesis gives the backend a new chain object
+        return self.tester.backend.chain
+
+    def _format(self, block, block_receipts, index):
+        receipt = _tester_receipt(self.tester, block, block_receipts, index)
+        # The same steps EthereumTesterProvider's middleware and web3's result formatter apply
+        return AttributeDict.recursive(receipt_formatter(receipt_result_formatter(receipt_result_remapper(receipt))))
+
+    def _locate(self, tx_hash):
+        """(block number, index) of a mined transaction, or None"""
+        tx_hash = bytes(HexBytes(tx_hash))
+        try:
+            block_number, index = self.chain.chaindb.get_transaction_index(tx_hash)
+        except EVMTransactionNotFound:
+            return None
+        return block_number, index
+
+    def receipts(self, tx_hashes):
+        """Receipts in the order of `tx_hashes`; None for any not mined yet, each block read once"""
+        located = [self._locate(tx_hash) for tx_hash in tx_hashes]
+        head = self.chain.chaindb.get_canonical_head().block_number
+        blocks = {}
+        results = []
+
+        for tx_hash, position in zip(tx_hashes, located):
+            if position is None:
+                results.append(None)
+                continue
+
+            block_number, index = position
+            if block_number > head:
+                # Left behind by a snapshot revert, like the block it points to
+                results.append(None)
+                continue
+            if block_number not in blocks:
+                try:
+                    block = self.chain.get_canonical_block_by_number(block_number)
+                except BlockNotFound:
+                    blocks[block_number] = None
+                else:
+                    blocks[block_number] = (block, block.get_receipts(self.chain.chaindb))
+
+            # A replayed chain can reuse the number; only the canonical block is trusted
+            if blocks[block_number] is None:
+                results.append(None)
+                continue
+            block, block_receipts = blocks[block_number]
+            if index >= len(block.transactions) or block.transactions[index].hash != bytes(HexBytes(tx_hash)):
+                results.append(None)
+                continue
+            results.append(self._format(block, block_receipts, index))
+
+        return results
+
+    def receipt(self, tx_hash):
+        """Receipt of a mined transaction; raises web3's TransactionNotFound like get_transaction_receipt"""
+        receipt = self.receipts([tx_hash])[0]
+        if receipt is None:
+            raise TransactionNotFound(f"Transaction with hash: {HexBytes(tx_hash).hex()!r} not found.")
+        return receipt
+
+    def wait(self, tx_hash, timeout=DEFAULT_TIMEOUT, poll_latency=None):
+        """Receipt as soon as `tx_hash` is mined; with manual mining, wake on each mined block
+
+        `poll_latency` is accepted for wait_for_transaction_receipt compatibility and ignored.
+        """
+        receipt = self.receipts([tx_hash])[0]
+        if receipt is not None:
+            return receipt
+
+        deadline = time.monotonic() + timeout
+        with self._mined:
+            self._waiters += 1
+            self._watch_mining()
+            try:
+                while True:
+                    receipt = self.receipts([tx_hash])[0]
+                    if receipt is not None:
+                        return receipt
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._mined.wait(remaining):
+                        raise TimeExhausted(
+                            f"Transaction {HexBytes(tx_hash)!r} is not in the chain after {timeout} seconds"
+                        )
+            finally:
+                self._waiters -= 1
+                if not self._waiters:
+                    self._unwatch_mining()
+
+    def _watch_mining(self):
+        if self._original_mine_blocks is not None:
+            return
+
+        original = self.tester.mine_blocks
+        self._shadowed["mine_blocks"] = self.tester.__dict__.get("mine_blocks")
+
+        def mine_blocks(*args, **kwargs):
+            # Mine under the lock so a waiter never reads a half-written block
+            with self._mined:
+                block_hashes = original(*args, **kwargs)
+                self._mined.notify_all()
+            return block_hashes
+
+        self._original_mine_blocks = original
+        self.tester.mine_blocks = mine_blocks
+
+    def _unwatch_mining(self):
+        if self._original_mine_blocks is None:
+            return
+
+        shadowed = self._shadowed.pop("mine_blocks")
+        if shadowed is not None:
+            self.tester.mine_blocks = shadowed
+        else:
+            self.tester.__dict__.pop("mine_blocks", None)
+        self._original_mine_blocks = None
+
+    def install(self):
+        """Route web3.eth's receipt methods through this object; calling it twice is harmless"""
+        eth = self.web3.eth
+        if "get_transaction_receipt" in self._shadowed:
+            return self
+
+        for name in ("get_transaction_receipt", "wait_for_transaction_receipt"):
+            self._shadowed[name] = eth.__dict__.get(name)
+
+        # Late-bound so the profiler's class-level wrappers on InstantReceipts still apply
+        eth.get_transaction_receipt = lambda tx_hash: self.receipt(tx_hash)
+        eth.wait_for_transaction_receipt = lambda tx_hash, timeout=DEFAULT_TIMEOUT, poll_latency=None: \
+            self.wait(tx_hash, timeout, poll_latency)
+        return self
+
+    def uninstall(self):
+        eth = self.web3.eth
+        for name in ("get_transaction_receipt", "wait_for_transaction_receipt"):
+            if name not in self._shadowed:
+                continue
+            shadowed = self._shadowed.pop(name)
+            if shadowed is not None:
+                setattr(eth, name, shadowed)
+            else:
+                eth.__dict__.pop(name, None)
+
+
+def benchmark(web3, contract, sender, transactions, history=0):
+    """Per-transaction latency of transact + receipt, through web3 polling and InstantReceipts"""
+    from support.loadgen import latency_stats
+
+    for _ in range(history):
+        contract.functions.increment().transact({'from': sender})
+
+    eth = web3.eth
+    fast = InstantReceipts(web3)
+    samples = {"web3": [], "instant": [], "web3_oldest": [], "instant_oldest": []}
+    oldest = None
+
+    for _ in range(transactions):
+        started = time.perf_counter()
+        tx_hash = contract.functions.increment().transact({'from': sender})
+        eth.wait_for_transaction_receipt(tx_hash)
+        samples["web3"].append(time.perf_counter() - started)
+        oldest = oldest or tx_hash
+
+        started = time.perf_counter()
+        tx_hash = contract.functions.increment().transact({'from': sender})
+        fast.wait(tx_hash)
+        samples["instant"].append(time.perf_counter() - started)
+
+    # Looking up an old receipt is where eth-tester's head-first scan hurts most
+    for _ in range(min(transactions, 20)):
+        started = time.perf_counter()
+        eth.get_transaction_receipt(oldest)
+        samples["web3_oldest"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        fast.receipt(oldest)
+        samples["instant_oldest"].append(time.perf_counter() - started)
+
+    return {path: latency_stats(values) for path, values in samples.items()}
+
+
+def main(argv=None):
+    from support.artifacts import load_simple_storage_artifact
+    from support.chain import create_web3, deploy_simple_storage
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=200)
+    parser.add_argument("--history", type=int, default=0, help="Blocks to mine before measuring")
+    parser.add_argument("--install-solc", action="store_true")
+    args = parser.parse_args(argv)
+
+    artifact = load_simple_storage_artifact(install_solc=args.install_solc)
+    web3 = create_web3(instant_receipts=False)
+    owner, sender = web3.eth.accounts[:2]
+    deployment = deploy_simple_storage(web3, artifact["abi"], artifact["bytecode"], owner)
+
+    result = benchmark(web3, deployment["contract"], sender, args.transactions, args.history)
+
+    print(f"\n🧾 Receipt latency after {args.history:,} blocks of history (p50 / p95)")
+    for path, label in (("web3", "transact + web3 wait"), ("instant", "transact + instant wait"),
+                        ("web3_oldest", "oldest receipt, web3"), ("instant_oldest", "oldest receipt, instant")):
+        print(f"   {label}: {result[path]['p50_ms']:.2f} / {result[path]['p95_ms']:.2f}ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Offline resolution of a solc binary for a pinned compiler version"""
+import os
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+# Matches the pragma in contracts/SimpleStorage.sol and hardhat.config.js
+SOLC_VERSION = "0.8.20"
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+VENDOR_DIR = REPO_ROOT / "vendor" / "solc"
+
+# Where Hardhat keeps the native compilers it downloads
+HARDHAT_COMPILERS_DIR = Path.home() / ".cache" / "hardhat-nodejs" / "compilers-v2"
+
+
+class SolcNotFoundError(RuntimeError):
+    """Raised when no local solc binary matches the requested version"""
+
+
+def _is_executable(path):
+    return path.is_file() and os.access(path, os.X_OK)
+
+
+def _binary_version(path):
+    """Version reported by `solc --version`, or None if it cannot be run"""
+    try:
+        output = subprocess.run(
+            [str(path), "--version"], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    match = re.search(r"Version: (\d+\.\d+\.\d+)", output)
+    return match.group(1) if match else None
+
+
+def candidate_binaries(version):
+    """Yield (origin, path) for every local place a solc `version` binary may live"""
+    env_binary = os.environ.get("SOLC_BINARY")
+    if env_binary:
+        yield "env", Path(env_binary)
+
+    vendor_dir = Path(os.environ.get("SOLC_VENDOR_DIR", VENDOR_DIR))
+    for name in (f"solc-v{version}", f"solc-{version}", "solc"):
+        yield "vendor", vendor_dir / name
+
+    # solcx install folder, without letting solcx touch the network
+    solcx_dir = Path(os.environ.get("SOLCX_BINARY_PATH", Path.home() / ".solcx"))
+    yield "solcx", solcx_dir / f"solc-v{version}"
+
+    if HARDHAT_COMPILERS_DIR.exists():
+        for path in sorted(HARDHAT_COMPILERS_DIR.glob(f"*/solc-*-v{version}+commit.*")):
+            if path.suffix != ".js":
+                yield "hardhat", path
+
+    system_binary = shutil.which("solc")
+    if system_binary:
+        yield "path", Path(system_binary)
+
+
+def resolve_solc(version=SOLC_VERSION, install=False):
+    """Find a local solc binary for `version`, installing it only when `install` is set"""
+    started = time.perf_counter()
+
+    for origin, path in candidate_binaries(version):
+        if not _is_executable(path):
+            continue
+
+        # Env and vendored binaries may be named loosely, so check what they report
+        if origin in ("env", "path") or path.name == "solc":
+            if _binary_version(path) != version:
+                continue
+
+        return {
+            "version": version,
+            "binary": path,
+            "origin": origin,
+            "resolve_seconds": time.perf_counter() - started
+        }
+
+    if not install:
+        raise SolcNotFoundError(
+            f"solc {version} not found locally; set SOLC_BINARY, vendor it under "
+            f"{VENDOR_DIR}, or allow installation with --install-solc"
+        )
+
+    # Only reached on explicit request, since this downloads from binaries.soliditylang.org
+    from solcx import get_executable, install_solc
+
+    install_solc(version)
+    binary = get_executable(version)
+    return {
+        "version": version,
+        "binary": binary,
+        "origin": "installed",
+        "resolve_seconds": time.perf_counter() - started
+    }
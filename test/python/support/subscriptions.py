@@ -0,0 +1,212 @@
+"""Push-based delivery of decoded SimpleStorage events from eth-tester block mining
+
+LogBus wraps `EthereumTester.mine_blocks`. Auto-mined transactions, manual
+mining and TransactionBatch all pass through it. For every mined block the bus
+reads the receipts once, decodes each log once, and hands the same record to
+every matching subscriber. Subscribers take one of two forms:
+
+- callbacks, which run inline while the block is being mined;
+- bounded queues, which can be drained synchronously or consumed with
+  `async for`. When a queue is full its oldest events are dropped and
+  counted, so a slow consumer never holds up mining.
+
+Events are not withdrawn when a snapshot revert removes the blocks that emitted them.
+"""
+import asyncio
+import threading
+from collections import deque
+
+from eth_utils import to_checksum_address
+
+from support.events import LogDecoder
+from support.receipts import block_receipts
+
+DEFAULT_QUEUE_SIZE = 1_000
+
+
+class Subscription:
+    """A callback registered on a LogBus, optionally limited to one event and address"""
+
+    def __init__(self, bus, callback, event_name=None, address=None):
+        self.bus = bus
+        self.callback = callback
+        self.event_name = event_name
+        self.address = to_checksum_address(address) if address else None
+        self.delivered = 0
+        self.errors = []
+
+    def matches(self, record):
+        if self.event_name is not None and type(record).__name__ != self.event_name:
+            return False
+        return self.address is None or record.address == self.address
+
+    def deliver(self, record):
+        try:
+            self.callback(record)
+        except Exception as error:
+            # A failing subscriber must not break mining for everyone else
+            self.errors.append(error)
+            return
+        self.delivered += 1
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class QueueSubscription(Subscription):
+    """Bounded buffer of decoded events, readable synchronously or with `async for`"""
+
+    def __init__(self, bus, event_name=None, address=None, maxsize=DEFAULT_QUEUE_SIZE):
+        super().__init__(bus, None, event_name, address)
+        self.buffer = deque(maxlen=maxsize)
+        self.dropped = 0
+        self.closed = False
+        self._lock = threading.Lock()
+        self._waiter = None
+        self._loop = None
+
+    def deliver(self, record):
+        with self._lock:
+            if len(self.buffer) == self.buffer.maxlen:
+                self.dropped += 1
+            self.buffer.append(record)
+            self.delivered += 1
+            waiter, self._waiter = self._waiter, None
+
+        if waiter is not None:
+            self._wake(waiter)
+
+    def _wake(self, waiter):
+        def resolve():
+            if not waiter.done():
+                waiter.set_result(None)
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            resolve()
+        elif not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(resolve)
+            except RuntimeError:
+                # The loop closed since the check; nobody is left to wake
+                pass
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def get_nowait(self):
+        """Oldest buffered event, or None if the buffer is empty"""
+        with self._lock:
+            return self.buffer.popleft() if self.buffer else None
+
+    def drain(self):
+        """Every buffered event, oldest first"""
+        with self._lock:
+            records = list(self.buffer)
+            self.buffer.clear()
+        return records
+
+    def __iter__(self):
+        return iter(self.drain())
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while True:
+            with self._lock:
+                if self.buffer:
+                    return self.buffer.popleft()
+                if self.closed:
+                    raise StopAsyncIteration
+                self._loop = asyncio.get_running_loop()
+                self._waiter = self._waiter or self._loop.create_future()
+                waiter = self._waiter
+
+            await waiter
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self.closed = True
+            waiter, self._waiter = self._waiter, None
+
+        if waiter is not None:
+            self._wake(waiter)
+
+
+class LogBus:
+    """Decode logs once per mined block and fan them out to subscribers"""
+
+    def __init__(self, tester, abi, address=None):
+        self.tester = tester
+        self.decoder = LogDecoder(abi, address=address)
+        self.subscriptions = []
+        self.blocks_processed = 0
+        self._original_mine_blocks = None
+        self._shadowed = None
+
+    def install(self):
+        """Start intercepting `tester.mine_blocks`; calling it twice is harmless"""
+        if self._original_mine_blocks is not None:
+            return self
+
+        original = self.tester.mine_blocks
+        self._shadowed = self.tester.__dict__.get("mine_blocks")
+
+        def mine_blocks(*args, **kwargs):
+            block_hashes = original(*args, **kwargs)
+            if self.subscriptions:
+                self.publish_blocks(block_hashes)
+            return block_hashes
+
+        self._original_mine_blocks = original
+        self.tester.mine_blocks = mine_blocks
+        return self
+
+    def uninstall(self):
+        if self._original_mine_blocks is None:
+            return
+
+        # Put back whatever was there before; otherwise let the class method show through again
+        if self._shadowed is not None:
+            self.tester.mine_blocks = self._shadowed
+        else:
+            self.tester.__dict__.pop("mine_blocks", None)
+        self._original_mine_blocks = None
+
+        for subscription in list(self.subscriptions):
+            subscription.close()
+
+    def subscribe(self, callback, event_name=None, address=None):
+        """Call `callback(record)` for each matching event as its block is mined"""
+        subscription = Subscription(self, callback, event_name, address)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def subscribe_queue(self, event_name=None, address=None, maxsize=DEFAULT_QUEUE_SIZE):
+        """Buffer matching events in a bounded queue"""
+        subscription = QueueSubscription(self, event_name, address, maxsize)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def publish_blocks(self, block_hashes):
+        for block_hash in block_hashes:
+            # get_transaction_receipt would scan back from the head and reread the block per transaction
+            logs = []
+            for receipt in block_receipts(self.tester, block_hash):
+                logs.extend(receipt["logs"])
+
+            self.blocks_processed += 1
+            for record in self.decoder.decode_logs(logs):
+                for subscription in list(self.subscriptions):
+                    if subscription.matches(record):
+                        subscription.deliver(record)
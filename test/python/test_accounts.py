@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from support.accounts import AccountPool, derive_account, load_or_derive_accounts
+from support.chain import create_web3, deploy_simple_storage
+
+class TestAccountDerivation:
+    """Test deterministic key derivation and its on-disk cache"""
+
+    def test_derivation_is_deterministic(self):
+        assert derive_account("seed", 3) == derive_account("seed", 3)
+        assert derive_account("seed", 3) != derive_account("other", 3)
+
+    def test_cache_extends_without_rederiving(self, tmp_path, monkeypatch):
+        first = load_or_derive_accounts("seed", 3, tmp_path)
+
+        derived = []
+        monkeypatch.setattr("support.accounts.derive_account", lambda seed, index: derived.append(index) or derive_account(seed, index))
+        assert load_or_derive_accounts("seed", 5, tmp_path)[:3] == first
+        assert derived == [3, 4]
+
+        assert load_or_derive_accounts("seed", 4, tmp_path) == first + [derive_account("seed", 3)]
+        assert derived == [3, 4]
+
+class TestAccountPool:
+    """Test funding and handing out pool accounts"""
+
+    def test_genesis_funded_tester(self, compiled_contract, tmp_path):
+        pool = AccountPool(5, cache_dir=tmp_path)
+        web3 = create_web3(pool.create_tester(balance=10 ** 18))
+
+        assert [web3.eth.get_balance(address) for address in pool.addresses] == [10 ** 18] * 5
+        contract = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], web3.eth.accounts[0])["contract"]
+        contract.functions.increment().transact({'from': pool.addresses[4]})
+        assert contract.functions.getStorageInfo().call()[0] == 43
+
+    def test_funded_fixture_sends_from_pool(self, funded_account_pool, deployed_contract, web3_instance):
+        contract = deployed_contract["contract"]
+        for _ in range(3):
+            contract.functions.increment().transact({'from': funded_account_pool.next()})
+
+        assert contract.functions.getValue().call() == 45
+        assert all(web3_instance.eth.get_balance(address) > 0 for address in funded_account_pool.addresses)
+
+    def test_registration_is_undone(self, tmp_path):
+        pool = AccountPool(3, cache_dir=tmp_path)
+        web3 = create_web3()
+        accounts = web3.eth.accounts
+
+        with pool.registered(web3.provider.ethereum_tester):
+            assert web3.eth.accounts == accounts + pool.addresses
+
+        assert web3.eth.accounts == accounts
+
+    def test_round_robin_and_leases(self, tmp_path):
+        pool = AccountPool(4, cache_dir=tmp_path)
+        assert [pool.next() for _ in range(5)] == pool.addresses + pool.addresses[:1]
+
+        with pool.lease(3) as held:
+            with pytest.raises(TimeoutError):
+                with pool.lease(2, timeout=0.01):
+                    pass
+
+            acquired = []
+            def wait_for_lease():
+                with pool.lease(2) as accounts:
+                    acquired.extend(accounts)
+
+            waiter = threading.Thread(target=wait_for_lease)
+            waiter.start()
+            waiter.join(timeout=0.05)
+            assert acquired == []
+
+        waiter.join(timeout=1)
+        assert len(acquired) == 2 and set(acquired) <= set(pool.addresses)
+        assert set(held) != set(acquired)
+
+        with pytest.raises(ValueError):
+            with pool.lease(5):
+                pass
@@ -0,0 +1,148 @@
+import json
+import os
+
+from support.artifacts import (
+    ArtifactCache,
+    DEFAULT_SETTINGS,
+    HARDHAT_SOURCE_NAME,
+    artifact_key,
+    build_compiler_input,
+    load_hardhat_artifact,
+)
+
+SOURCE = "pragma solidity ^0.8.20; contract SimpleStorage {}"
+ARTIFACT = {"abi": [], "bytecode": "6080"}
+
+class TestArtifactKey:
+    """Test cache key derivation"""
+
+    def test_key_is_stable(self):
+        compiler_input = build_compiler_input(SOURCE)
+        assert artifact_key(compiler_input, "0.8.20") == artifact_key(build_compiler_input(SOURCE), "0.8.20")
+
+    def test_key_changes_with_source(self):
+        assert artifact_key(build_compiler_input(SOURCE), "0.8.20") != \
+            artifact_key(build_compiler_input(SOURCE + " "), "0.8.20")
+
+    def test_key_changes_with_solc_version(self):
+        compiler_input = build_compiler_input(SOURCE)
+        assert artifact_key(compiler_input, "0.8.20") != artifact_key(compiler_input, "0.8.21")
+
+    def test_key_changes_with_settings(self):
+        settings = dict(DEFAULT_SETTINGS, optimizer={"enabled": True, "runs": 1000})
+        assert artifact_key(build_compiler_input(SOURCE), "0.8.20") != \
+            artifact_key(build_compiler_input(SOURCE, settings), "0.8.20")
+
+class TestArtifactCache:
+    """Test the on-disk artifact cache"""
+
+    def test_miss_compiles_then_hit_skips_compiler(self, tmp_path):
+        cache = ArtifactCache(tmp_path)
+        compiler_input = build_compiler_input(SOURCE)
+        calls = []
+
+        def compile_fn():
+            calls.append(1)
+            return ARTIFACT
+
+        assert cache.get_or_compile(compiler_input, "0.8.20", compile_fn) == ARTIFACT
+        assert cache.get_or_compile(compiler_input, "0.8.20", compile_fn) == ARTIFACT
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_cache_persists_across_instances(self, tmp_path):
+        compiler_input = build_compiler_input(SOURCE)
+        ArtifactCache(tmp_path).get_or_compile(compiler_input, "0.8.20", lambda: ARTIFACT)
+
+        def fail():
+            raise AssertionError("compiler should not run on a cache hit")
+
+        assert ArtifactCache(tmp_path).get_or_compile(compiler_input, "0.8.20", fail) == ARTIFACT
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = ArtifactCache(tmp_path)
+        key = artifact_key(build_compiler_input(SOURCE), "0.8.20")
+        cache.path_for(key).write_text("{not json")
+        assert cache.get(key) is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = ArtifactCache(tmp_path, max_entries=2)
+        for index, key in enumerate(["a", "b"]):
+            cache.put(key, ARTIFACT)
+            os.utime(cache.path_for(key), (index, index))
+
+        # Touch "a" so "b" becomes the oldest entry
+        assert cache.get("a") == ARTIFACT
+        cache.put("c", ARTIFACT)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == ARTIFACT
+        assert cache.get("c") == ARTIFACT
+
+def write_hardhat_build(artifacts_dir, source, optimizer=None, solc_long_version="0.8.20+commit.a1b79de6",
+                        **settings):
+    """Lay out artifacts/ the way `npx hardhat compile` does for SimpleStorage"""
+    contract_dir = artifacts_dir / HARDHAT_SOURCE_NAME
+    contract_dir.mkdir(parents=True)
+    (artifacts_dir / "build-info").mkdir()
+
+    build_input = {
+        "language": "Solidity",
+        "sources": {HARDHAT_SOURCE_NAME: {"content": source}},
+        "settings": {
+            "optimizer": optimizer or DEFAULT_SETTINGS["optimizer"],
+            "evmVersion": "shanghai",
+            "outputSelection": {"*": {"*": ["abi", "evm.bytecode", "evm.deployedBytecode", "metadata"]}},
+            **settings
+        }
+    }
+    (artifacts_dir / "build-info" / "abc123.json").write_text(json.dumps({
+        "solcVersion": solc_long_version.split("+")[0],
+        "solcLongVersion": solc_long_version,
+        "input": build_input
+    }))
+    (contract_dir / "SimpleStorage.dbg.json").write_text(json.dumps({"buildInfo": "../../build-info/abc123.json"}))
+    (contract_dir / "SimpleStorage.json").write_text(json.dumps({
+        "contractName": "SimpleStorage",
+        "sourceName": HARDHAT_SOURCE_NAME,
+        "abi": [],
+        "bytecode": "0x6080"
+    }))
+
+class TestHardhatArtifacts:
+    """Test reusing Hardhat's build output"""
+
+    def test_current_build_is_reused(self, tmp_path):
+        write_hardhat_build(tmp_path, SOURCE)
+        assert load_hardhat_artifact(SOURCE, tmp_path) == ARTIFACT
+
+    def test_stale_source_is_ignored(self, tmp_path):
+        write_hardhat_build(tmp_path, SOURCE)
+        assert load_hardhat_artifact(SOURCE + " ", tmp_path) is None
+
+    def test_other_optimizer_settings_are_ignored(self, tmp_path):
+        write_hardhat_build(tmp_path, SOURCE, optimizer={"enabled": False, "runs": 200})
+        assert load_hardhat_artifact(SOURCE, tmp_path) is None
+
+    def test_other_evm_version_or_output_settings_are_ignored(self, tmp_path):
+        write_hardhat_build(tmp_path / "paris", SOURCE, evmVersion="paris")
+        write_hardhat_build(tmp_path / "via-ir", SOURCE, viaIR=True)
+        write_hardhat_build(tmp_path / "metadata", SOURCE, metadata={"bytecodeHash": "none"})
+
+        for build in ("paris", "via-ir", "metadata"):
+            assert load_hardhat_artifact(SOURCE, tmp_path / build) is None
+        paris = dict(DEFAULT_SETTINGS, evmVersion="paris")
+        assert load_hardhat_artifact(SOURCE, tmp_path / "paris", settings=paris) == ARTIFACT
+
+    def test_other_solc_version_is_ignored(self, tmp_path):
+        write_hardhat_build(tmp_path, SOURCE, solc_long_version="0.8.19+commit.7dd6d404")
+        assert load_hardhat_artifact(SOURCE, tmp_path) is None
+        shanghai = dict(DEFAULT_SETTINGS, evmVersion="shanghai")
+        assert load_hardhat_artifact(SOURCE, tmp_path, solc_version="0.8.19", settings=shanghai) == ARTIFACT
+
+    def test_missing_or_partial_build_is_ignored(self, tmp_path):
+        assert load_hardhat_artifact(SOURCE, tmp_path) is None
+
+        write_hardhat_build(tmp_path, SOURCE)
+        (tmp_path / "build-info" / "abc123.json").unlink()
+        assert load_hardhat_artifact(SOURCE, tmp_path) is None
@@ -0,0 +1,54 @@
+import asyncio
+
+from support.async_harness import build_jobs, connect, deploy, run_concurrent, run_sequential
+
+class TestJobList:
+    """Test the read/write job mix"""
+
+    def test_build_jobs_is_deterministic(self):
+        jobs = build_jobs(["a", "b"], reads=10, writes=4, seed=3)
+
+        assert jobs == build_jobs(["a", "b"], reads=10, writes=4, seed=3)
+        assert sum(1 for kind, _ in jobs if kind == "read") == 10
+        assert sorted(target for kind, target in jobs if kind == "write") == ["a", "a", "b", "b"]
+
+class TestAsyncHarness:
+    """Test concurrent SimpleStorage clients on AsyncWeb3"""
+
+    def test_concurrent_run_applies_every_write(self, compiled_contract):
+        async def scenario():
+            web3 = await connect()
+            accounts = await web3.eth.accounts
+            contract = await deploy(web3, compiled_contract["abi"], compiled_contract["bytecode"], accounts[0])
+
+            jobs = build_jobs(accounts[:3], reads=60, writes=9)
+            stats = await run_concurrent(web3, contract, jobs, concurrency=8, queue_size=4)
+            return stats, await contract.functions.getValue().call()
+
+        stats, value = asyncio.run(scenario())
+
+        assert stats["errors"] == {}
+        assert stats["requests"] == 69
+        assert 1 < stats["max_in_flight"] <= 8
+        assert value == 42 + 9
+
+    def test_overlapping_requests_share_the_latency(self, compiled_contract):
+        async def scenario():
+            web3 = await connect(latency=0.05)
+            accounts = await web3.eth.accounts
+            contract = await deploy(web3, compiled_contract["abi"], compiled_contract["bytecode"], accounts[0])
+            jobs = build_jobs(accounts[:1], reads=20, writes=0)
+
+            # Peak requests inside the provider at once, per mode; unlike elapsed time it does not flake
+            web3.provider.max_in_flight = 0
+            sequential = await run_sequential(web3, contract, jobs)
+            sequential_peak, web3.provider.max_in_flight = web3.provider.max_in_flight, 0
+            concurrent = await run_concurrent(web3, contract, jobs, concurrency=20)
+            return sequential, sequential_peak, concurrent, web3.provider.max_in_flight
+
+        sequential, sequential_peak, concurrent, concurrent_peak = asyncio.run(scenario())
+
+        assert sequential["requests"] == concurrent["requests"] == 20
+        assert sequential_peak == 1
+        assert concurrent_peak > 1
+        assert concurrent["max_in_flight"] > 1
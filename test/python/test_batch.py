@@ -0,0 +1,97 @@
+import pytest
+from eth_tester import EthereumTester
+from eth_utils.exceptions import ValidationError
+from hexbytes import HexBytes
+
+from support.batch import add_to_pending_block
+
+class TestTransactionBatch:
+    """Test batched submission with manual mining"""
+
+    def test_batch_mines_in_one_block(self, deployed_contract, accounts, transaction_batch):
+        contract = deployed_contract["contract"]
+        web3 = contract.w3
+        start_block = web3.eth.block_number
+
+        batch = transaction_batch()
+        batch.add(contract.functions.increment(), accounts["user1"])
+        batch.add(contract.functions.increment(), accounts["user1"])
+        batch.add(contract.functions.addValue(5), accounts["user2"])
+        batch.add(contract.functions.setValue(100), accounts["owner"])
+        batch.add(contract.functions.increment(), accounts["user2"])
+        results = batch.submit()
+
+        assert [result["status"] for result in results] == [1, 1, 1, 1, 1]
+        assert {result["receipt"].blockNumber for result in results} == {start_block + 1}
+        assert web3.eth.block_number == start_block + 1
+        assert contract.functions.getValue().call() == 101
+
+    def test_receipts_follow_queue_order_across_blocks(self, deployed_contract, accounts, transaction_batch):
+        contract = deployed_contract["contract"]
+        start_block = contract.w3.eth.block_number
+
+        batch = transaction_batch(max_per_block=2)
+        for value in range(1, 6):
+            batch.add(contract.functions.addValue(value), accounts["user1"])
+        results = batch.submit()
+
+        assert [result["receipt"].transactionHash for result in results] == [HexBytes(result["tx_hash"]) for result in results]
+        assert [result["receipt"].blockNumber - start_block for result in results] == [1, 1, 2, 2, 3]
+
+    def test_reverts_are_reported_per_transaction(self, deployed_contract, accounts, transaction_batch):
+        contract = deployed_contract["contract"]
+
+        batch = transaction_batch()
+        batch.add(contract.functions.setValue(999_999), accounts["owner"])
+        batch.add(contract.functions.increment(), accounts["user1"])
+        batch.add(contract.functions.setValue(5), accounts["user1"])
+        batch.add(contract.functions.decrement(), accounts["user2"])
+        results = batch.submit()
+
+        assert [result["status"] for result in results] == [1, 0, 0, 1]
+        assert results[1]["error"] == "reverted"
+        assert contract.functions.getValue().call() == 999_998
+
+    def test_long_batches_split_across_blocks(self, deployed_contract, accounts, transaction_batch):
+        contract = deployed_contract["contract"]
+        web3 = contract.w3
+        start_block = web3.eth.block_number
+
+        batch = transaction_batch(max_per_block=4)
+        for index in range(10):
+            batch.add(contract.functions.increment(), accounts["all"][index % 3])
+        results = batch.submit()
+
+        assert all(result["status"] == 1 for result in results)
+        assert web3.eth.block_number == start_block + 3
+        assert contract.functions.getValue().call() == 52
+
+    def test_rejected_transaction_does_not_consume_nonce(self, deployed_contract, accounts, transaction_batch):
+        contract = deployed_contract["contract"]
+
+        batch = transaction_batch()
+        batch.add(contract.functions.increment(), accounts["user1"], value=10 ** 30)
+        batch.add(contract.functions.increment(), accounts["user1"])
+        results = batch.submit()
+
+        assert results[0]["status"] is None
+        assert results[0]["error"]
+        assert results[1]["status"] == 1
+
+    def test_public_manual_mining_cannot_batch_one_sender(self):
+        # Why batching uses the private pending-block API; if this starts passing, switch to send_transaction
+        tester = EthereumTester()
+        sender, recipient = tester.get_accounts()[:2]
+        tester.disable_auto_mine_transactions()
+        transfer = {"from": sender, "to": recipient, "gas": 21_000, "value": 1}
+
+        tester.send_transaction(dict(transfer, nonce=0))
+        with pytest.raises(ValidationError, match="nonce"):
+            tester.send_transaction(dict(transfer, nonce=1))
+
+        # The pending block keeps both when they go in directly
+        tester = EthereumTester()
+        add_to_pending_block(tester, dict(transfer, nonce=0))
+        add_to_pending_block(tester, dict(transfer, nonce=1))
+        tester.mine_blocks(1)
+        assert len(tester.get_block_by_number("latest")["transactions"]) == 2
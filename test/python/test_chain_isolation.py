@@ -0,0 +1,38 @@
+from eth_tester import EthereumTester
+
+from support.chain import snapshot_isolation
+
+class TestSnapshotIsolation:
+    """Test snapshot/revert isolation of a shared chain"""
+
+    def test_reverts_blocks_and_balances(self):
+        tester = EthereumTester()
+        sender, receiver = tester.get_accounts()[:2]
+        block_number = tester.get_block_by_number("latest")["number"]
+        balance = tester.get_balance(receiver)
+
+        with snapshot_isolation(tester):
+            tester.send_transaction({
+                "from": sender, "to": receiver, "value": 10 ** 18, "gas": 21000
+            })
+            assert tester.get_balance(receiver) == balance + 10 ** 18
+
+        assert tester.get_block_by_number("latest")["number"] == block_number
+        assert tester.get_balance(receiver) == balance
+
+    def test_restores_auto_mining(self):
+        tester = EthereumTester()
+
+        with snapshot_isolation(tester):
+            tester.disable_auto_mine_transactions()
+
+        assert tester.auto_mine_transactions
+
+    def test_contract_state_rolls_back(self, deployed_contract, accounts, eth_tester):
+        contract = deployed_contract["contract"]
+
+        with snapshot_isolation(eth_tester):
+            contract.functions.setValue(7).transact({'from': accounts["owner"]})
+            assert contract.functions.getValue().call() == 7
+
+        assert contract.functions.getValue().call() == deployed_contract["initial_value"]
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from support.costs import (
+    budget,
+    cost_matrix,
+    export_projection,
+    load_gas_prices,
+    load_gas_samples,
+    project_costs,
+    weighted_percentiles,
+)
+from support.gas import format_gas_cost, percentile
+
+class TestCostProjection:
+    """Test exact, vectorized gas cost projection"""
+
+    def test_matrix_matches_format_gas_cost(self):
+        matrix = cost_matrix([21_000, 33_500], [20 * 10 ** 9, 35 * 10 ** 9])
+
+        assert matrix.dtype == np.int64
+        assert int(matrix[1, 0]) == format_gas_cost(33_500)["total_cost_wei"]
+        assert int(matrix[0, 1]) == format_gas_cost(21_000, 35)["total_cost_wei"]
+
+    def test_overflowing_products_stay_exact(self):
+        matrix = cost_matrix([30_000_000], [10 ** 12 + 1])
+        assert int(matrix[0, 0]) == 30_000_000 * (10 ** 12 + 1)
+
+    def test_percentiles_match_nearest_rank(self):
+        values = np.array([5, 1, 4, 2, 3])
+        assert weighted_percentiles(values, np.ones(5, dtype=np.int64), [0.5, 0.95]) == \
+            [percentile([5, 1, 4, 2, 3], 0.5), percentile([5, 1, 4, 2, 3], 0.95)]
+        # Counting the highest price nine times moves the median onto it
+        assert weighted_percentiles(values, np.array([9, 1, 1, 1, 1]), [0.5]) == [5]
+
+    def test_projection_over_weighted_csv(self, tmp_path):
+        prices_csv = tmp_path / "prices.csv"
+        prices_csv.write_text("timestamp,gas_price_gwei,count\n1,10,1\n2,20.5,2\n3,30,1\n")
+        prices, counts = load_gas_prices(prices_csv, count_column="count")
+        assert prices.tolist() == [10 * 10 ** 9, 20_500_000_000, 30 * 10 ** 9]
+
+        rows, matrices = project_costs({"increment": [100, 200]}, prices, counts)
+        row = rows[0]
+        assert (row["pairs"], row["min_wei"], row["max_wei"]) == (6, 1_000 * 10 ** 9, 6_000 * 10 ** 9)
+        assert row["p50_wei"] == 100 * 20_500_000_000
+        assert row["mean_wei"] == 3_037_500_000_000
+        assert budget(rows, {"increment": 1_000}) == 1_000 * row["p95_wei"]
+
+        export_projection(rows, tmp_path / "costs.json")
+        assert json.loads((tmp_path / "costs.json").read_text())[0]["max_wei"] == 6_000 * 10 ** 9
+
+    def test_fractional_wei_is_rejected(self, tmp_path):
+        prices_csv = tmp_path / "prices.csv"
+        prices_csv.write_text("gas_price_gwei\n0.0000000001\n")
+        with pytest.raises(ValueError, match="whole"):
+            load_gas_prices(prices_csv)
+
+    def test_zero_total_count_is_rejected(self, tmp_path):
+        prices_csv = tmp_path / "prices.csv"
+        prices_csv.write_text("gas_price_gwei,count\n20,0\n30,0\n")
+        with pytest.raises(ValueError, match="sums to zero"):
+            load_gas_prices(prices_csv, count_column="count")
+        with pytest.raises(ValueError, match="sum to zero"):
+            project_costs({"increment": [100]}, [20 * 10 ** 9, 30 * 10 ** 9], [0, 0])
+
+    def test_samples_from_report(self, tmp_path):
+        report = tmp_path / "report.json"
+        report.write_text(json.dumps({"gas_benchmark": [
+            {"key": "increment[non_owner,update]", "gas_used": 100, "test": None},
+            {"key": "increment[owner,update]", "gas_used": 120, "test": None},
+        ]}))
+
+        assert len(load_gas_samples(report)) == 2
+        assert load_gas_samples(report, by_method=True) == {"increment": [100, 120]}
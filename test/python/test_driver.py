@@ -0,0 +1,29 @@
+from support.chain import create_web3, deploy_simple_storage
+from support.driver import FastDriver, benchmark
+
+class TestFastDriver:
+    """Test the direct EthereumTester driver against the web3 path"""
+
+    def test_transact_and_call(self, fast_driver, deployed_contract, accounts):
+        receipt = fast_driver.transact("addValue", 8, sender=accounts["user1"])
+
+        assert receipt.status == 1 and receipt.gasUsed > 0
+        assert fast_driver.call("getValue") == deployed_contract["contract"].functions.getValue().call() == 50
+        assert fast_driver.call("getStorageInfo")[1] == fast_driver.call("owner") == accounts["owner"]
+
+    def test_revert_is_reported_in_receipt(self, fast_driver, accounts):
+        receipt = fast_driver.transact("setValue", 1, sender=accounts["user1"])
+
+        assert receipt.status == 0
+        assert fast_driver.call("getValue") == 42
+
+    def test_benchmark_reports_both_paths(self, compiled_contract):
+        web3 = create_web3()
+        owner, sender = web3.eth.accounts[:2]
+        deployment = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], owner)
+        driver = FastDriver(web3.provider.ethereum_tester, deployment["address"], compiled_contract["abi"])
+
+        result = benchmark(web3, deployment["contract"], driver, sender, operations=3)
+
+        assert result["driver"]["increment"]["count"] == result["web3"]["getValue"]["count"] == 3
+        assert driver.call("getValue") == 42 + 6
@@ -0,0 +1,136 @@
+import pytest
+from eth_abi import encode
+from eth_utils import to_checksum_address
+
+from support.events import LogDecoder
+
+EVENTS_ABI = [
+    {
+        "type": "event",
+        "name": "ValueChanged",
+        "anonymous": False,
+        "inputs": [
+            {"name": "oldValue", "type": "uint256", "indexed": True},
+            {"name": "newValue", "type": "uint256", "indexed": True},
+            {"name": "updatedBy", "type": "address", "indexed": True}
+        ]
+    },
+    {
+        "type": "event",
+        "name": "OwnershipTransferred",
+        "anonymous": False,
+        "inputs": [
+            {"name": "previousOwner", "type": "address", "indexed": True},
+            {"name": "newOwner", "type": "address", "indexed": True}
+        ]
+    },
+    {
+        "type": "event",
+        "name": "Note",
+        "anonymous": False,
+        "inputs": [
+            {"name": "id", "type": "uint256", "indexed": True},
+            {"name": "text", "type": "string", "indexed": False}
+        ]
+    }
+]
+
+CONTRACT = to_checksum_address("0x" + "11" * 20)
+USER = to_checksum_address("0x" + "22" * 20)
+
+def word(value):
+    return encode(["uint256"], [value])
+
+def address_word(address):
+    return encode(["address"], [address])
+
+def make_log(decoder, event_name, topics, data=b"", log_index=0):
+    return {
+        "address": CONTRACT,
+        "topics": [decoder.topic(event_name)] + topics,
+        "data": data,
+        "blockNumber": 7,
+        "transactionHash": b"\xab" * 32,
+        "logIndex": log_index
+    }
+
+class TestLogDecoder:
+    """Test ABI log decoding through the topic index"""
+
+    def test_decodes_indexed_value_changed(self):
+        decoder = LogDecoder(EVENTS_ABI)
+        record = decoder.decode_log(make_log(decoder, "ValueChanged", [word(42), word(43), address_word(USER)]))
+
+        assert type(record).__name__ == "ValueChanged"
+        assert (record.oldValue, record.newValue, record.updatedBy) == (42, 43, USER)
+        assert (record.address, record.blockNumber, record.logIndex) == (CONTRACT, 7, 0)
+
+    def test_tells_events_apart(self):
+        decoder = LogDecoder(EVENTS_ABI)
+        logs = [
+            make_log(decoder, "ValueChanged", [word(1), word(2), address_word(USER)], log_index=0),
+            make_log(decoder, "OwnershipTransferred", [address_word(USER), address_word(CONTRACT)], log_index=1),
+        ]
+
+        assert [type(record).__name__ for record in decoder.decode_logs(logs)] == ["ValueChanged", "OwnershipTransferred"]
+        transfers = decoder.decode_logs(logs, "OwnershipTransferred")
+        assert [(record.previousOwner, record.newOwner) for record in transfers] == [(USER, CONTRACT)]
+
+    def test_decodes_non_indexed_data(self):
+        decoder = LogDecoder(EVENTS_ABI)
+        record = decoder.decode_log(make_log(decoder, "Note", [word(5)], encode(["string"], ["hello"])))
+        assert (record.id, record.text) == (5, "hello")
+
+    def test_dynamic_and_array_topics_stay_hashes(self):
+        abi = [{
+            "type": "event",
+            "name": "Tagged",
+            "anonymous": False,
+            "inputs": [
+                {"name": "tags", "type": "bytes32[]", "indexed": True},
+                {"name": "amounts", "type": "uint256[]", "indexed": True},
+                {"name": "label", "type": "string", "indexed": True}
+            ]
+        }]
+        decoder = LogDecoder(abi)
+        hashes = [b"\x01" * 32, b"\xff" * 32, b"\x02" * 32]
+        record = decoder.decode_log(make_log(decoder, "Tagged", hashes))
+
+        assert [bytes(value) for value in (record.tags, record.amounts, record.label)] == hashes
+
+    def test_skips_unknown_and_foreign_logs(self):
+        decoder = LogDecoder(EVENTS_ABI, address=USER)
+        logs = [
+            {"address": USER, "topics": [b"\x00" * 32], "data": b""},
+            {"address": USER, "topics": [], "data": b""},
+            make_log(decoder, "ValueChanged", [word(1), word(2), address_word(USER)]),
+        ]
+        assert decoder.decode_logs(logs) == []
+
+    def test_accepts_eth_tester_shaped_logs(self):
+        decoder = LogDecoder(EVENTS_ABI)
+        log = {
+            "address": CONTRACT,
+            "topics": ["0x" + decoder.topic("ValueChanged").hex(), "0x" + word(3).hex(), "0x" + word(4).hex(),
+                       "0x" + address_word(USER).hex()],
+            "data": "0x",
+            "block_number": 9,
+            "transaction_hash": "0x" + "cd" * 32,
+            "log_index": 2
+        }
+        record = decoder.decode_log(log)
+        assert (record.oldValue, record.newValue, record.blockNumber, record.logIndex) == (3, 4, 9, 2)
+
+class TestEventChecker:
+    """Test event_checker assertions against decoded receipts"""
+
+    def test_rejects_wrong_values(self, deployed_contract, accounts, event_checker):
+        contract = deployed_contract["contract"]
+        tx_hash = contract.functions.setValue(9).transact({'from': accounts["owner"]})
+        tx_receipt = contract.w3.eth.wait_for_transaction_receipt(tx_hash)
+
+        assert event_checker.value_changed(tx_receipt, 42, 9, accounts["owner"])
+        with pytest.raises(AssertionError, match="Expected ValueChanged"):
+            event_checker.value_changed(tx_receipt, 42, 10, accounts["owner"])
+        with pytest.raises(AssertionError, match="No OwnershipTransferred"):
+            event_checker.ownership_transferred(tx_receipt, accounts["owner"], accounts["user1"])
@@ -0,0 +1,47 @@
+import pytest
+
+from support.factory import DeploymentRegistry, contract_address, deploy_many
+
+class TestDeploymentRegistry:
+    """Test the array-backed deployment registry"""
+
+    def test_round_trips_addresses_and_owners(self):
+        owners = ["0x" + "11" * 20, "0x" + "22" * 20]
+        registry = DeploymentRegistry(owners)
+        for index in range(4):
+            registry.append(contract_address(owners[index % 2], index // 2), owners[index % 2])
+
+        assert len(registry) == 4
+        assert registry.owned_by(owners[1]) == [1, 3]
+        assert registry[2] == (registry.address(2), registry.owners[0])
+        assert registry.nbytes() == 4 * 20 + 4 * 2
+
+class TestMassDeployment:
+    """Test deploying many SimpleStorage instances in batched blocks"""
+
+    def test_deploys_instances_per_owner(self, simple_storage_factory, web3_instance, accounts):
+        owners = [accounts["owner"], accounts["user1"], accounts["user2"]]
+        start_block = web3_instance.eth.block_number
+
+        registry = simple_storage_factory(30, owners)
+
+        assert len(registry) == 30
+        # 25 creations per block
+        assert web3_instance.eth.block_number - start_block == 2
+        contracts = [web3_instance.eth.contract(address=address, abi=simple_storage_factory.abi) for address in registry.addresses()]
+        assert [contract.functions.owner().call() for contract in contracts[:3]] == owners
+        assert all(contract.functions.getValue().call() == 42 for contract in contracts[::7])
+
+    def test_failed_creation_raises(self, compiled_contract, web3_instance, accounts):
+        with pytest.raises(RuntimeError, match="deployments failed"):
+            deploy_many(web3_instance, compiled_contract["abi"], compiled_contract["bytecode"], 2,
+                        [accounts["owner"]], initial_value=1_000_000)
+
+    def test_rejected_creation_leaves_no_pending_transactions(self, compiled_contract, web3_instance, accounts):
+        unknown_owner = "0x" + "33" * 20
+        with pytest.raises(Exception):
+            deploy_many(web3_instance, compiled_contract["abi"], compiled_contract["bytecode"], 2,
+                        [accounts["owner"], unknown_owner])
+
+        web3_instance.eth.send_transaction({"from": accounts["user1"], "to": accounts["user2"], "value": 1})
+        assert len(web3_instance.eth.get_block("latest").transactions) == 1
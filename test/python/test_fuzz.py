@@ -0,0 +1,60 @@
+from support.fuzz import Call, Fuzzer, ReferenceModel, ZERO_ADDRESS, format_sequence
+
+class StrictModel(ReferenceModel):
+    """A model with the wrong bound, so the fuzzer has something to find"""
+
+    max_value = 50
+
+def make_fuzzer(fast_driver, storage_inspector, accounts, **kwargs):
+    senders = [accounts["owner"], accounts["user1"], accounts["user2"]]
+    return Fuzzer(fast_driver, storage_inspector, senders, accounts["owner"], 42, **kwargs)
+
+class TestReferenceModel:
+    """Test the reference model's revert rules"""
+
+    def test_bounds_and_ownership(self):
+        model = ReferenceModel("owner", 999_998)
+
+        assert model.apply(Call("increment", (), "user")) == (True, True)
+        assert model.apply(Call("increment", (), "user")) == (False, False)
+        assert model.apply(Call("setValue", (5,), "user")) == (False, False)
+        assert model.apply(Call("transferOwnership", (ZERO_ADDRESS,), "owner")) == (False, False)
+        assert model.apply(Call("transferOwnership", ("user",), "owner")) == (True, False)
+        assert (model.owner, model.value) == ("user", 999_999)
+
+class TestFuzzer:
+    """Test stateful fuzzing with snapshot rewinds"""
+
+    def test_contract_matches_model(self, fast_driver, storage_inspector, accounts):
+        fuzzer = make_fuzzer(fast_driver, storage_inspector, accounts, seed=7)
+
+        assert fuzzer.run(sequences=8, length=6, branches=4) == []
+        assert fuzzer.sequences_run == 8
+        # Two shared prefixes of 3 calls plus eight suffixes of 3 calls
+        assert fuzzer.calls_run == 2 * 3 + 8 * 3
+        assert fast_driver.call("getValue") == 42
+
+    def test_failures_are_shrunk(self, fast_driver, storage_inspector, accounts):
+        fuzzer = make_fuzzer(fast_driver, storage_inspector, accounts, seed=3, model_class=StrictModel)
+        sequence = [
+            Call("increment", (), accounts["user1"]),
+            Call("transferOwnership", (accounts["user2"],), accounts["owner"]),
+            Call("addValue", (1_500,), accounts["user2"]),
+            Call("decrement", (), accounts["user1"]),
+        ]
+
+        minimal = fuzzer.shrink(sequence)
+
+        assert len(minimal) == 1 and minimal[0].name == "addValue"
+        assert 8 <= minimal[0].args[0] < 16
+        assert "expected addValue to revert" in fuzzer.replay(minimal)
+        assert format_sequence(minimal, {accounts["user2"]: "user2"}).endswith("from user2")
+
+    def test_run_reports_shrunk_failures(self, fast_driver, storage_inspector, accounts):
+        fuzzer = make_fuzzer(fast_driver, storage_inspector, accounts, seed=1, model_class=StrictModel)
+
+        failures = fuzzer.run(sequences=4, length=6, branches=2)
+
+        assert failures
+        assert all(len(failure.sequence) <= 2 and failure.message for failure in failures)
+        assert fast_driver.call("getValue") == 42
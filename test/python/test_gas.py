@@ -0,0 +1,59 @@
+from support.chain import create_web3, deploy_simple_storage
+from support.gas import GasBenchmark, format_benchmark, format_gas_cost, percentile, value_slot_path
+
+class TestGasStatistics:
+    """Test gas aggregation helpers"""
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 0.95) == 95
+        assert percentile([7], 0.95) == 7
+
+    def test_value_slot_paths(self):
+        assert value_slot_path(0, 5) == "set"
+        assert value_slot_path(5, 6) == "update"
+        assert value_slot_path(5, 0) == "clear"
+
+    def test_summary_and_regression_gate(self):
+        benchmark = GasBenchmark()
+        for gas_used in (100, 100, 130):
+            benchmark.record("increment", "non_owner,update", gas_used)
+
+        summary = benchmark.summary()["increment[non_owner,update]"]
+        assert (summary["calls"], summary["min"], summary["median"], summary["p95"]) == (3, 100, 100, 130)
+
+        baseline = {"methods": {"increment[non_owner,update]": {"median": 90}}}
+        assert benchmark.compare(baseline, threshold=0.2)[0]["regressed"] is False
+        assert benchmark.compare(baseline, threshold=0.05)[0]["regressed"] is True
+
+    def test_report_prices_deltas(self):
+        benchmark = GasBenchmark()
+        benchmark.record("reset", "owner,clear", 1_100)
+        comparison = benchmark.compare({"methods": {"reset[owner,clear]": {"median": 1_000}}})
+
+        assert format_gas_cost(100)["formatted"] in format_benchmark(benchmark.summary(), comparison)
+
+class TestGasBenchmarkMiddleware:
+    """Test recording gas for every SimpleStorage transaction"""
+
+    def test_records_method_and_call_path(self, compiled_contract):
+        web3 = create_web3()
+        owner, user1 = web3.eth.accounts[:2]
+        contract = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], owner)["contract"]
+
+        benchmark = GasBenchmark()
+        benchmark.attach(web3, compiled_contract["abi"])
+        benchmark.attach(web3, compiled_contract["abi"])
+
+        contract.functions.increment().transact({'from': user1})
+        contract.functions.reset().transact({'from': owner})
+        contract.functions.setValue(5).transact({'from': owner})
+        contract.functions.transferOwnership(user1).transact({'from': owner})
+
+        assert list(benchmark.samples) == [
+            "increment[non_owner,update]",
+            "reset[owner,clear]",
+            "setValue[owner,set]",
+            "transferOwnership[owner]",
+        ]
+        assert all(len(values) == 1 for values in benchmark.samples.values())
@@ -0,0 +1,61 @@
+import pytest
+
+from support.chain import create_web3
+from support.genesis import (
+    create_preloaded_tester,
+    load_genesis_state,
+    load_or_capture_genesis_state,
+    preloaded_deployment,
+    save_genesis_state,
+)
+
+@pytest.fixture(scope="module")
+def captured_state(compiled_contract, tmp_path_factory):
+    return load_or_capture_genesis_state(
+        tmp_path_factory.mktemp("genesis"),
+        compiled_contract["abi"],
+        compiled_contract["bytecode"]
+    )
+
+class TestPreloadedGenesis:
+    """Test chains that start with SimpleStorage already deployed"""
+
+    def test_contract_exists_at_block_zero(self, captured_state, compiled_contract):
+        web3 = create_web3(create_preloaded_tester(captured_state))
+        deployment = preloaded_deployment(web3, captured_state, compiled_contract["abi"])
+        contract = deployment["contract"]
+
+        assert web3.eth.block_number == 0
+        assert contract.functions.getValue().call() == 42
+        assert contract.functions.owner().call() == web3.eth.accounts[0]
+        assert contract.functions.lastUpdated().call() > 0
+
+    def test_preloaded_contract_accepts_transactions(self, captured_state, compiled_contract):
+        web3 = create_web3(create_preloaded_tester(captured_state))
+        contract = preloaded_deployment(web3, captured_state, compiled_contract["abi"])["contract"]
+        owner = web3.eth.accounts[0]
+
+        contract.functions.setValue(7).transact({'from': owner})
+        assert contract.functions.getValue().call() == 7
+
+        # Owner nonce continues after the reference deployment, so new deployments don't collide
+        assert web3.eth.get_transaction_count(owner) == captured_state["owner_nonce"] + 1
+
+    def test_accounts_match_default_tester(self, captured_state):
+        web3 = create_web3(create_preloaded_tester(captured_state))
+        assert len(web3.eth.accounts) == len(create_web3().eth.accounts)
+
+    def test_reference_receipt_round_trips(self, captured_state, compiled_contract):
+        web3 = create_web3(create_preloaded_tester(captured_state))
+        receipt = preloaded_deployment(web3, captured_state, compiled_contract["abi"])["tx_receipt"]
+
+        assert receipt.contractAddress == captured_state["address"]
+        assert len(receipt.logs) == 1
+        assert len(receipt.logs[0].topics) == 4
+
+    def test_state_is_keyed_by_bytecode(self, captured_state, compiled_contract, tmp_path):
+        path = tmp_path / "state.json"
+        save_genesis_state(captured_state, path)
+
+        assert load_genesis_state(path, compiled_contract["bytecode"]) == captured_state
+        assert load_genesis_state(path, compiled_contract["bytecode"] + "00") is None
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+pytest_plugins = ("pytester",)
+
+SUPPORT_DIR = Path(__file__).parent / "support"
+
+# A throwaway suite whose "compiled contract" is whatever bytecode.txt holds
+CONFTEST = f"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, {str(SUPPORT_DIR.parent)!r})
+from support.impact import ImpactCache
+
+def read_bytecode():
+    path = Path("bytecode.txt")
+    return {{"abi": [], "bytecode": path.read_text()}} if path.exists() else None
+
+def pytest_configure(config):
+    config.pluginmanager.register(ImpactCache(config, read_bytecode, fallback_dir="impact-state"), "impact")
+
+@pytest.fixture
+def contract():
+    return read_bytecode()
+"""
+
+TESTS = """
+def test_uses_contract(contract):
+    assert contract["bytecode"]
+
+def test_plain():
+    assert True
+"""
+
+@pytest.fixture
+def impact_suite(pytester):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(test_sample=TESTS)
+    (pytester.path / "bytecode.txt").write_text("6080")
+    return pytester
+
+class TestImpactCache:
+    """Test reusing passing results until the bytecode, test or fixture code changes"""
+
+    def test_unchanged_run_is_reused(self, impact_suite):
+        impact_suite.runpytest("-p", "no:randomly").assert_outcomes(passed=2)
+        result = impact_suite.runpytest("-p", "no:randomly")
+
+        result.assert_outcomes(skipped=2)
+        result.stdout.fnmatch_lines(["*2 tests reused a passing result*"])
+
+    def test_bytecode_change_reruns(self, impact_suite):
+        impact_suite.runpytest().assert_outcomes(passed=2)
+        # e.g. a different validValue bound compiles to different bytecode
+        (impact_suite.path / "bytecode.txt").write_text("6081")
+
+        impact_suite.runpytest().assert_outcomes(passed=2)
+        impact_suite.runpytest().assert_outcomes(skipped=2)
+
+    def test_test_and_fixture_changes_rerun(self, impact_suite):
+        impact_suite.runpytest().assert_outcomes(passed=2)
+
+        impact_suite.makepyfile(test_sample=TESTS + "\n# edited\n")
+        impact_suite.runpytest().assert_outcomes(passed=2)
+
+        # conftest.py hooks reach every test below it, fixture or not
+        impact_suite.makeconftest(CONFTEST + "\n# edited\n")
+        impact_suite.runpytest().assert_outcomes(passed=2)
+        impact_suite.runpytest().assert_outcomes(skipped=2)
+
+    def test_nested_conftest_only_reruns_tests_below_it(self, impact_suite):
+        nested = impact_suite.mkpydir("nested")
+        (nested / "conftest.py").write_text("OPTION = 1\n")
+        (nested / "test_nested.py").write_text("def test_nested():\n    assert True\n")
+        impact_suite.runpytest().assert_outcomes(passed=3)
+
+        (nested / "conftest.py").write_text("OPTION = 2\n")
+        impact_suite.runpytest().assert_outcomes(passed=1, skipped=2)
+
+    def test_without_cacheprovider_uses_fallback_dir(self, impact_suite):
+        impact_suite.runpytest("-p", "no:cacheprovider").assert_outcomes(passed=2)
+        impact_suite.runpytest("-p", "no:cacheprovider").assert_outcomes(skipped=2)
+        assert list((impact_suite.path / "impact-state").iterdir())
+
+    def test_failures_always_rerun(self, impact_suite):
+        impact_suite.makepyfile(test_failing="def test_fails():\n    assert False\n")
+        impact_suite.runpytest().assert_outcomes(passed=2, failed=1)
+        impact_suite.runpytest().assert_outcomes(skipped=2, failed=1)
+
+    def test_unbuilt_contract_runs_everything_then_records(self, impact_suite):
+        (impact_suite.path / "bytecode.txt").unlink()
+        impact_suite.runpytest().assert_outcomes(passed=1, failed=1)
+
+        (impact_suite.path / "bytecode.txt").write_text("6080")
+        impact_suite.runpytest().assert_outcomes(passed=2)
+        impact_suite.runpytest().assert_outcomes(skipped=2)
@@ -0,0 +1,118 @@
+from support.chain import create_web3, deploy_simple_storage
+from support.indexer import EventIndexer
+
+def deploy(compiled_contract):
+    web3 = create_web3()
+    owner, user1, user2 = web3.eth.accounts[:3]
+    contract = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], owner)["contract"]
+    return web3, contract, owner, user1, user2
+
+class TestEventIndexer:
+    """Test incremental indexing of SimpleStorage history"""
+
+    def test_indexes_by_updater_value_and_epoch(self, compiled_contract):
+        web3, contract, owner, user1, user2 = deploy(compiled_contract)
+        contract.functions.increment().transact({'from': user1})
+        contract.functions.addValue(10).transact({'from': user2})
+        checkpoint_block = web3.eth.block_number
+        contract.functions.increment().transact({'from': user1})
+        contract.functions.transferOwnership(user2).transact({'from': owner})
+        contract.functions.setValue(7).transact({'from': user2})
+
+        indexer = EventIndexer(web3, contract.address, compiled_contract["abi"], chunk_size=2)
+        assert indexer.sync() == 6
+
+        assert [change.newValue for change in indexer.changes_by(user1)] == [43, 54]
+        assert [change.newValue for change in indexer.changes_by(user1, since_block=checkpoint_block + 1)] == [54]
+        assert [change.newValue for change in indexer.changes_with_value(40, 53)] == [42, 43, 53]
+
+        epochs = indexer.owner_epochs()
+        assert [(epoch["owner"], epoch["changes"]) for epoch in epochs] == [(owner, 4), (user2, 1)]
+        assert [change.newValue for change in indexer.changes_in_epoch(1)] == [7]
+        assert indexer.owner_at(checkpoint_block) == owner
+        # Nothing is saved without a checkpoint, so no log rows are kept for it either
+        assert indexer._unsaved == []
+
+    def test_resumes_from_checkpoint(self, compiled_contract, tmp_path):
+        web3, contract, owner, user1, _ = deploy(compiled_contract)
+        checkpoint = tmp_path / "index.json"
+        EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint).sync()
+
+        contract.functions.increment().transact({'from': user1})
+        resumed = EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint)
+        assert resumed.next_block == web3.eth.block_number
+
+        assert resumed.sync() == 1
+        assert [change.newValue for change in resumed.changes] == [42, 43]
+
+    def test_sync_appends_only_new_events(self, compiled_contract, tmp_path):
+        web3, contract, owner, user1, _ = deploy(compiled_contract)
+        checkpoint = tmp_path / "index.json"
+        indexer = EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint)
+        indexer.sync()
+        checkpoint_size = checkpoint.stat().st_size
+
+        for _ in range(5):
+            contract.functions.increment().transact({'from': user1})
+            indexer.sync()
+
+        # The cursor file stays the same size; the log holds each event once
+        assert abs(checkpoint.stat().st_size - checkpoint_size) <= 2
+        assert len(indexer.events_path.read_text().splitlines()) == 6
+
+    def test_uncommitted_log_tail_is_ignored(self, compiled_contract, tmp_path):
+        web3, contract, owner, user1, _ = deploy(compiled_contract)
+        checkpoint = tmp_path / "index.json"
+        indexer = EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint)
+        indexer.sync()
+
+        # An append that crashed before its checkpoint was written
+        with open(indexer.events_path, "a") as file:
+            file.write('["change", 99, 0, "00", 1, 2, "0x"]\n')
+
+        contract.functions.increment().transact({'from': user1})
+        resumed = EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint)
+        resumed.sync()
+
+        reloaded = EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint)
+        assert [change.newValue for change in reloaded.changes] == [42, 43]
+
+    def test_revert_rewrites_event_log(self, compiled_contract, tmp_path):
+        web3, contract, owner, user1, _ = deploy(compiled_contract)
+        tester = web3.provider.ethereum_tester
+        checkpoint = tmp_path / "index.json"
+        snapshot = tester.take_snapshot()
+        contract.functions.increment().transact({'from': user1})
+        EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint).sync()
+
+        tester.revert_to_snapshot(snapshot)
+        contract.functions.decrement().transact({'from': user1})
+        EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint).sync()
+
+        reloaded = EventIndexer(web3, contract.address, compiled_contract["abi"], checkpoint_path=checkpoint)
+        assert [change.newValue for change in reloaded.changes] == [42, 41]
+
+    def test_rescans_after_revert(self, compiled_contract):
+        web3, contract, owner, user1, _ = deploy(compiled_contract)
+        tester = web3.provider.ethereum_tester
+        snapshot = tester.take_snapshot()
+        contract.functions.increment().transact({'from': user1})
+
+        indexer = EventIndexer(web3, contract.address, compiled_contract["abi"])
+        indexer.sync()
+        tester.revert_to_snapshot(snapshot)
+        contract.functions.decrement().transact({'from': user1})
+
+        indexer.sync()
+        assert [change.newValue for change in indexer.changes] == [42, 41]
+
+class TestEventIndexerFixture:
+    """Test the event_indexer fixture against the deployed contract"""
+
+    def test_fixture_indexes_deployment(self, deployed_contract, accounts, event_indexer):
+        deployed_contract["contract"].functions.increment().transact({'from': accounts["user1"]})
+
+        event_indexer.sync()
+        # A contract preloaded into genesis never emitted the constructor event
+        expected = [accounts["user1"]] if deployed_contract["preloaded"] else [accounts["owner"], accounts["user1"]]
+        assert [change.updatedBy for change in event_indexer.changes] == expected
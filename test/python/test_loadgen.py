@@ -0,0 +1,41 @@
+import pytest
+
+from support.loadgen import LoadGenerator, main, parse_mix
+
+class TestLoadGenerator:
+    """Test the SimpleStorage load generator against eth-tester"""
+
+    def test_parse_mix(self):
+        assert parse_mix("increment=3,view=1") == {"increment": 3.0, "view": 1.0}
+        with pytest.raises(ValueError, match="Unknown operation"):
+            parse_mix("explode=1")
+        with pytest.raises(ValueError, match="positive weight"):
+            parse_mix("increment=0")
+
+    def test_runs_fixed_number_of_operations(self, deployed_contract, accounts):
+        contract = deployed_contract["contract"]
+        senders = [accounts["owner"], accounts["user1"], accounts["user2"]]
+        generator = LoadGenerator(contract.w3, contract, senders, accounts["owner"], parse_mix("increment=1,setValue=1,view=1"))
+
+        report = generator.run(operations=30)
+
+        assert report["transactions"] + report["calls"] + sum(report["errors"].values()) == 30
+        assert report["errors"] == {}
+        assert report["tx_per_second"] > 0
+        assert report["write_latency"]["p50_ms"] <= report["write_latency"]["p99_ms"]
+
+    def test_set_value_is_sent_by_the_owner(self, deployed_contract, accounts):
+        contract = deployed_contract["contract"]
+        generator = LoadGenerator(contract.w3, contract, [accounts["user1"]], accounts["owner"], parse_mix("setValue=1"))
+
+        report = generator.run(operations=5)
+
+        assert report["errors"] == {}
+        assert list(report["operations"]) == ["setValue"]
+        # A non-owner setValue would have reverted and been counted as an error
+        assert report["operations"]["setValue"]["count"] == 5
+
+    def test_senders_below_one_are_rejected(self, capsys):
+        with pytest.raises(SystemExit):
+            main(["--senders", "0"])
+        assert "--senders must be at least 1" in capsys.readouterr().err
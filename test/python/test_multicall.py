@@ -0,0 +1,63 @@
+import pytest
+
+from support.chain import deploy_simple_storage
+from support.multicall import MulticallError
+
+class TestMulticallReader:
+    """Test batched view calls through the Multicall helper"""
+
+    def test_reads_match_individual_calls(self, deployed_contract, accounts, multicall):
+        contract = deployed_contract["contract"]
+        contract.functions.setValue(7).transact({'from': accounts["owner"]})
+
+        state = multicall.read_state([contract])[0]
+
+        assert state["getValue"] == contract.functions.getValue().call() == 7
+        assert state["owner"] == accounts["owner"]
+        assert state["lastUpdated"] == contract.functions.lastUpdated().call()
+        assert state["getStorageInfo"] == tuple(contract.functions.getStorageInfo().call())
+        assert multicall.round_trips == 1
+
+    def test_batches_many_instances_in_one_call(self, compiled_contract, web3_instance, accounts, multicall):
+        contracts = [
+            deploy_simple_storage(web3_instance, compiled_contract["abi"], compiled_contract["bytecode"],
+                                  accounts["owner"], initial_value)["contract"]
+            for initial_value in (1, 2, 3)
+        ]
+
+        assert multicall.read([contract.functions.getValue() for contract in contracts]) == [1, 2, 3]
+        assert multicall.round_trips == 1
+
+    def test_caches_until_next_block(self, deployed_contract, accounts, multicall):
+        contract = deployed_contract["contract"]
+        calls = [contract.functions.getValue(), contract.functions.owner()]
+
+        assert multicall.read(calls) == multicall.read(calls) == [42, accounts["owner"]]
+        assert (multicall.round_trips, multicall.hits) == (1, 2)
+
+        contract.functions.increment().transact({'from': accounts["user1"]})
+        assert multicall.read(calls)[0] == 43
+        assert multicall.round_trips == 2
+
+    def test_snapshot_revert_invalidates_cache(self, deployed_contract, accounts, multicall, eth_tester):
+        contract = deployed_contract["contract"]
+        calls = [contract.functions.getValue()]
+        snapshot = eth_tester.take_snapshot()
+
+        contract.functions.setValue(7).transact({'from': accounts["owner"]})
+        assert multicall.read(calls) == [7]
+
+        # The replacement block has the same number but different state
+        eth_tester.revert_to_snapshot(snapshot)
+        contract.functions.setValue(8).transact({'from': accounts["owner"]})
+        assert multicall.read(calls) == [8]
+        assert multicall.round_trips == 2
+
+    def test_reverted_calls(self, deployed_contract, accounts, multicall):
+        contract = deployed_contract["contract"]
+        # A call from the Multicall helper is not from the owner, so reset() reverts
+        calls = [contract.functions.getValue(), contract.functions.reset()]
+
+        with pytest.raises(MulticallError, match="reset"):
+            multicall.read(calls)
+        assert multicall.read(calls, allow_failure=True) == [42, None]
@@ -0,0 +1,110 @@
+import pytest
+
+from support.gas import load_baseline
+from support.parallel import apply_gas_baseline, collect_node_ids, merge_reports, run_failed, shard_node_ids, worker_args
+
+NODE_IDS = [
+    "test_simple_storage.py::TestSimpleStorageBasicOperations::test_get_value",
+    "test_simple_storage.py::TestSimpleStorageBasicOperations::test_increment",
+    "test_simple_storage.py::TestSimpleStorageBasicOperations::test_decrement",
+    "test_simple_storage.py::TestSimpleStorageEvents::test_emit_value_changed_on_reset",
+    "test_deployment.py::TestSimpleStorageDeployment::test_deployment_sets_last_updated",
+    "test_helpers.py::test_module_level",
+]
+
+def make_report(worker, tests, gas, gas_benchmark=(), exitstatus=0):
+    return {
+        "worker": worker,
+        "exitstatus": exitstatus,
+        "tests": tests,
+        "gas": gas,
+        "gas_benchmark": list(gas_benchmark),
+        "timings": {"collection": 0.1, "session": 1.0, "solc_resolve": None}
+    }
+
+class TestSharding:
+    """Test splitting the suite across workers"""
+
+    def test_classes_are_never_split(self):
+        shards = shard_node_ids(NODE_IDS, 3)
+        for shard in shards:
+            classes = {node_id.rsplit("::", 1)[0] for node_id in shard}
+            for other in shards:
+                if other is not shard:
+                    assert not classes & {node_id.rsplit("::", 1)[0] for node_id in other}
+
+    def test_every_test_is_scheduled_once(self):
+        shards = shard_node_ids(NODE_IDS, 2)
+        assert sorted(node_id for shard in shards for node_id in shard) == sorted(NODE_IDS)
+
+    def test_no_empty_shards(self):
+        assert len(shard_node_ids(NODE_IDS[:1], 8)) == 1
+
+    def test_worker_args_drop_selection(self):
+        args = ["-k", "increment", "test_simple_storage.py", "--chain-isolation=fresh", "-mslow", "-x"]
+        assert worker_args(args) == ["--chain-isolation=fresh", "-x"]
+
+    def test_worker_args_keep_gas_baseline_in_parent(self):
+        args = ["--gas-baseline=base.json", "--gas-save-baseline", "new.json",
+                "--gas-regression-threshold=0.1", "--gas-report"]
+        assert worker_args(args) == ["--gas-report"]
+
+class TestCollection:
+    """Test that collection problems stop the run instead of sharding nothing"""
+
+    def test_collection_error_raises(self, tmp_path):
+        broken = tmp_path / "test_broken.py"
+        broken.write_text("import module_that_does_not_exist\n\ndef test_never_runs():\n    pass\n")
+
+        with pytest.raises(RuntimeError, match="collection exited with"):
+            collect_node_ids([str(broken)])
+
+    def test_empty_selection_raises(self):
+        with pytest.raises(RuntimeError, match="0 tests"):
+            collect_node_ids(["test_parallel.py", "-k", "no_test_matches_this"])
+
+class TestMergeReports:
+    """Test combining worker reports"""
+
+    def test_merges_outcomes_and_gas(self):
+        merged = merge_reports([
+            make_report("0", [{"nodeid": "a", "outcome": "passed", "duration": 0.5}],
+                        [{"test": "a", "operation": "increment", "gas_used": 100}]),
+            make_report("1", [{"nodeid": "b", "outcome": "failed", "duration": 0.25}],
+                        [{"test": "b", "operation": "increment", "gas_used": 300}]),
+        ])
+
+        assert merged["outcomes"] == {"passed": 1, "failed": 1}
+        assert merged["gas"]["increment"] == {"calls": 2, "min": 100, "median": 200, "max": 300}
+        assert [worker["test_seconds"] for worker in merged["workers"]] == [0.5, 0.25]
+
+    def test_concatenates_gas_benchmark_records(self):
+        merged = merge_reports([
+            make_report("0", [], [], [{"key": "increment[owner,update]", "gas_used": 100, "test": "a"}]),
+            make_report("1", [], [], [{"key": "increment[owner,update]", "gas_used": 300, "test": "b"}]),
+        ])
+
+        assert [record["test"] for record in merged["gas_benchmark"]] == ["a", "b"]
+
+    def test_nonzero_worker_exit_fails_the_run(self):
+        passing = make_report("0", [{"nodeid": "a", "outcome": "passed", "duration": 0.5}], [])
+        crashed = make_report("1", [{"nodeid": "b", "outcome": "passed", "duration": 0.5}], [], exitstatus=3)
+
+        assert not run_failed(merge_reports([passing]))
+        assert run_failed(merge_reports([passing, crashed]))
+
+    def test_gas_baseline_uses_every_worker(self, tmp_path):
+        key = "increment[owner,update]"
+        merged = merge_reports([
+            make_report("0", [], [], [{"key": key, "gas_used": 100, "test": "a"}]),
+            make_report("1", [], [], [{"key": key, "gas_used": 300, "test": "b"}]),
+        ])
+        baseline = tmp_path / "baseline.json"
+
+        apply_gas_baseline(merged, save_path=baseline)
+        assert load_baseline(baseline)["methods"][key]["calls"] == 2
+
+        merged["gas_benchmark"].append({"key": key, "gas_used": 900, "test": "c"})
+        apply_gas_baseline(merged, baseline_path=baseline)
+        assert merged["gas_comparison"][0]["regressed"]
+        assert run_failed(merged)
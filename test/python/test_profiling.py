@@ -0,0 +1,55 @@
+import time
+
+from support.chain import create_web3
+from support.profiling import Profiler, format_profile
+
+class TestProfiler:
+    """Test span accounting, instrumentation and the flamegraph dump"""
+
+    def test_self_time_excludes_children(self):
+        profiler = Profiler()
+        with profiler.span("test"):
+            with profiler.span("outer"):
+                time.sleep(0.02)
+                with profiler.span("inner"):
+                    time.sleep(0.02)
+
+        outer = profiler.totals["outer"]
+        assert outer["total"] >= 0.04
+        assert 0.015 <= outer["self"] < outer["total"] - 0.015
+        assert profiler.folded[("test", "outer", "inner")] >= 0.02
+        assert profiler.roots()[0][0] == "test"
+
+    def test_instrument_times_chain_setup_and_restores(self, compiled_contract):
+        from eth_tester import EthereumTester
+        original_init = EthereumTester.__dict__["__init__"]
+
+        profiler = Profiler()
+        assert profiler.instrument() >= 5
+        try:
+            with profiler.span("test"):
+                web3 = create_web3()
+                contract = web3.eth.contract(abi=compiled_contract["abi"], bytecode=compiled_contract["bytecode"])
+                contract.constructor(42).transact({'from': web3.eth.accounts[0]})
+        finally:
+            profiler.uninstrument()
+
+        assert EthereumTester.__dict__["__init__"] is original_init
+        for label in ("EthereumTester()", "web3 provider setup", "deploy", "web3 request", "EVM execution"):
+            assert profiler.totals[label]["calls"] >= 1
+        assert any(path[:2] == ("test", "deploy") and path[-1] == "EVM execution" for path in profiler.folded)
+
+    def test_folded_dump_and_table(self, tmp_path):
+        profiler = Profiler()
+        with profiler.span("test_x.py::test a;b"):
+            with profiler.span("fixture:eth_tester"):
+                time.sleep(0.001)
+
+        path = tmp_path / "profile.folded"
+        profiler.write_folded(path)
+        stack, count = path.read_text().splitlines()[-1].rsplit(" ", 1)
+        assert stack == "test_x.py::test_a,b;fixture:eth_tester"
+        assert int(count) >= 1000
+
+        table = format_profile(profiler)
+        assert "fixture:eth_tester" in table and "test_x.py::test a;b" in table
@@ -0,0 +1,112 @@
+import pytest
+from eth_tester.exceptions import BlockNotFound
+
+from support.driver import FastDriver
+from support.pruning import HistoryPruner, read_spill
+from support.storage import StorageInspector
+
+def increments(pruning_chain, count):
+    web3 = pruning_chain["web3"]
+    driver = FastDriver(web3.provider.ethereum_tester, pruning_chain["deployment"]["address"],
+                        pruning_chain["deployment"]["contract"].abi)
+    return [driver.transact("increment", sender=web3.eth.accounts[1]) for _ in range(count)]
+
+class TestHistoryPruner:
+    """Test that pruning bounds memory without breaking the retained chain"""
+
+    def test_old_blocks_are_dropped_and_recent_ones_kept(self, pruning_chain):
+        receipts = increments(pruning_chain, 40)
+        tester = pruning_chain["web3"].provider.ethereum_tester
+
+        with pytest.raises(BlockNotFound):
+            tester.get_block_by_number(receipts[0].blockNumber)
+        assert tester.get_transaction_receipt(receipts[-1].transactionHash)["status"] == 1
+        assert pruning_chain["pruner"].blocks_pruned > 0
+
+    def test_state_and_new_transactions_survive_pruning(self, pruning_chain):
+        increments(pruning_chain, 40)
+        contract = pruning_chain["deployment"]["contract"]
+        web3 = pruning_chain["web3"]
+
+        contract.functions.addValue(8).transact({'from': web3.eth.accounts[2]})
+        assert contract.functions.getValue().call() == 42 + 40 + 8
+
+        head = web3.eth.block_number
+        history = StorageInspector(web3).history(pruning_chain["deployment"]["address"], range(head - 9, head + 1))
+        assert [snapshot.value for snapshot in history] == list(range(42 + 32, 42 + 41)) + [42 + 40 + 8]
+
+    def test_database_size_stays_flat(self, pruning_chain):
+        pruner = pruning_chain["pruner"]
+        increments(pruning_chain, 40)
+        before = pruner.memory_report()
+        increments(pruning_chain, 60)
+        after = pruner.memory_report()
+
+        assert after["head"] == before["head"] + 60
+        assert after["db_keys"] <= before["db_keys"] * 1.1
+        assert after["rss_mb"] > 0
+
+    def test_memory_report_counts_retained_blocks(self, pruning_chain):
+        increments(pruning_chain, 70)
+        tester = pruning_chain["web3"].provider.ethereum_tester
+        report = pruning_chain["pruner"].memory_report()
+
+        retained = 0
+        for number in range(report["head"] + 1):
+            try:
+                tester.get_block_by_number(number)
+            except BlockNotFound:
+                continue
+            retained += 1
+
+        assert report["pruned_blocks"] > 0
+        assert report["retained_blocks"] == retained == report["head"] + 1 - report["pruned_blocks"]
+
+    def test_database_size_stays_flat_with_many_senders(self, pruning_chain):
+        # Account leaves that outlive their first block must still be swept once they go stale
+        web3 = pruning_chain["web3"]
+        pruner = pruning_chain["pruner"]
+        driver = FastDriver(web3.provider.ethereum_tester, pruning_chain["deployment"]["address"],
+                            pruning_chain["deployment"]["contract"].abi)
+        senders = web3.eth.accounts[:10]
+
+        sizes = []
+        for _ in range(3):
+            for index in range(60):
+                driver.transact("increment", sender=senders[index % len(senders)])
+            sizes.append(pruner.memory_report()["db_keys"])
+
+        assert max(sizes) <= min(sizes) * 1.1
+
+    def test_spill_records_pruned_blocks(self, compiled_contract, pruning_chain, tmp_path):
+        pruning_chain["pruner"].uninstall()
+        tester = pruning_chain["web3"].provider.ethereum_tester
+        spill = tmp_path / "pruned.jsonl"
+        pruner = HistoryPruner(tester, keep_blocks=4, spill_path=spill, prune_every=1).install()
+        start = tester.get_block_by_number("latest")["number"]
+
+        receipts = increments(pruning_chain, 10)
+        pruner.uninstall()
+
+        records = list(read_spill(spill))
+        assert [record["number"] for record in records] == list(range(start + 1, start + 7))
+        tx_hash, status, gas_used, logs = records[0]["transactions"][0]
+        assert (tx_hash, status, gas_used) == (receipts[0].transactionHash, 1, receipts[0].gasUsed)
+        assert logs[0][0] == pruning_chain["deployment"]["address"]
+
+    def test_snapshot_revert_inside_window(self, pruning_chain):
+        tester = pruning_chain["web3"].provider.ethereum_tester
+        increments(pruning_chain, 30)
+        snapshot = tester.take_snapshot()
+        increments(pruning_chain, 5)
+
+        tester.revert_to_snapshot(snapshot)
+        increments(pruning_chain, 30)
+        assert pruning_chain["deployment"]["contract"].functions.getValue().call() == 42 + 60
+
+    def test_uninstall_restores_tester(self, pruning_chain):
+        tester = pruning_chain["web3"].provider.ethereum_tester
+        pruning_chain["pruner"].uninstall()
+
+        assert "mine_blocks" not in tester.__dict__
+        assert type(pruning_chain["pruner"].db.kv_store) is dict
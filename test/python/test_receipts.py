@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+from support.chain import create_web3, deploy_simple_storage
+from support.receipts import InstantReceipts
+
+@pytest.fixture
+def receipt_chain(compiled_contract):
+    """Own chain with plain web3 receipt methods, to compare against InstantReceipts"""
+    web3 = create_web3(instant_receipts=False)
+    deployment = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"],
+                                       web3.eth.accounts[0])
+    return web3, deployment["contract"], InstantReceipts(web3)
+
+class TestInstantReceipts:
+    """Test receipts read straight from the chain against web3's polling path"""
+
+    def test_receipt_matches_web3(self, receipt_chain):
+        web3, contract, receipts = receipt_chain
+        tx_hash = contract.functions.increment().transact({'from': web3.eth.accounts[1]})
+        contract.functions.addValue(5).transact({'from': web3.eth.accounts[1]})
+
+        assert receipts.wait(tx_hash) == web3.eth.wait_for_transaction_receipt(tx_hash)
+        assert receipts.receipt(tx_hash).status == 1
+
+    def test_batch_keeps_order_and_marks_unknown_hashes(self, receipt_chain):
+        web3, contract, receipts = receipt_chain
+        tx_hashes = [contract.functions.addValue(value).transact({'from': web3.eth.accounts[1]})
+                     for value in range(1, 6)]
+        unknown = b"\x11" * 32
+
+        batch = receipts.receipts(tx_hashes[::-1] + [unknown])
+        assert batch[:-1] == [web3.eth.get_transaction_receipt(tx_hash) for tx_hash in tx_hashes[::-1]]
+        assert batch[-1] is None
+        with pytest.raises(TransactionNotFound):
+            receipts.receipt(unknown)
+
+    def test_manual_mining_wakes_waiter(self, receipt_chain):
+        web3, contract, receipts = receipt_chain
+        tester = web3.provider.ethereum_tester
+        tester.disable_auto_mine_transactions()
+        tx_hash = contract.functions.increment().transact({'from': web3.eth.accounts[1]})
+
+        miner = threading.Timer(0.2, lambda: tester.mine_blocks())
+        miner.start()
+        receipt = receipts.wait(tx_hash, timeout=10)
+        miner.join()
+
+        assert receipt.status == 1
+        # The mining hook is only installed while someone waits
+        assert "mine_blocks" not in tester.__dict__
+
+    def test_wait_times_out_without_mining(self, receipt_chain):
+        web3, contract, receipts = receipt_chain
+        web3.provider.ethereum_tester.disable_auto_mine_transactions()
+        tx_hash = contract.functions.increment().transact({'from': web3.eth.accounts[1]})
+
+        with pytest.raises(TimeExhausted):
+            receipts.wait(tx_hash, timeout=0.1)
+
+    def test_reverted_transaction_is_not_found(self, receipt_chain):
+        web3, contract, receipts = receipt_chain
+        tester = web3.provider.ethereum_tester
+        snapshot = tester.take_snapshot()
+        tx_hash = contract.functions.increment().transact({'from': web3.eth.accounts[1]})
+        tester.revert_to_snapshot(snapshot)
+
+        assert receipts.receipts([tx_hash]) == [None]
+
+    def test_install_routes_web3_eth(self, receipt_chain):
+        web3, contract, receipts = receipt_chain
+        receipts.install()
+        tx_hash = contract.functions.increment().transact({'from': web3.eth.accounts[1]})
+
+        assert web3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=5) == receipts.receipt(tx_hash)
+        receipts.uninstall()
+        assert "wait_for_transaction_receipt" not in web3.eth.__dict__
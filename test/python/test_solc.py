@@ -0,0 +1,54 @@
+import pytest
+
+from support import solc as solc_module
+from support.solc import SolcNotFoundError, resolve_solc
+
+def make_fake_solc(path, version):
+    path.write_text(f"#!/bin/sh\necho 'solc, the solidity compiler'\necho 'Version: {version}+commit.a1b79de6'\n")
+    path.chmod(0o755)
+    return path
+
+@pytest.fixture
+def isolated_solc_env(tmp_path, monkeypatch):
+    """Point every lookup location at empty temp directories"""
+    monkeypatch.delenv("SOLC_BINARY", raising=False)
+    monkeypatch.setenv("SOLC_VENDOR_DIR", str(tmp_path / "vendor"))
+    monkeypatch.setenv("SOLCX_BINARY_PATH", str(tmp_path / "solcx"))
+    monkeypatch.setenv("PATH", str(tmp_path / "bin"))
+    monkeypatch.setattr(solc_module, "HARDHAT_COMPILERS_DIR", tmp_path / "hardhat")
+    for name in ("vendor", "solcx", "bin"):
+        (tmp_path / name).mkdir()
+    return tmp_path
+
+class TestResolveSolc:
+    """Test offline solc resolution"""
+
+    def test_missing_binary_raises_without_installing(self, isolated_solc_env, monkeypatch):
+        def fail_install(*args, **kwargs):
+            raise AssertionError("install_solc must not run unless requested")
+
+        monkeypatch.setattr("solcx.install_solc", fail_install)
+        with pytest.raises(SolcNotFoundError, match="0.8.20"):
+            resolve_solc("0.8.20")
+
+    def test_finds_vendored_binary(self, isolated_solc_env):
+        binary = make_fake_solc(isolated_solc_env / "vendor" / "solc-v0.8.20", "0.8.20")
+        solc = resolve_solc("0.8.20")
+        assert solc["binary"] == binary
+        assert solc["origin"] == "vendor"
+
+    def test_finds_solcx_installed_binary(self, isolated_solc_env):
+        binary = make_fake_solc(isolated_solc_env / "solcx" / "solc-v0.8.20", "0.8.20")
+        assert resolve_solc("0.8.20")["binary"] == binary
+
+    def test_env_binary_must_report_matching_version(self, isolated_solc_env, monkeypatch):
+        binary = make_fake_solc(isolated_solc_env / "solc-custom", "0.8.19")
+        monkeypatch.setenv("SOLC_BINARY", str(binary))
+        with pytest.raises(SolcNotFoundError):
+            resolve_solc("0.8.20")
+
+    def test_system_solc_on_path(self, isolated_solc_env):
+        binary = make_fake_solc(isolated_solc_env / "bin" / "solc", "0.8.20")
+        solc = resolve_solc("0.8.20")
+        assert solc["binary"] == binary
+        assert solc["origin"] == "path"
@@ -0,0 +1,54 @@
+from support.chain import create_web3, deploy_simple_storage
+from support.storage import StorageInspector
+
+class TestStorageInspector:
+    """Test reading SimpleStorage state from its storage slots"""
+
+    def test_snapshot_matches_abi_calls(self, deployed_contract, accounts, storage_inspector):
+        contract = deployed_contract["contract"]
+        contract.functions.transferOwnership(accounts["user1"]).transact({'from': accounts["owner"]})
+
+        snapshot = storage_inspector.snapshot(deployed_contract["address"])
+
+        assert (snapshot.value, snapshot.owner, snapshot.lastUpdated) == tuple(contract.functions.getStorageInfo().call())
+        assert snapshot.blockNumber == contract.w3.eth.block_number
+
+    def test_direct_and_rpc_reads_agree(self, compiled_contract, web3_instance, accounts):
+        addresses = [
+            deploy_simple_storage(web3_instance, compiled_contract["abi"], compiled_contract["bytecode"],
+                                  accounts["owner"], initial_value)["address"]
+            for initial_value in range(5)
+        ]
+
+        direct = StorageInspector(web3_instance).snapshots(addresses)
+        assert [snapshot.value for snapshot in direct] == [0, 1, 2, 3, 4]
+        assert direct == StorageInspector(web3_instance, direct=False).snapshots(addresses)
+
+    def test_history_reads_past_blocks(self, deployed_contract, accounts, storage_inspector):
+        contract = deployed_contract["contract"]
+        start = contract.w3.eth.block_number
+        for value in (5, 6):
+            contract.functions.setValue(value).transact({'from': accounts["owner"]})
+
+        history = storage_inspector.history(deployed_contract["address"], range(start, start + 3))
+        assert [snapshot.value for snapshot in history] == [42, 5, 6]
+
+    def test_rpc_history_reads_past_blocks(self, deployed_contract, accounts, web3_instance):
+        contract = deployed_contract["contract"]
+        start = web3_instance.eth.block_number
+        for value in (5, 6):
+            contract.functions.setValue(value).transact({'from': accounts["owner"]})
+
+        inspector = StorageInspector(web3_instance, direct=False)
+        history = inspector.history(deployed_contract["address"], range(start, start + 3))
+        assert [snapshot.value for snapshot in history] == [42, 5, 6]
+        assert history == StorageInspector(web3_instance).history(deployed_contract["address"], range(start, start + 3))
+
+    def test_follows_backend_chain_after_reset(self, compiled_contract):
+        web3 = create_web3()
+        inspector = StorageInspector(web3)
+        web3.provider.ethereum_tester.reset_to_genesis()
+
+        address = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"],
+                                        web3.eth.accounts[0], 7)["address"]
+        assert inspector.snapshot(address).value == 7
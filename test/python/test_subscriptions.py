@@ -0,0 +1,116 @@
+import asyncio
+
+from support.batch import TransactionBatch
+from support.chain import create_web3, deploy_simple_storage
+from support.receipts import block_receipts
+from support.subscriptions import LogBus
+
+class TestLogBus:
+    """Test pushing decoded events to subscribers as blocks are mined"""
+
+    def test_callbacks_and_queues_share_decoded_records(self, compiled_contract):
+        web3 = create_web3()
+        owner, user1 = web3.eth.accounts[:2]
+        contract = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], owner)["contract"]
+        bus = LogBus(web3.provider.ethereum_tester, compiled_contract["abi"]).install()
+
+        seen = []
+        bus.subscribe(seen.append)
+        transfers = bus.subscribe_queue("OwnershipTransferred", address=contract.address)
+
+        contract.functions.increment().transact({'from': user1})
+        contract.functions.transferOwnership(user1).transact({'from': owner})
+
+        assert [type(record).__name__ for record in seen] == ["ValueChanged", "OwnershipTransferred"]
+        # One decoded record is handed to every subscriber
+        assert [record is seen[1] for record in transfers.drain()] == [True]
+        assert bus.blocks_processed == 2
+
+        bus.uninstall()
+        contract.functions.increment().transact({'from': user1})
+        assert len(seen) == 2
+
+    def test_batched_blocks_are_published(self, compiled_contract):
+        web3 = create_web3()
+        owner, user1 = web3.eth.accounts[:2]
+        contract = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], owner)["contract"]
+        bus = LogBus(web3.provider.ethereum_tester, compiled_contract["abi"]).install()
+        changes = bus.subscribe_queue("ValueChanged")
+
+        batch = TransactionBatch(web3)
+        for _ in range(5):
+            batch.add(contract.functions.increment(), user1)
+        batch.submit()
+
+        assert [record.newValue for record in changes] == [43, 44, 45, 46, 47]
+        assert bus.blocks_processed == 1
+
+        tester = web3.provider.ethereum_tester
+        block = tester.get_block_by_number("latest")
+        assert block_receipts(tester, block["hash"]) == [
+            tester.get_transaction_receipt(tx_hash) for tx_hash in block["transactions"]
+        ]
+
+    def test_slow_queue_drops_oldest_without_stalling(self, compiled_contract):
+        web3 = create_web3()
+        owner = web3.eth.accounts[0]
+        contract = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], owner)["contract"]
+        bus = LogBus(web3.provider.ethereum_tester, compiled_contract["abi"]).install()
+        slow = bus.subscribe_queue("ValueChanged", maxsize=2)
+        failing = bus.subscribe(lambda record: 1 / 0)
+
+        for value in range(1, 5):
+            contract.functions.setValue(value).transact({'from': owner})
+
+        assert [record.newValue for record in slow.drain()] == [3, 4]
+        assert slow.dropped == 2
+        assert len(failing.errors) == 4
+        assert contract.functions.getValue().call() == 4
+
+    def test_async_iteration(self, compiled_contract):
+        web3 = create_web3()
+        owner = web3.eth.accounts[0]
+        contract = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], owner)["contract"]
+        bus = LogBus(web3.provider.ethereum_tester, compiled_contract["abi"]).install()
+        changes = bus.subscribe_queue("ValueChanged")
+
+        async def scenario():
+            async def consume():
+                return [record.newValue async for record in changes]
+
+            consumer = asyncio.create_task(consume())
+            for value in (7, 8):
+                await asyncio.sleep(0)
+                contract.functions.setValue(value).transact({'from': owner})
+            await asyncio.sleep(0)
+            changes.close()
+            return await consumer
+
+        assert asyncio.run(scenario()) == [7, 8]
+
+    def test_mining_after_consumer_loop_closed(self, compiled_contract):
+        web3 = create_web3()
+        owner = web3.eth.accounts[0]
+        contract = deploy_simple_storage(web3, compiled_contract["abi"], compiled_contract["bytecode"], owner)["contract"]
+        bus = LogBus(web3.provider.ethereum_tester, compiled_contract["abi"]).install()
+        changes = bus.subscribe_queue("ValueChanged")
+
+        async def abandon():
+            # Left waiting when asyncio.run cancels it and closes the loop
+            asyncio.create_task(changes.__anext__())
+            await asyncio.sleep(0)
+
+        asyncio.run(abandon())
+        contract.functions.setValue(9).transact({'from': owner})
+
+        assert changes.get_nowait().newValue == 9
+
+class TestContractWithEvents:
+    """Test the event subscriptions on contract_with_events"""
+
+    def test_receives_value_changes(self, contract_with_events, accounts):
+        contract_with_events["contract"].functions.setValue(5).transact({'from': accounts["owner"]})
+
+        events = contract_with_events["value_changed_events"].drain()
+        assert [(event.oldValue, event.newValue) for event in events] == [(42, 5)]
+        assert len(contract_with_events["ownership_transferred_events"]) == 0